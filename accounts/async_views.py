@@ -0,0 +1,65 @@
+"""
+Async login for the ASGI deployment (see task_time_tracker.urls_async).
+Checking the password is deliberately slow, so the async version keeps
+the event loop free while the hasher runs in a worker thread.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import aauthenticate
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework import status
+from rest_framework.exceptions import Throttled
+
+from task_time_tracker.responses import json_response
+
+from .serializers import LoginSerializer
+from .throttling import login_throttle_wait
+from .tokens import RoleRefreshToken
+
+
+@csrf_exempt
+@require_POST
+async def login(request):
+    """Async LoginView.post."""
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return json_response({"detail": "JSON parse error."}, status=status.HTTP_400_BAD_REQUEST)
+    else:
+        data = request.POST
+
+    # Turn away bursts before any password hashing, like LoginView's throttles
+    wait = await sync_to_async(login_throttle_wait)(request, data.get('email') if hasattr(data, 'get') else None)
+    if wait is not None:
+        throttled = Throttled(wait)
+        response = json_response({"detail": throttled.detail}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        response['Retry-After'] = '%d' % throttled.wait
+        return response
+
+    # Use the LoginSerializer to validate input
+    serializer = LoginSerializer(data=data)
+    if not serializer.is_valid():
+        return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    user = await aauthenticate(
+        request,
+        email=serializer.validated_data.get('email'),
+        password=serializer.validated_data.get('password'),
+    )
+    if user is None:
+        return json_response({"detail": "Invalid credentials."}, status=status.HTTP_401_UNAUTHORIZED)
+
+    # User is authenticated, generate token carrying the user's role
+    refresh = RoleRefreshToken.for_user(user)
+    return json_response({
+        'access': str(refresh.access_token),
+        'refresh': str(refresh),
+        'user': {
+            'email': user.email,
+            'username': user.username,
+            'role': user.role,
+        }
+    }, status=status.HTTP_200_OK)
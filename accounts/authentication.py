@@ -0,0 +1,76 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import CustomUser
+
+
+class ClaimsUser(TokenUser):
+    """
+    Lightweight user built from access token claims. Exposes the `id` and
+    `role` the tracker views need without a database lookup.
+    """
+
+    @cached_property
+    def id(self):
+        # The claim may be serialized as a string; match the model's pk type
+        return CustomUser._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def role(self):
+        return self.token.get('role')
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves the user from the token's claims instead
+    of selecting the user row on every request.
+
+    When JWT_USER_CACHE_TTL is set, the user's active flag and role are also
+    checked against a short-lived cache entry, so deactivated users and role
+    changes take effect within that many seconds. Tokens issued before the
+    role claim existed fall back to the regular database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if 'role' not in validated_token or api_settings.USER_ID_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        user = api_settings.TOKEN_USER_CLASS(validated_token)
+        if settings.JWT_USER_CACHE_TTL:
+            is_active, role = self.get_user_state(user.id)
+            if not is_active:
+                raise AuthenticationFailed("User is inactive", code="user_inactive")
+            user.role = role
+        return user
+
+    def get_user_state(self, user_id):
+        """Return the cached (is_active, role) of a user, loading it on a miss."""
+        key = f'accounts:user-state:{user_id}'
+        state = cache.get(key)
+        if state is None:
+            state = CustomUser.objects.filter(pk=user_id).values_list('is_active', 'role').first() or (False, None)
+            cache.set(key, state, settings.JWT_USER_CACHE_TTL)
+        return state
+
+
+def authenticate_request(request, token_param=None):
+    """
+    Authenticate a plain Django request, for views that bypass DRF, with the
+    bearer token from the Authorization header or, if `token_param` is
+    given, from that query parameter. Returns (user, validated_token), or
+    None when no token was sent; raises AuthenticationFailed for a bad one.
+    """
+    authentication = ClaimsJWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None and token_param and request.GET.get(token_param):
+        raw_token = request.GET[token_param].encode()
+    if raw_token is None:
+        return None
+    validated_token = authentication.get_validated_token(raw_token)
+    return authentication.get_user(validated_token), validated_token
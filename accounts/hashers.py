@@ -0,0 +1,40 @@
+"""
+Password hashers whose cost comes from settings instead of Django's
+built-in defaults.
+
+They keep the algorithm names of the Django hashers they extend, so
+existing hashes still verify. When a stored hash was made with other
+parameters or another hasher, Django rehashes the password with the
+preferred hasher (the first entry of PASSWORD_HASHERS) on the user's next
+successful login. Changing the cost settings therefore upgrades, or
+downgrades, every active user without a migration.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with PASSWORD_PBKDF2_ITERATIONS iterations."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS or PBKDF2PasswordHasher.iterations
+
+
+class TunableArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with the ARGON2_TIME_COST, ARGON2_MEMORY_COST (KiB) and
+    ARGON2_PARALLELISM parameters. Requires the argon2-cffi package.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST or Argon2PasswordHasher.time_cost
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST or Argon2PasswordHasher.memory_cost
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM or Argon2PasswordHasher.parallelism
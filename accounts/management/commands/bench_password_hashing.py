@@ -0,0 +1,121 @@
+import json
+import os
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.utils import timezone
+
+from accounts.hashers import TunableArgon2PasswordHasher, TunablePBKDF2PasswordHasher
+
+
+def argon2_params(value):
+    """Parse a time_cost,memory_cost_kib,parallelism triple."""
+    try:
+        time_cost, memory_cost, parallelism = (int(part) for part in value.split(','))
+    except ValueError:
+        raise CommandError(f"Invalid Argon2 parameters {value!r}; use time_cost,memory_cost_kib,parallelism.")
+    return time_cost, memory_cost, parallelism
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure how many password checks, the CPU cost of a login, one core completes per "
+        "second for each hashing configuration, and report them as JSON. Compares PBKDF2 at "
+        "the given iteration counts with Argon2 at the given parameters (when argon2-cffi is "
+        "installed). Argon2 with parallelism > 1 uses several threads per check."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pbkdf2-iterations', type=int, nargs='*',
+                            help="PBKDF2 iteration counts; defaults to Django's and the configured one.")
+        parser.add_argument('--argon2', type=argon2_params, nargs='*',
+                            help="Argon2 time_cost,memory_cost_kib,parallelism triples; defaults to "
+                                 "Django's and the configured ones.")
+        parser.add_argument('--seconds', type=float, default=2.0, help='Time spent measuring each configuration.')
+        parser.add_argument('--password', default='correct horse battery staple', help='Password to hash.')
+        parser.add_argument('--output', help='Write the JSON results to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        configured_iterations = TunablePBKDF2PasswordHasher().iterations
+        pbkdf2_iterations = options['pbkdf2_iterations'] or sorted({
+            PBKDF2PasswordHasher.iterations, configured_iterations,
+        })
+        argon2 = TunableArgon2PasswordHasher()
+        configured_argon2 = (argon2.time_cost, argon2.memory_cost, argon2.parallelism)
+        argon2_configs = options['argon2'] or sorted({
+            (Argon2PasswordHasher.time_cost, Argon2PasswordHasher.memory_cost, Argon2PasswordHasher.parallelism),
+            configured_argon2,
+        })
+
+        results = []
+        for iterations in pbkdf2_iterations:
+            with override_settings(PASSWORD_PBKDF2_ITERATIONS=iterations):
+                results.append(self.measure(
+                    TunablePBKDF2PasswordHasher(), {"iterations": iterations}, options,
+                    current=settings.PASSWORD_HASHER == 'pbkdf2' and iterations == configured_iterations,
+                ))
+
+        try:
+            argon2._load_library()
+        except ValueError:
+            self.stderr.write("argon2-cffi is not installed; skipping Argon2.")
+            argon2_configs = []
+        for time_cost, memory_cost, parallelism in argon2_configs:
+            with override_settings(ARGON2_TIME_COST=time_cost, ARGON2_MEMORY_COST=memory_cost,
+                                   ARGON2_PARALLELISM=parallelism):
+                results.append(self.measure(
+                    TunableArgon2PasswordHasher(),
+                    {"time_cost": time_cost, "memory_cost_kib": memory_cost, "parallelism": parallelism},
+                    options,
+                    current=settings.PASSWORD_HASHER == 'argon2'
+                    and (time_cost, memory_cost, parallelism) == configured_argon2,
+                ))
+
+        report = {
+            "meta": {
+                "timestamp": timezone.now().isoformat(),
+                "cpu_count": os.cpu_count(),
+                "configured_hasher": settings.PASSWORD_HASHER,
+                "seconds_per_configuration": options['seconds'],
+            },
+            "configurations": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+    def measure(self, hasher, params, options, current):
+        password = options['password']
+        encoded = hasher.encode(password, hasher.salt())
+        checks = 0
+        started = time.perf_counter()
+        deadline = started + options['seconds']
+        # At least a few checks, however slow the configuration
+        while checks < 3 or time.perf_counter() < deadline:
+            if not hasher.verify(password, encoded):
+                raise CommandError(f"{hasher.algorithm} failed to verify its own hash.")
+            checks += 1
+        elapsed = time.perf_counter() - started
+
+        per_core = checks / elapsed
+        result = {
+            "hasher": hasher.algorithm,
+            "params": params,
+            "current": current,
+            "checks": checks,
+            "ms_per_login": elapsed / checks * 1000,
+            "logins_per_second_per_core": per_core,
+            "logins_per_second_all_cores": per_core * (os.cpu_count() or 1),
+        }
+        self.stderr.write(
+            f"{hasher.algorithm:<14} {json.dumps(params):<60} {result['ms_per_login']:>8.1f} ms  "
+            f"{per_core:>8.1f} logins/s/core"
+        )
+        return result
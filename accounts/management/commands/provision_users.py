@@ -0,0 +1,124 @@
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
+
+from accounts.models import CustomUser
+
+
+def hash_passwords(passwords):
+    """Hash a batch of passwords; runs in the worker processes."""
+    return [make_password(password) for password in passwords]
+
+
+class Command(BaseCommand):
+    help = (
+        "Create users in bulk from a CSV file with email, password and optional username "
+        "and role columns. Passwords are hashed in batches across a process pool and users "
+        "are inserted with bulk_create. Rows whose email or username is already registered "
+        "are skipped; invalid rows and rows repeating an earlier one are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with a header row.')
+        parser.add_argument('--role', default='employee', choices=dict(CustomUser.ROLE_CHOICES),
+                            help='Role for rows without one.')
+        parser.add_argument('--processes', type=int, default=os.cpu_count(),
+                            help='Worker processes hashing passwords.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Users hashed and inserted per batch.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rows, invalid = self.read(options['path'], options['role'])
+        batch_size = options['batch_size']
+        # Small chunks keep every worker busy until the last batch
+        chunk_size = max(1, batch_size // (options['processes'] * 4))
+
+        created = skipped = 0
+        with ProcessPoolExecutor(max_workers=options['processes'], initializer=django.setup) as pool:
+            for start in range(0, len(rows), batch_size):
+                batch = self.unclaimed(rows[start:start + batch_size])
+                skipped += min(batch_size, len(rows) - start) - len(batch)
+                passwords = [row['password'] for row in batch]
+                chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+                hashes = [encoded for chunk in pool.map(hash_passwords, chunks) for encoded in chunk]
+
+                users = [
+                    CustomUser(email=row['email'], username=row['username'], role=row['role'], password=encoded)
+                    for row, encoded in zip(batch, hashes)
+                ]
+                with transaction.atomic():
+                    # Rows claimed by a concurrent signup since the check are skipped by the
+                    # database; the users inserted are the ones carrying this batch's hashes
+                    CustomUser.objects.bulk_create(users, ignore_conflicts=True)
+                    inserted = CustomUser.objects.filter(
+                        email__in=[user.email for user in users], password__in=hashes
+                    ).count()
+                created += inserted
+                skipped += len(users) - inserted
+                self.stderr.write(f"{min(start + batch_size, len(rows))}/{len(rows)} rows")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created} users in {elapsed:.1f}s ({created / elapsed if elapsed else 0:.0f} users/s); "
+            f"skipped {skipped} already registered and {invalid} invalid rows."
+        ))
+
+    def read(self, path, default_role):
+        """Return the valid rows of the CSV file and the number of invalid ones."""
+        roles = dict(CustomUser.ROLE_CHOICES)
+        rows = []
+        emails = set()
+        usernames = set()
+        invalid = 0
+        try:
+            with open(path, newline='') as f:
+                reader = csv.DictReader(f)
+                if not reader.fieldnames or not {'email', 'password'} <= set(reader.fieldnames):
+                    raise CommandError("The CSV file needs email and password columns.")
+                for line, record in enumerate(reader, start=2):
+                    email = (record.get('email') or '').strip().lower()
+                    username = (record.get('username') or '').strip() or CustomUser.default_username(email)
+                    role = (record.get('role') or '').strip() or default_role
+                    try:
+                        validate_email(email)
+                    except ValidationError:
+                        error = "invalid email"
+                    else:
+                        if not record.get('password'):
+                            error = "missing password"
+                        elif role not in roles:
+                            error = f"unknown role {role!r}"
+                        elif email in emails or username in usernames:
+                            error = "duplicate email or username in file"
+                        else:
+                            error = None
+                    if error:
+                        self.stderr.write(f"Line {line}: {error}; skipped.")
+                        invalid += 1
+                        continue
+                    emails.add(email)
+                    usernames.add(username)
+                    rows.append({'email': email, 'username': username, 'role': role, 'password': record['password']})
+        except OSError as e:
+            raise CommandError(f"Could not read {path}: {e}")
+        return rows, invalid
+
+    def unclaimed(self, rows):
+        """The rows whose email and username are not registered yet, in one query."""
+        taken = CustomUser.objects.filter(
+            Q(email__in=[row['email'] for row in rows]) | Q(username__in=[row['username'] for row in rows])
+        ).values_list('email', 'username')
+        taken_emails, taken_usernames = set(), set()
+        for email, username in taken:
+            taken_emails.add(email)
+            taken_usernames.add(username)
+        return [row for row in rows if row['email'] not in taken_emails and row['username'] not in taken_usernames]
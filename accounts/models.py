@@ -17,7 +17,11 @@ class CustomUser(AbstractUser):
     def __str__(self):
         return self.email
 
+    @staticmethod
+    def default_username(email):
+        return email.split('@')[0]  # Use email's local part as username
+
     def save(self, *args, **kwargs):
         if not self.username:  # Automatically set a username if not provided
-            self.username = self.email.split('@')[0]  # Use email's local part as username
+            self.username = self.default_username(self.email)
         super().save(*args, **kwargs)
@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from .models import CustomUser
-from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 
 class CustomUserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -10,29 +11,31 @@ class CustomUserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']  # Optionally, make the 'id' read-only
 
 class RegisterUserSerializer(serializers.ModelSerializer):
+    """
+    Registers a user with a single INSERT. Email and username uniqueness is
+    left to the database constraints rather than checked with queries
+    beforehand, which would still race with concurrent signups; a violation
+    is reported as the same field error.
+    """
     password = serializers.CharField(write_only=True)
-    
+
     class Meta:
         model = CustomUser
         fields = ['id', 'email', 'username', 'password', 'role']
+        # Drop the UniqueValidators ModelSerializer adds, each a query of its own
+        extra_kwargs = {
+            'email': {'validators': []},
+            'username': {'validators': []},
+        }
 
     def validate_email(self, value):
         """
-        Ensure the email is unique and case-insensitive.
+        Validate the email format. Emails are stored lowercase so the unique
+        constraint is case-insensitive.
         """
         validate_email(value)  # This validates the email format
-        if CustomUser.objects.filter(email=value.lower()).exists():
-            raise ValidationError("This email is already registered.")
         return value.lower()  # Store email in lowercase for consistency
 
-    def validate_username(self, value):
-        """
-        Ensure the username is unique.
-        """
-        if CustomUser.objects.filter(username=value).exists():
-            raise ValidationError("This username is already taken.")
-        return value
-
     def create(self, validated_data):
         # Create a user with hashed password
         user = CustomUser(
@@ -41,9 +44,26 @@ class RegisterUserSerializer(serializers.ModelSerializer):
             role=validated_data['role']
         )
         user.set_password(validated_data['password'])
-        user.save()
+        try:
+            with transaction.atomic():
+                user.save()
+        except IntegrityError:
+            raise serializers.ValidationError(self.unique_errors(user))
         return user
 
+    def unique_errors(self, user):
+        """Field errors for the unique values of `user` that are already taken."""
+        errors = {}
+        for email, username in CustomUser.objects.filter(
+            Q(email=user.email) | Q(username=user.username)
+        ).values_list('email', 'username'):
+            if email == user.email:
+                errors['email'] = ["This email is already registered."]
+            if username == user.username:
+                errors['username'] = ["This username is already taken."]
+        # The conflicting row may already be gone again; report it generically
+        return errors or {"detail": ["This user could not be registered, please try again."]}
+
 
 class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
@@ -1,3 +1,238 @@
-from django.test import TestCase
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .authentication import ClaimsJWTAuthentication, ClaimsUser
+from .management.commands.provision_users import Command as ProvisionUsersCommand
+from .models import CustomUser
+from .tokens import RoleRefreshToken
+
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+# Failed logins still hash the password; keep that cheap
+@override_settings(LOGIN_THROTTLE_EMAIL_RATE=None, PASSWORD_HASHERS=FAST_HASHERS)
+class LoginThrottleTests(TestCase):
+    url = reverse('login')
+
+    def setUp(self):
+        cache.clear()
+
+    def login(self, index, **headers):
+        data = {"email": f'user{index}@example.com', "password": 'wrong'}
+        return self.client.post(self.url, data, content_type='application/json', headers=headers)
+
+    def test_ip_limit_is_off_by_default(self):
+        for index in range(40):
+            self.assertEqual(self.login(index).status_code, 401)
+
+    @override_settings(LOGIN_THROTTLE_IP_RATE='2/min')
+    def test_forwarded_for_is_ignored_without_proxies(self):
+        self.assertEqual(self.login(0, x_forwarded_for='10.0.0.1').status_code, 401)
+        self.assertEqual(self.login(1, x_forwarded_for='10.0.0.2').status_code, 401)
+        self.assertEqual(self.login(2, x_forwarded_for='10.0.0.3').status_code, 429)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class RegisterTests(TestCase):
+    url = reverse('register')
+
+    def setUp(self):
+        CustomUser.objects.create_user(email='alice@example.com', username='alice', password='password')
+
+    def register(self, email, username=None):
+        data = {"email": email, "password": 'password', "role": 'employee'}
+        if username is not None:
+            data['username'] = username
+        return self.client.post(self.url, data, content_type='application/json')
+
+    def test_registers_with_one_insert(self):
+        # Savepoint, insert, release; no uniqueness lookups
+        with self.assertNumQueries(3):
+            response = self.register('bob@example.com')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['user']['username'], 'bob')
+
+    def test_duplicate_email(self):
+        response = self.register('Alice@Example.com', username='alice2')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'email': ["This email is already registered."]})
+
+    def test_duplicate_username(self):
+        response = self.register('someone@example.com', username='alice')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'username': ["This username is already taken."]})
+
+    def test_duplicate_default_username(self):
+        response = self.register('alice@example.org')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'username': ["This username is already taken."]})
+
+    def test_duplicate_email_and_username(self):
+        response = self.register('alice@example.com')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {
+            'email': ["This email is already registered."],
+            'username': ["This username is already taken."],
+        })
+        self.assertEqual(CustomUser.objects.count(), 1)
+
+    def test_conflict_gone_by_the_lookup(self):
+        with mock.patch.object(CustomUser, 'save', side_effect=IntegrityError):
+            response = self.register('bob@example.com')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'detail': ["This user could not be registered, please try again."]})
+
+
+@override_settings(LOGIN_THROTTLE_EMAIL_RATE=None, PASSWORD_HASHERS=FAST_HASHERS)
+class AsyncLoginTests(TestCase):
+    """The async login view answers like LoginView."""
+    url = reverse('login')
+
+    def setUp(self):
+        cache.clear()
+        CustomUser.objects.create_user(email='alice@example.com', username='alice', password='password', role='manager')
+
+    def login(self, data):
+        expected = self.client.post(self.url, data, content_type='application/json')
+        with override_settings(ROOT_URLCONF='task_time_tracker.urls_async'):
+            response = async_to_sync(AsyncClient().post)(self.url, data, content_type='application/json')
+        self.assertEqual(response.status_code, expected.status_code)
+        return expected.json(), response.json()
+
+    def test_valid_credentials(self):
+        expected, data = self.login({"email": 'alice@example.com', "password": 'password'})
+        self.assertEqual(data['user'], expected['user'])
+        self.assertEqual(set(data), set(expected))
+        self.assertEqual(AccessToken(data['access'])['role'], 'manager')
+
+    def test_invalid_credentials(self):
+        expected, data = self.login({"email": 'alice@example.com', "password": 'wrong'})
+        self.assertEqual(data, expected)
+
+    def test_invalid_input(self):
+        expected, data = self.login({"email": 'not-an-email'})
+        self.assertEqual(data, expected)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class ProvisionUsersTests(TestCase):
+    def setUp(self):
+        CustomUser.objects.create_user(email='alice@example.com', username='alice', password='password')
+
+    def provision(self, lines):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write('\n'.join(lines) + '\n')
+        self.addCleanup(os.remove, f.name)
+        out, err = StringIO(), StringIO()
+        call_command('provision_users', f.name, processes=1, stdout=out, stderr=err)
+        return out.getvalue()
+
+    def test_creates_users_and_skips_registered_and_invalid_rows(self):
+        out = self.provision([
+            'email,password,role',
+            'Bob@Example.com,secret,manager',
+            'alice@example.com,secret,',
+            'not-an-email,secret,',
+            'bob@example.com,again,',
+        ])
+        self.assertIn("Created 1 users", out)
+        self.assertIn("skipped 1 already registered and 2 invalid rows", out)
+        bob = CustomUser.objects.get(email='bob@example.com')
+        self.assertEqual((bob.username, bob.role), ('bob', 'manager'))
+        self.assertTrue(bob.check_password('secret'))
+
+    def test_conflicts_at_insert_are_skipped(self):
+        # A signup between the lookup and the insert claims the row first
+        with mock.patch.object(ProvisionUsersCommand, 'unclaimed', lambda command, rows: rows):
+            out = self.provision(['email,password', 'alice@example.com,secret', 'carol@example.com,secret'])
+        self.assertIn("Created 1 users", out)
+        self.assertIn("skipped 1 already registered", out)
+        self.assertTrue(CustomUser.objects.get(email='alice@example.com').check_password('password'))
+        self.assertTrue(CustomUser.objects.filter(email='carol@example.com').exists())
+
+
+class ClaimsJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create(email='employee@example.com', role='employee')
+
+    def authenticate(self, token):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        return ClaimsJWTAuthentication().authenticate(request)[0]
+
+    def access_token(self):
+        return RoleRefreshToken.for_user(self.user).access_token
+
+    @override_settings(JWT_USER_CACHE_TTL=0)
+    def test_claims_authenticate_without_a_query(self):
+        with self.assertNumQueries(0):
+            user = self.authenticate(self.access_token())
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual((user.id, user.role), (self.user.pk, 'employee'))
+
+    @override_settings(JWT_USER_CACHE_TTL=60)
+    def test_user_state_is_cached(self):
+        token = self.access_token()
+        with self.assertNumQueries(1):
+            self.authenticate(token)
+        with self.assertNumQueries(0):
+            user = self.authenticate(token)
+        self.assertEqual(user.id, self.user.pk)
+
+    @override_settings(JWT_USER_CACHE_TTL=60)
+    def test_deactivated_user_is_rejected(self):
+        token = self.access_token()
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+        response = self.client.get(reverse('task-list'), headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(JWT_USER_CACHE_TTL=0)
+    def test_role_claim_decides_access(self):
+        employee_token = self.access_token()
+        self.user.role = 'manager'
+        manager_token = RoleRefreshToken.for_user(self.user).access_token
+        self.assertEqual(self.authenticate(employee_token).role, 'employee')
+        self.assertEqual(self.authenticate(manager_token).role, 'manager')
+        # Only managers may decide tasks
+        url = reverse('task-bulk-action')
+        payload = {"ids": [1], "action": "approve"}
+        response = self.client.patch(url, payload, content_type='application/json',
+                                     headers={'Authorization': f'Bearer {employee_token}'})
+        self.assertEqual(response.status_code, 403)
+        response = self.client.patch(url, payload, content_type='application/json',
+                                     headers={'Authorization': f'Bearer {manager_token}'})
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(JWT_USER_CACHE_TTL=60)
+    def test_role_changes_override_the_claim(self):
+        token = self.access_token()
+        CustomUser.objects.filter(pk=self.user.pk).update(role='manager')
+        self.assertEqual(self.authenticate(token).role, 'manager')
+
+    def test_tokens_without_claims_load_the_user(self):
+        # Access tokens issued before the role claim was added
+        token = AccessToken.for_user(self.user)
+        self.assertNotIn('role', token)
+        with self.assertNumQueries(1):
+            user = self.authenticate(token)
+        self.assertIsInstance(user, CustomUser)
+        self.assertEqual(user.pk, self.user.pk)
+
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
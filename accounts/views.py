@@ -4,7 +4,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from .serializers import RegisterUserSerializer, CustomUserSerializer, LoginSerializer
 from django.contrib.auth import authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
+from .throttling import LoginEmailThrottle, LoginIPThrottle
+from .tokens import RoleRefreshToken
 
 
 class RegisterView(APIView):
@@ -25,6 +26,7 @@ class RegisterView(APIView):
     
 class LoginView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [LoginIPThrottle, LoginEmailThrottle]
 
     def post(self, request, *args, **kwargs):
         # Use the LoginSerializer to validate input
@@ -40,8 +42,8 @@ class LoginView(APIView):
             user = authenticate(request, email=email, password=password)
 
             if user is not None:
-                # User is authenticated, generate token
-                refresh = RefreshToken.for_user(user)
+                # User is authenticated, generate token carrying the user's role
+                refresh = RoleRefreshToken.for_user(user)
                 return Response({
                     'access': str(refresh.access_token),
                     'refresh': str(refresh),
@@ -2,6 +2,15 @@
 ASGI config for task_time_tracker project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server (e.g. ``uvicorn task_time_tracker.asgi:application``)
+so long-lived task event streams do not tie up a worker thread each. Under
+ASGI the task list, detail, stats and login endpoints are served by async
+views (ASYNC_VIEWS); set ASYNC_VIEWS=False to use the sync DRF views.
+
+Persistent database connections are turned off: under ASGI queries run on
+executor threads, and a connection kept open on one is only closed at the
+end of a request handled by the same thread, so they pile up. Set
+DB_POOL=True to reuse connections instead.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -12,5 +21,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_time_tracker.settings')
+os.environ.setdefault('ASYNC_VIEWS', 'True')
+os.environ['DB_CONN_MAX_AGE'] = '0'
 
 application = get_asgi_application()
@@ -0,0 +1,148 @@
+"""
+Read-replica routing.
+
+Views decorated with use_read_replica send their reads to the replica
+database. ReplicaRouter sends every write to the primary and remembers that
+the request wrote; ReplicaPinningMiddleware then pins that user to the primary
+for READ_REPLICA_PIN_SECONDS so they always read their own writes. Reads
+inside primary_reads() go to the primary regardless, for responses that are
+cached for other users.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+
+# Per-request routing state; a dict so changes made in other threads are visible
+_state = ContextVar('replica_routing_state', default=None)
+
+
+def replica_enabled():
+    return settings.READ_REPLICA_ALIAS in settings.DATABASES
+
+
+def pin_key(user_id):
+    return f'replica-pin:{user_id}'
+
+
+def reading_replica():
+    """Whether the current request's reads go to the replica."""
+    state = _state.get()
+    return bool(state and state['read_replica'] and not state['wrote'])
+
+
+@contextmanager
+def primary_reads():
+    """
+    Send the reads inside the block to the primary even in a replica view,
+    for data that outlives the request: a lagging replica could otherwise
+    put a response missing the latest writes into a shared cache.
+    """
+    state = _state.get()
+    if not state or not state['read_replica']:
+        yield
+        return
+    state['read_replica'] = False
+    try:
+        yield
+    finally:
+        state['read_replica'] = True
+
+
+def use_read_replica(view):
+    """
+    Route the reads of a read-only view to the replica, unless the user
+    wrote recently and is pinned to the primary. Works on sync and async views.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            state = _state.get()
+            user_id = getattr(request.user, 'id', None)
+            if state is None or not replica_enabled() or (user_id and await cache.aget(pin_key(user_id))):
+                return await view(request, *args, **kwargs)
+            state['read_replica'] = True
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                state['read_replica'] = False
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        state = _state.get()
+        user_id = getattr(request.user, 'id', None)
+        if state is None or not replica_enabled() or (user_id and cache.get(pin_key(user_id))):
+            return view(request, *args, **kwargs)
+        state['read_replica'] = True
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            state['read_replica'] = False
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if reading_replica():
+            return settings.READ_REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state['wrote'] = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica mirrors the primary, so objects from either may be related
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+class ReplicaPinningMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = {'read_replica': False, 'wrote': False}
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        user_id = self.written_by(request, state)
+        if user_id:
+            cache.set(pin_key(user_id), True, settings.READ_REPLICA_PIN_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        state = {'read_replica': False, 'wrote': False}
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        user_id = self.written_by(request, state)
+        if user_id:
+            await cache.aset(pin_key(user_id), True, settings.READ_REPLICA_PIN_SECONDS)
+        return response
+
+    def written_by(self, request, state):
+        """The id of the user to pin to the primary, if the request wrote."""
+        user_id = getattr(getattr(request, 'user', None), 'id', None)
+        return user_id if state['wrote'] else None
@@ -0,0 +1,248 @@
+"""
+Opt-in per-request instrumentation.
+
+RequestInstrumentationMiddleware counts the SQL queries a request runs and
+times them, the serializer and renderer work and the whole request. The
+queries are recorded by an execute wrapper installed on every database
+connection, whichever thread it belongs to, which adds them to the metrics
+of the request in the current context: under ASGI the ORM runs in
+sync_to_async threads, whose connections the middleware never sees. The
+numbers are sent back as a Server-Timing header, aggregated per view for the
+Prometheus metrics endpoint, and requests over the configured query count or
+duration are logged together with their SQL.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('request_metrics', default=None)
+
+# Upper bounds, in seconds, of the request duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MAX_RECORDED_QUERIES = 200
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.timings = {}
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper recording every query of the request."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_seconds += time.perf_counter() - start
+            if len(self.statements) < MAX_RECORDED_QUERIES:
+                self.statements.append(sql)
+
+    def add(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper installed on every connection, recording the
+    query in the metrics of the request being handled, if any.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection, **kwargs):
+    """connection_created receiver adding record_query to a new connection."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install_query_recorders(**kwargs):
+    """
+    request_started receiver adding record_query to the connections already
+    open in the thread running the request's synchronous code, the handler's
+    own under WSGI and the thread-sensitive sync_to_async one under ASGI.
+    """
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(connection)
+
+
+@contextmanager
+def timed(name):
+    """
+    Add the time spent in the block to the current request's `name` timing.
+    A no-op when instrumentation is disabled.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(name, time.perf_counter() - start)
+
+
+class MetricsRegistry:
+    """Process-wide per-view aggregates, rendered in Prometheus text format."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def record(self, view, status_code, wall_seconds, metrics):
+        with self.lock:
+            stats = self.views.setdefault(view, {
+                "requests": {},
+                "queries": 0,
+                "sql_seconds": 0.0,
+                "wall_seconds": 0.0,
+                "timings": {},
+                "buckets": [0] * len(DURATION_BUCKETS),
+            })
+            stats['requests'][status_code] = stats['requests'].get(status_code, 0) + 1
+            stats['queries'] += metrics.queries
+            stats['sql_seconds'] += metrics.sql_seconds
+            stats['wall_seconds'] += wall_seconds
+            for name, seconds in metrics.timings.items():
+                stats['timings'][name] = stats['timings'].get(name, 0.0) + seconds
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if wall_seconds <= bound:
+                    stats['buckets'][index] += 1
+
+    def render(self):
+        lines = [
+            '# HELP http_requests_total Requests handled, by view and status code.',
+            '# TYPE http_requests_total counter',
+        ]
+        with self.lock:
+            views = {view: dict(stats, requests=dict(stats['requests']), timings=dict(stats['timings']),
+                                buckets=list(stats['buckets'])) for view, stats in self.views.items()}
+
+        for view, stats in views.items():
+            for code, count in sorted(stats['requests'].items()):
+                lines.append(f'http_requests_total{{view="{view}",status="{code}"}} {count}')
+
+        counters = [
+            ('http_request_db_queries_total', 'Database queries run by requests.', 'queries'),
+            ('http_request_db_seconds_total', 'Time spent in database queries.', 'sql_seconds'),
+        ]
+        for metric, help_text, key in counters:
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} counter']
+            lines += [f'{metric}{{view="{view}"}} {stats[key]}' for view, stats in views.items()]
+
+        lines += [
+            '# HELP http_request_phase_seconds_total Time spent in serializer and renderer phases.',
+            '# TYPE http_request_phase_seconds_total counter',
+        ]
+        for view, stats in views.items():
+            for name, seconds in sorted(stats['timings'].items()):
+                lines.append(f'http_request_phase_seconds_total{{view="{view}",phase="{name}"}} {seconds}')
+
+        lines += [
+            '# HELP http_request_duration_seconds Wall time of requests.',
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+        for view, stats in views.items():
+            total = sum(stats['requests'].values())
+            for bound, count in zip(DURATION_BUCKETS, stats['buckets']):
+                lines.append(f'http_request_duration_seconds_bucket{{view="{view}",le="{bound}"}} {count}')
+            lines.append(f'http_request_duration_seconds_bucket{{view="{view}",le="+Inf"}} {total}')
+            lines.append(f'http_request_duration_seconds_sum{{view="{view}"}} {stats["wall_seconds"]}')
+            lines.append(f'http_request_duration_seconds_count{{view="{view}"}} {total}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class RequestInstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        connection_created.connect(install_query_recorder, dispatch_uid='instrumentation.install_query_recorder')
+        request_started.connect(install_query_recorders, dispatch_uid='instrumentation.install_query_recorders')
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, start)
+
+    def finish(self, request, response, metrics, start):
+        wall_seconds = time.perf_counter() - start
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+        registry.record(view, response.status_code, wall_seconds, metrics)
+        response['Server-Timing'] = self.server_timing(metrics, wall_seconds)
+        self.log_if_slow(request, view, metrics, wall_seconds)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; time the rendering too
+        metrics = _current.get()
+        if metrics is not None:
+            start = time.perf_counter()
+            response.add_post_render_callback(lambda r: metrics.add('render', time.perf_counter() - start))
+        return response
+
+    def server_timing(self, metrics, wall_seconds):
+        entries = [f'db;dur={metrics.sql_seconds * 1000:.2f};desc="{metrics.queries} queries"']
+        entries += [f'{name};dur={seconds * 1000:.2f}' for name, seconds in metrics.timings.items()]
+        entries.append(f'total;dur={wall_seconds * 1000:.2f}')
+        return ', '.join(entries)
+
+    def log_if_slow(self, request, view, metrics, wall_seconds):
+        too_many = metrics.queries > settings.INSTRUMENTATION_SLOW_QUERY_COUNT
+        too_slow = wall_seconds * 1000 > settings.INSTRUMENTATION_SLOW_MS
+        if too_many or too_slow:
+            logger.warning(
+                "Slow request %s %s (%s): %d queries, %.1f ms SQL, %.1f ms total\n%s",
+                request.method, request.path, view, metrics.queries,
+                metrics.sql_seconds * 1000, wall_seconds * 1000,
+                '\n'.join(metrics.statements),
+            )
+
+
+def metrics_view(request):
+    """Expose the aggregated request metrics in Prometheus text format."""
+    token = settings.INSTRUMENTATION_METRICS_TOKEN
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4')
@@ -0,0 +1,17 @@
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+from .instrumentation import timed
+
+
+def json_response(data, status=200):
+    """
+    Render `data` exactly like DRF's JSONRenderer, for the async views that
+    bypass DRF. The data is kept on the response for caching, as on DRF's
+    Response.
+    """
+    with timed('render'):
+        body = JSONRenderer().render(data)
+    response = HttpResponse(body, content_type='application/json', status=status)
+    response.data = data
+    return response
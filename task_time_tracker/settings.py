@@ -46,7 +46,9 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'task_time_tracker.urls'
+# Serve the hot read paths and login with async views; asgi.py enables this
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS') == 'True'
+ROOT_URLCONF = 'task_time_tracker.urls_async' if ASYNC_VIEWS else 'task_time_tracker.urls'
 
 TEMPLATES = [
     {
@@ -65,16 +67,66 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'task_time_tracker.wsgi.application'
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': os.getenv('DB_NAME'),
-        'USER': os.getenv('DB_USER'),
-        'PASSWORD': os.getenv('DB_PASSWORD'),
-        'HOST': os.getenv('DB_HOST'),
-        'PORT': os.getenv('DB_PORT'),
+# DB_ENGINE=sqlite3 runs against a local SQLite file, e.g. for benchmarks
+if os.getenv('DB_ENGINE') == 'sqlite3':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('DB_NAME') or BASE_DIR / 'db.sqlite3',
+        }
     }
-}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME'),
+            'USER': os.getenv('DB_USER'),
+            'PASSWORD': os.getenv('DB_PASSWORD'),
+            'HOST': os.getenv('DB_HOST'),
+            'PORT': os.getenv('DB_PORT'),
+            # Keep connections open between requests instead of reconnecting every time,
+            # and check they are still usable before reusing them. asgi.py turns this off.
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+        }
+    }
+
+    # Server-side connection pooling with psycopg_pool (requires psycopg 3).
+    # Replaces persistent connections: Django returns connections to the pool
+    # at the end of each request.
+    if os.getenv('DB_POOL') == 'True':
+        from psycopg_pool import ConnectionPool
+
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS'] = {
+            'pool': {
+                'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+                'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+                'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+                # Recycle connections periodically so server-side state and memory don't build up
+                'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', 1800)),
+                'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', 300)),
+                # Verify a connection is alive before handing it out
+                'check': ConnectionPool.check_connection,
+            },
+        }
+
+# Optional read replica for read-only endpoints (task list, detail and stats).
+# Users are pinned to the primary for a few seconds after their own writes;
+# the pins live in the default cache, so a replica also needs REDIS_URL
+# (enforced by the tracker.E002 system check).
+READ_REPLICA_ALIAS = 'replica'
+READ_REPLICA_PIN_SECONDS = int(os.getenv('READ_REPLICA_PIN_SECONDS', 10))
+
+if os.getenv('DB_REPLICA_HOST'):
+    DATABASES[READ_REPLICA_ALIAS] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('DB_REPLICA_HOST'),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default'].get('PORT')),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ROUTERS = ['task_time_tracker.db_routers.ReplicaRouter']
+    MIDDLEWARE.append('task_time_tracker.db_routers.ReplicaPinningMiddleware')
 
 
 # Password validation
@@ -95,6 +147,28 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing. PASSWORD_HASHER picks the hasher for new passwords:
+# 'pbkdf2' (default) or 'argon2' (requires argon2-cffi). Hashes made by the
+# other hasher, or with other cost settings, still verify and are rehashed
+# on the user's next login. Unset costs keep Django's defaults.
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'pbkdf2')
+PASSWORD_HASHERS = [
+    'accounts.hashers.TunablePBKDF2PasswordHasher',
+    'accounts.hashers.TunableArgon2PasswordHasher',
+]
+if PASSWORD_HASHER == 'argon2':
+    PASSWORD_HASHERS.reverse()
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv('PASSWORD_PBKDF2_ITERATIONS', 0))
+ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', 0))
+ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', 0))  # KiB
+ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', 0))
+
+# Login attempts allowed per client IP and per email address, checked
+# before any password hashing; empty disables the limit. The per-IP limit is
+# off unless set, since everyone behind one NAT or office proxy shares an IP
+LOGIN_THROTTLE_IP_RATE = os.getenv('LOGIN_THROTTLE_IP_RATE') or None
+LOGIN_THROTTLE_EMAIL_RATE = os.getenv('LOGIN_THROTTLE_EMAIL_RATE', '10/min') or None
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -123,11 +197,15 @@ AUTH_USER_MODEL = 'accounts.CustomUser'
 # Add to the AUTHENTICATION_CLASSES in your settings.py
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # Reverse proxies in front of the app that append the client IP to
+    # X-Forwarded-For. With 0 the header is ignored and throttles use the
+    # connection's address, so clients cannot pick their own IP
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
 }
 
 SIMPLE_JWT = {
@@ -142,10 +220,81 @@ SIMPLE_JWT = {
     'ISSUER': None,
     'JWK_URL': None,
     'LEEWAY': 0,
+    'TOKEN_USER_CLASS': 'accounts.authentication.ClaimsUser',
 }
 
+# Seconds to cache a user's active flag and role when authenticating from token
+# claims; 0 trusts the token claims without any database check
+JWT_USER_CACHE_TTL = int(os.getenv('JWT_USER_CACHE_TTL', 60))
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",  # React development server
 ]
 CORS_ALLOW_CREDENTIALS = True
 
+
+# Task list pagination
+TASK_LIST_PAGE_SIZE = int(os.getenv('TASK_LIST_PAGE_SIZE', 100))
+TASK_LIST_MAX_PAGE_SIZE = int(os.getenv('TASK_LIST_MAX_PAGE_SIZE', 1000))
+TASK_LIST_STREAM_CHUNK_SIZE = int(os.getenv('TASK_LIST_STREAM_CHUNK_SIZE', 2000))
+# Rows joined into each chunk of a streamed export
+TASK_EXPORT_BATCH_ROWS = int(os.getenv('TASK_EXPORT_BATCH_ROWS', 500))
+
+# Maximum number of tasks accepted by the bulk create endpoint
+TASK_BULK_CREATE_MAX_ITEMS = int(os.getenv('TASK_BULK_CREATE_MAX_ITEMS', 500))
+
+# Maximum number of tasks accepted by the bulk approve/reject endpoint
+TASK_BULK_ACTION_MAX_ITEMS = int(os.getenv('TASK_BULK_ACTION_MAX_ITEMS', 1000))
+
+# Maximum number of buckets returned by the time-series stats endpoint
+TASK_STATS_SERIES_MAX_BUCKETS = int(os.getenv('TASK_STATS_SERIES_MAX_BUCKETS', 400))
+
+# Maximum number of ranked results returned by the task search endpoint
+TASK_SEARCH_MAX_RESULTS = int(os.getenv('TASK_SEARCH_MAX_RESULTS', 50))
+
+# Monthly task partitions (PostgreSQL) kept ahead of today by manage_task_partitions,
+# and months kept attached before the current one (0 keeps every partition)
+TASK_PARTITION_MONTHS_AHEAD = int(os.getenv('TASK_PARTITION_MONTHS_AHEAD', 3))
+TASK_PARTITION_RETAIN_MONTHS = int(os.getenv('TASK_PARTITION_RETAIN_MONTHS', 0))
+
+# Response cache for task lists and stats. Local memory by default; set
+# REDIS_URL to share the cache between processes. Invalidation only reaches
+# the process that made the write, so the tracker.E001 system check refuses
+# a local-memory cache when WEB_CONCURRENCY (the server's worker processes,
+# as read by gunicorn) is above 1.
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', 1))
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+TRACKER_CACHE_ALIAS = os.getenv('TRACKER_CACHE_ALIAS', 'default')
+TRACKER_CACHE_TIMEOUT = int(os.getenv('TRACKER_CACHE_TIMEOUT', 60))  # Seconds; 0 disables caching
+
+# Server-Sent Events push of task changes (served under ASGI). The in-process
+# broker only reaches clients of the same process; multi-process deployments
+# use 'tracker.events.RedisBroker'.
+TASK_EVENTS_BACKEND = os.getenv('TASK_EVENTS_BACKEND', 'tracker.events.InProcessBroker')
+TASK_EVENTS_REDIS_URL = os.getenv('TASK_EVENTS_REDIS_URL', os.getenv('REDIS_URL'))
+TASK_EVENTS_HEARTBEAT_SECONDS = int(os.getenv('TASK_EVENTS_HEARTBEAT_SECONDS', 15))
+TASK_EVENTS_MAX_SECONDS = int(os.getenv('TASK_EVENTS_MAX_SECONDS', 3600))  # Streams also end when the token expires
+TASK_EVENTS_QUEUE_SIZE = int(os.getenv('TASK_EVENTS_QUEUE_SIZE', 100))  # Per-connection backlog before a resync
+
+# Opt-in request instrumentation: query counts and timings in Server-Timing
+# headers, Prometheus metrics at /metrics/ and logging of slow requests
+REQUEST_INSTRUMENTATION = os.getenv('REQUEST_INSTRUMENTATION') == 'True'
+INSTRUMENTATION_SLOW_QUERY_COUNT = int(os.getenv('INSTRUMENTATION_SLOW_QUERY_COUNT', 20))
+INSTRUMENTATION_SLOW_MS = float(os.getenv('INSTRUMENTATION_SLOW_MS', 500))
+INSTRUMENTATION_METRICS_TOKEN = os.getenv('INSTRUMENTATION_METRICS_TOKEN')  # Optional bearer token for /metrics/
+
+if REQUEST_INSTRUMENTATION:
+    MIDDLEWARE.insert(0, 'task_time_tracker.instrumentation.RequestInstrumentationMiddleware')
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 
@@ -6,3 +7,8 @@ urlpatterns = [
     path('api/accounts/', include('accounts.urls')),  
     path('api/tracker/', include('tracker.urls')),  
 ]
+
+if settings.REQUEST_INSTRUMENTATION:
+    from .instrumentation import metrics_view
+
+    urlpatterns.append(path('metrics/', metrics_view, name='metrics'))
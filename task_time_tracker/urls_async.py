@@ -0,0 +1,18 @@
+"""
+URLconf for the fully async ASGI deployment: login and the task list,
+detail and stats endpoints are served by async views, every other route is
+the same as in urls.py. Selected by ASYNC_VIEWS, which asgi.py turns on.
+"""
+from django.urls import path
+
+from accounts import async_views as accounts_async_views
+from tracker import async_views as tracker_async_views
+
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('api/accounts/login/', accounts_async_views.login, name='login'),
+    path('api/tracker/tasks/', tracker_async_views.task_list, name='task-list'),
+    path('api/tracker/task/<int:pk>/', tracker_async_views.task_detail, name='task-detail'),
+    path('api/tracker/tasks/stats/', tracker_async_views.task_stats, name='task-stats'),
+] + sync_urlpatterns
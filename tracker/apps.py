@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class TrackerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tracker'
+
+    def ready(self):
+        from . import checks  # noqa: F401
+        from .cache import invalidate
+        from .events import publish_task_events
+        from .signals import tasks_changed
+
+        tasks_changed.connect(invalidate, dispatch_uid='tracker.cache.invalidate')
+        tasks_changed.connect(publish_task_events, dispatch_uid='tracker.events.publish_task_events')
@@ -0,0 +1,166 @@
+"""
+Async versions of the hottest read paths: the task list, task detail and
+stats. DRF views are sync only, so these are plain Django async views that
+authenticate with the same JWT claims, apply the same filters and produce
+the same JSON as their DRF counterparts in views.py, using the async ORM
+so a request waiting on the database does not hold a thread.
+
+They are routed by task_time_tracker.urls_async, which the ASGI entry point
+uses by default.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import router
+from django.http import StreamingHttpResponse
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_safe
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated
+from rest_framework.utils.encoders import JSONEncoder
+
+from accounts.authentication import ClaimsJWTAuthentication, authenticate_request
+from task_time_tracker.db_routers import use_read_replica
+from task_time_tracker.instrumentation import timed
+from task_time_tracker.responses import json_response
+
+from .cache import acached_response, employee_scope, not_modified_response, set_validators
+from .models import Task
+from .pagination import InvalidCursor, apaginate_tasks, get_page_size
+from .serializers import TaskReadSerializer
+from .stats import acompute_task_stats
+from .views import stats_tasks, visible_tasks
+
+
+def authenticated(view):
+    """
+    Authenticate the request like ClaimsJWTAuthentication and IsAuthenticated
+    do for the DRF views, setting request.user.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            result = await sync_to_async(authenticate_request)(request)
+            if result is None:
+                raise NotAuthenticated()
+        except (AuthenticationFailed, NotAuthenticated) as e:
+            detail = e.detail if isinstance(e.detail, dict) else {"detail": e.detail}
+            response = json_response(detail, status=status.HTTP_401_UNAUTHORIZED)
+            response['WWW-Authenticate'] = ClaimsJWTAuthentication().authenticate_header(request)
+            return response
+        request.user = result[0]
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+@require_safe
+@authenticated
+@use_read_replica
+async def task_list(request):
+    """Async TaskListView.list."""
+    try:
+        queryset = visible_tasks(request.user, request.GET).order_by('date', 'id')
+    except ValueError as e:
+        return json_response({
+            "detail": str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    # Opt-in streaming mode for clients that want every matching task
+    if request.GET.get('stream') == 'true':
+        # Rows are fetched after the view returns, so pick the database now
+        queryset = queryset.using(router.db_for_read(Task))
+        return StreamingHttpResponse(stream_tasks(queryset), content_type='application/json')
+
+    async def build():
+        try:
+            rows, next_cursor = await apaginate_tasks(
+                TaskReadSerializer.rows(queryset),
+                cursor=request.GET.get('cursor'),
+                page_size=get_page_size(request.GET.get('page_size')),
+                position=TaskReadSerializer.position,
+            )
+        except InvalidCursor as e:
+            return json_response({
+                "detail": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        with timed('serialize'):
+            data = TaskReadSerializer.many(rows)
+        return json_response({
+            "detail": "Tasks fetched successfully.",
+            "tasks": data,
+            "next_cursor": next_cursor
+        })
+
+    return await acached_response(request, 'list', build, employee_id=employee_scope(request))
+
+
+async def stream_tasks(queryset):
+    """
+    Async TaskListView.stream_tasks. QuerySet.aiterator() cannot stream
+    values_list rows, so the tasks are read in keyset pages instead, which
+    keeps memory just as flat.
+    """
+    encoder = JSONEncoder()
+    yield '{"detail": "Tasks fetched successfully.", "tasks": ['
+    separator = ''
+    cursor = None
+    while True:
+        rows, cursor = await apaginate_tasks(
+            TaskReadSerializer.rows(queryset),
+            cursor=cursor,
+            page_size=settings.TASK_LIST_STREAM_CHUNK_SIZE,
+            position=TaskReadSerializer.position,
+        )
+        for row in rows:
+            yield separator + encoder.encode(TaskReadSerializer.to_representation(row))
+            separator = ','
+        if cursor is None:
+            break
+    yield ']}'
+
+
+@require_safe
+@authenticated
+@use_read_replica
+async def task_detail(request, pk):
+    """Async TaskDetailView.get."""
+    row = await TaskReadSerializer.rows(Task.objects.filter(pk=pk), 'updated_at').afirst()
+    if row is None:
+        return json_response({
+            "detail": "Task not found."
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    # Answer conditional requests for an unchanged task without serializing it
+    *row, updated_at = row
+    etag = quote_etag(f"{pk}-{updated_at.timestamp()}")
+    last_modified = updated_at.timestamp()
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified:
+        return set_validators(not_modified, etag, last_modified)
+
+    with timed('serialize'):
+        data = TaskReadSerializer.to_representation(row)
+    return set_validators(json_response({
+        "task": data
+    }), etag, last_modified)
+
+
+@require_safe
+@authenticated
+@use_read_replica
+async def task_stats(request):
+    """Async task_stats."""
+    try:
+        tasks = stats_tasks(request.GET)
+    except ValueError as e:
+        return json_response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    async def build():
+        return json_response(await acompute_task_stats(tasks))
+
+    try:
+        return await acached_response(request, 'stats', build, employee_id=employee_scope(request, own_tasks=False))
+    except Exception as e:
+        return json_response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,214 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from task_time_tracker.db_routers import primary_reads, reading_replica
+from task_time_tracker.responses import json_response
+
+GENERATION_KEY = 'tracker:generation'
+# Bumped by full invalidations; every per-employee generation includes it
+RESET_KEY = 'tracker:generation:reset'
+
+
+def get_cache():
+    return caches[settings.TRACKER_CACHE_ALIAS]
+
+
+def generation_keys(employee_id=None):
+    """
+    The cache keys making up the generation of responses covering one
+    employee's tasks, or everyone's when employee_id is None.
+    """
+    if employee_id is None:
+        return [GENERATION_KEY]
+    return [RESET_KEY, f'{GENERATION_KEY}:{employee_id}']
+
+
+def new_generation():
+    return uuid.uuid4().hex
+
+
+def current_generation(employee_id=None):
+    """
+    Return the token of the current generation of the task data covering
+    one employee, or everyone when employee_id is None. Every task write
+    starts a new generation for everyone and for the employees it touches,
+    which orphans the cached responses built from the previous one, so one
+    employee's writes leave everyone else's cached lists and stats in place.
+    """
+    cache = get_cache()
+    keys = generation_keys(employee_id)
+    generations = cache.get_many(keys)
+    missing = [key for key in keys if key not in generations]
+    if missing:
+        # Another process may add the key first; re-read to agree on its
+        # token, falling back to ours if the cache keeps nothing (DummyCache)
+        fresh = {key: new_generation() for key in missing}
+        for key, generation in fresh.items():
+            cache.add(key, generation, None)
+        generations = {**fresh, **cache.get_many(keys)}
+    return ':'.join(generations[key] for key in keys)
+
+
+async def acurrent_generation(employee_id=None):
+    """Async version of current_generation()."""
+    cache = get_cache()
+    keys = generation_keys(employee_id)
+    generations = await cache.aget_many(keys)
+    missing = [key for key in keys if key not in generations]
+    if missing:
+        fresh = {key: new_generation() for key in missing}
+        for key, generation in fresh.items():
+            await cache.aadd(key, generation, None)
+        generations = {**fresh, **await cache.aget_many(keys)}
+    return ':'.join(generations[key] for key in keys)
+
+
+def invalidate(employee_ids=None, **kwargs):
+    """
+    Start a new generation for everyone and for the given employees, or
+    for every employee when employee_ids is None. Connected to the
+    tasks_changed signal.
+    """
+    keys = [GENERATION_KEY]
+    if employee_ids is None:
+        keys.append(RESET_KEY)
+    else:
+        keys.extend(generation_keys(employee_id)[-1] for employee_id in employee_ids)
+    generation = new_generation()
+    get_cache().set_many({key: generation for key in keys}, None)
+
+
+def employee_scope(request, own_tasks=True):
+    """
+    The id of the one employee whose tasks a response covers, or None if it
+    may cover several. With own_tasks the view only shows employees their
+    own tasks; otherwise only an `employee` filter narrows it to one.
+    """
+    user = request.user
+    if own_tasks and user.role == 'employee':
+        return user.pk
+    # DRF requests expose query_params; the async views get plain Django requests
+    employee = getattr(request, 'query_params', request.GET).get('employee')
+    return int(employee) if employee and employee.isdigit() else None
+
+
+def request_fingerprint(request):
+    """
+    Identify what a response depends on: the user's role and id and the
+    normalized query parameters.
+    """
+    # DRF requests expose query_params; the async views get plain Django requests
+    query_params = getattr(request, 'query_params', request.GET)
+    params = sorted(
+        (name, sorted(query_params.getlist(name))) for name in query_params
+    )
+    digest = hashlib.md5(repr(params).encode()).hexdigest()
+    user = request.user
+    return f'{user.role}:{user.pk}:{digest}'
+
+
+def not_modified_response(request, etag, last_modified):
+    """Return a 304 response if the request's validators match, else None."""
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified) if last_modified is not None else None,
+    )
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'private, no-cache'
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def cache_key(request, scope, token):
+    fingerprint = request_fingerprint(request)
+    return f'tracker:{scope}:{token}:{fingerprint}', fingerprint
+
+
+def generation_etag(scope, fingerprint, token):
+    return quote_etag(hashlib.md5(f'{scope}:{fingerprint}:{token}'.encode()).hexdigest())
+
+
+def cached_response(request, scope, build, employee_id=None):
+    """
+    Return the cached response for this request, calling build() to produce
+    it on a miss. Only 200 responses are cached.
+
+    Pass the employee_scope() of the request as `employee_id`, so the
+    response is only invalidated by writes that can change it. The ETag is
+    derived from that generation, so a matching If-None-Match gets a 304
+    before the cache or the database is read. There is no Last-Modified:
+    a date in whole seconds cannot tell two generations of the same second
+    apart, and clients revalidating with it could miss a write.
+
+    The generation moves on when a write commits on the primary, before a
+    replica necessarily has it, so responses cached or tagged with it are
+    built from the primary. With the cache disabled a replica view builds
+    from the replica and its response gets no ETag.
+    """
+    token = current_generation(employee_id)
+    key, fingerprint = cache_key(request, scope, token)
+    etag = generation_etag(scope, fingerprint, token)
+    not_modified = not_modified_response(request, etag, None)
+    if not_modified:
+        return set_validators(not_modified, etag, None)
+
+    if not settings.TRACKER_CACHE_TIMEOUT:
+        response = build()
+        # A lagging replica's response must not carry the generation's ETag
+        if response.status_code != 200 or reading_replica():
+            return response
+        return set_validators(response, etag, None)
+
+    cache = get_cache()
+    data = cache.get(key)
+    if data is None:
+        with primary_reads():
+            response = build()
+        if response.status_code != 200:
+            return response
+        data = response.data
+        cache.set(key, data, settings.TRACKER_CACHE_TIMEOUT)
+    return set_validators(Response(data), etag, None)
+
+
+async def acached_response(request, scope, build, employee_id=None):
+    """
+    Async version of cached_response(). `build` is a coroutine function
+    returning a json_response().
+    """
+    token = await acurrent_generation(employee_id)
+    key, fingerprint = cache_key(request, scope, token)
+    etag = generation_etag(scope, fingerprint, token)
+    not_modified = not_modified_response(request, etag, None)
+    if not_modified:
+        return set_validators(not_modified, etag, None)
+
+    if not settings.TRACKER_CACHE_TIMEOUT:
+        response = await build()
+        # A lagging replica's response must not carry the generation's ETag
+        if response.status_code != 200 or reading_replica():
+            return response
+        return set_validators(response, etag, None)
+
+    cache = get_cache()
+    data = await cache.aget(key)
+    if data is None:
+        with primary_reads():
+            response = await build()
+        if response.status_code != 200:
+            return response
+        data = response.data
+        await cache.aset(key, data, settings.TRACKER_CACHE_TIMEOUT)
+    return set_validators(json_response(data), etag, None)
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core import checks
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from task_time_tracker.db_routers import replica_enabled
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    The response cache generations live in the tracker cache, so with
+    several worker processes it must be shared: a local-memory cache would
+    let every other process keep serving responses a write invalidated.
+    """
+    if settings.WEB_CONCURRENCY > 1 and isinstance(caches[settings.TRACKER_CACHE_ALIAS], LocMemCache):
+        return [checks.Error(
+            f"The '{settings.TRACKER_CACHE_ALIAS}' cache is local to each process, but WEB_CONCURRENCY "
+            f"is {settings.WEB_CONCURRENCY}; cached task lists and stats would go stale in the other workers.",
+            hint="Set REDIS_URL, or point TRACKER_CACHE_ALIAS at a shared cache.",
+            id='tracker.E001',
+        )]
+    return []
+
+
+@checks.register(checks.Tags.caches, checks.Tags.database)
+def check_replica_pin_cache(app_configs, **kwargs):
+    """
+    Users who wrote are pinned to the primary through the default cache,
+    so with a read replica it must be shared by every worker; otherwise a
+    user's next request can land on another process and read the replica
+    before their write has reached it.
+    """
+    if replica_enabled() and isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache):
+        return [checks.Error(
+            f"A read replica is configured, but the '{DEFAULT_CACHE_ALIAS}' cache holding the "
+            "read-your-writes pins is local to each process.",
+            hint="Set REDIS_URL to share the cache between processes.",
+            id='tracker.E002',
+        )]
+    return []
@@ -0,0 +1,200 @@
+"""
+Push notifications of task changes.
+
+tasks_changed events are published to a broker on two kinds of channel:
+`user:<id>` carries the changes to that employee's own tasks and
+`role:manager` carries every change. The task_events view streams a user's
+channel to the browser as Server-Sent Events; clients then fetch the
+changed rows through the delta sync endpoint.
+
+The default InProcessBroker only reaches clients connected to the same
+process. Multi-process or multi-node deployments set
+TASK_EVENTS_BACKEND = 'tracker.events.RedisBroker', which relays events
+through Redis pub/sub at TASK_EVENTS_REDIS_URL.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Sent to a subscriber that fell too far behind and missed events
+RESYNC = {"action": "resync"}
+# How long EventSource clients wait before reconnecting
+RETRY_MS = 3000
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the process-wide broker configured by TASK_EVENTS_BACKEND."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.TASK_EVENTS_BACKEND)()
+    return _broker
+
+
+def channels_for(user):
+    """The channels a user's event stream subscribes to."""
+    if user.role == 'manager':
+        return ['role:manager']
+    return [f'user:{user.id}']
+
+
+def publish_task_events(sender, action, changes, **kwargs):
+    """
+    tasks_changed receiver publishing the change to the manager channel and
+    to the channel of every employee whose tasks changed.
+    """
+    by_employee = {}
+    for task_id, employee_id in changes:
+        by_employee.setdefault(employee_id, []).append(task_id)
+
+    try:
+        broker = get_broker()
+        broker.publish('role:manager', {
+            "action": action,
+            "task_ids": [task_id for task_id, _ in changes],
+            "employee_ids": sorted(by_employee),
+        })
+        for employee_id, task_ids in by_employee.items():
+            broker.publish(f'user:{employee_id}', {"action": action, "task_ids": task_ids})
+    except Exception:
+        # The write has already committed; a lost notification only delays clients
+        logger.exception("Could not publish %s event for tasks %s", action, [task_id for task_id, _ in changes])
+
+
+async def event_stream(channels, deadline):
+    """
+    Yield Server-Sent Events for messages on `channels` until the `deadline`
+    timestamp, with a keepalive comment whenever the stream has been idle
+    for TASK_EVENTS_HEARTBEAT_SECONDS.
+    """
+    subscription = await get_broker().subscribe(channels)
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        while (remaining := deadline - time.time()) > 0:
+            message = await subscription.get(min(settings.TASK_EVENTS_HEARTBEAT_SECONDS, remaining))
+            if message is None:
+                yield ': keepalive\n\n'
+            else:
+                yield f'event: {message["action"]}\ndata: {json.dumps(message)}\n\n'
+    finally:
+        await subscription.close()
+
+
+class InProcessSubscription:
+    def __init__(self, broker, channels, loop):
+        self.broker = broker
+        self.channels = channels
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=settings.TASK_EVENTS_QUEUE_SIZE)
+        self.overflowed = False
+
+    def put(self, message):
+        # Runs on the subscriber's event loop
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        """Return the next message, or None if none arrives within `timeout` seconds."""
+        if self.overflowed:
+            self.overflowed = False
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return RESYNC
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """Delivers events to subscribers connected to this process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = {}
+
+    def publish(self, channel, message):
+        # Publishers run in worker threads; hand the message to each subscriber's loop
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, message)
+            except RuntimeError:
+                # The subscriber's event loop has shut down
+                self.unsubscribe(subscription)
+
+    async def subscribe(self, channels):
+        subscription = InProcessSubscription(self, channels, asyncio.get_running_loop())
+        with self.lock:
+            for channel in channels:
+                self.subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            for channel in subscription.channels:
+                subscribers = self.subscriptions.get(channel)
+                if subscribers:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self.subscriptions[channel]
+
+
+class RedisSubscription:
+    def __init__(self, client, pubsub):
+        self.client = client
+        self.pubsub = pubsub
+
+    async def get(self, timeout):
+        message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None:
+            return None
+        return json.loads(message['data'])
+
+    async def close(self):
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+
+class RedisBroker:
+    """Relays events between processes through Redis pub/sub."""
+
+    prefix = 'tracker:events:'
+
+    def __init__(self):
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError:
+            raise ImproperlyConfigured("RedisBroker requires the redis package.")
+        if not settings.TASK_EVENTS_REDIS_URL:
+            raise ImproperlyConfigured("RedisBroker requires TASK_EVENTS_REDIS_URL or REDIS_URL to be set.")
+        self.redis = redis
+        self.client = redis.Redis.from_url(settings.TASK_EVENTS_REDIS_URL)
+
+    def publish(self, channel, message):
+        self.client.publish(self.prefix + channel, json.dumps(message))
+
+    async def subscribe(self, channels):
+        client = self.redis.asyncio.Redis.from_url(settings.TASK_EVENTS_REDIS_URL)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(*[self.prefix + channel for channel in channels])
+        return RedisSubscription(client, pubsub)
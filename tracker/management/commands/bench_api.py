@@ -0,0 +1,284 @@
+import json
+import math
+import random
+import subprocess
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from accounts.tokens import RoleRefreshToken
+from tracker.models import DailyHours, Task, TaskRollup, TaskTombstone
+
+BENCH_PREFIX = 'bench'
+
+
+class ConnectionCounter:
+    """connection_created receiver counting new database connections."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, sender, **kwargs):
+        self.count += 1
+
+
+class QueryCounter:
+    """Database execute wrapper counting the queries run inside it."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive every tracker and accounts endpoint in-process and report latency "
+        "percentiles, requests/second and queries/request as JSON. Run seed_tracker first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint.')
+        parser.add_argument('--password', default='password', help='Password of the seeded users.')
+        parser.add_argument('--output', help='Write the JSON results to this file instead of stdout.')
+        parser.add_argument('--no-cache', action='store_true', help='Disable the tracker response cache.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for picking users and tasks.')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.password = options['password']
+        # Every login comes from one client, which the login throttles would turn away
+        overrides = {'ALLOWED_HOSTS': ['testserver'], 'LOGIN_THROTTLE_IP_RATE': None, 'LOGIN_THROTTLE_EMAIL_RATE': None}
+        if options['no_cache']:
+            overrides['TRACKER_CACHE_TIMEOUT'] = 0
+
+        with override_settings(**overrides):
+            self.connect_ms = self.measure_connect()
+            self.prepare()
+            try:
+                results = self.run(options['requests'])
+            finally:
+                self.cleanup()
+
+        report = {
+            "meta": {
+                "timestamp": timezone.now().isoformat(),
+                "commit": self.git_commit(),
+                "database": connection.vendor,
+                "requests_per_endpoint": options['requests'],
+                "cache_timeout": 0 if options['no_cache'] else settings.TRACKER_CACHE_TIMEOUT,
+                "conn_max_age": connection.settings_dict['CONN_MAX_AGE'],
+                "pool": bool(connection.settings_dict.get('OPTIONS', {}).get('pool')),
+                "connect_ms": self.connect_ms,
+            },
+            "endpoints": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+    def prepare(self):
+        manager = CustomUser.objects.filter(role='manager').first()
+        if manager is None or not Task.objects.exists():
+            raise CommandError("No data to benchmark against. Run `manage.py seed_tracker` first.")
+
+        # A dedicated employee whose writes never collide with seeded tasks
+        self.employee, _ = CustomUser.objects.get_or_create(
+            email=f'{BENCH_PREFIX}-employee@example.com',
+            defaults={'username': f'{BENCH_PREFIX}-employee', 'role': 'employee'},
+        )
+        self.employee.set_password(self.password)
+        self.employee.save()
+        self.login_email = self.employee.email
+
+        self.employee_client = self.client_for(self.employee)
+        self.manager_client = self.client_for(manager)
+        self.task_ids = list(Task.objects.order_by('-id').values_list('id', flat=True)[:1000])
+        self.day = date(1990, 1, 1)
+        # The export covers the last month of seeded tasks; sync starts 500 changes back
+        latest = Task.objects.order_by('-date').values_list('date', flat=True).first()
+        self.export_range = {"start": (latest - timedelta(days=30)).isoformat(), "end": latest.isoformat()}
+        last_change = Task.objects.order_by('-change_seq').values_list('change_seq', flat=True).first() or 0
+        self.sync_cursor = max(0, last_change - 500)
+
+    def client_for(self, user):
+        token = RoleRefreshToken.for_user(user).access_token
+        return Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def next_day(self):
+        self.day += timedelta(days=1)
+        return self.day.isoformat()
+
+    def task_payload(self):
+        return {
+            "title": "Benchmark task",
+            "description": "Created by bench_api",
+            "hours_spent": "1.00",
+            "tags": "bench,api",
+            "date": self.next_day(),
+        }
+
+    def run(self, count):
+        """
+        Run `count` requests per endpoint. Write endpoints operate on tasks the
+        benchmark created itself, and everything it creates is removed again.
+        """
+        created = []
+        pending = []
+        results = {}
+
+        def create_task():
+            response = self.employee_client.post(reverse('task-create'), self.task_payload(), content_type='application/json')
+            created.append(response.json()['task']['id'])
+            return response
+
+        def bulk_create():
+            payload = [self.task_payload() for _ in range(5)]
+            response = self.employee_client.post(reverse('task-bulk-create'), payload, content_type='application/json')
+            pending.extend(task['id'] for task in response.json()['tasks'])
+            return response
+
+        def bulk_action():
+            ids, pending[:] = pending[:5], pending[5:]
+            return self.manager_client.patch(
+                reverse('task-bulk-action'), {"ids": ids, "action": "approve"}, content_type='application/json'
+            )
+
+        def export():
+            response = self.manager_client.get(reverse('task-export'), self.export_range)
+            # The rows are only read while the response streams
+            for _ in response.streaming_content:
+                pass
+            return response
+
+        def events():
+            # Measures authenticating and opening the stream; the events
+            # themselves never end, so the response is closed unread
+            response = self.employee_client.get(reverse('task-events'))
+            response.close()
+            return response
+
+        scenarios = [
+            ('login', lambda i: self.client.post(
+                reverse('login'), {"email": self.login_email, "password": self.password}, content_type='application/json'
+            )),
+            ('register', lambda i: self.client.post(reverse('register'), {
+                "email": f'{BENCH_PREFIX}-register-{i}-{time.time_ns()}@example.com',
+                "password": self.password,
+                "role": "employee",
+            }, content_type='application/json')),
+            ('task-list (employee)', lambda i: self.employee_client.get(reverse('task-list'))),
+            ('task-list (manager)', lambda i: self.manager_client.get(reverse('task-list'), {"status": "pending"})),
+            ('task-detail', lambda i: self.manager_client.get(
+                reverse('task-detail', args=[self.rng.choice(self.task_ids)])
+            )),
+            ('task-stats', lambda i: self.manager_client.get(reverse('task-stats'))),
+            ('task-stats-series', lambda i: self.manager_client.get(reverse('task-stats-series'), {"period": "week"})),
+            ('task-search', lambda i: self.manager_client.get(reverse('task-search'), {"q": "review"})),
+            ('task-export', lambda i: export()),
+            ('task-sync', lambda i: self.manager_client.get(reverse('task-sync'), {"cursor": self.sync_cursor})),
+            ('task-events', lambda i: events()),
+            ('task-create', lambda i: create_task()),
+            ('task-update', lambda i: self.employee_client.put(
+                reverse('task-update', args=[created[i]]), {"hours_spent": "2.00"}, content_type='application/json'
+            )),
+            ('task-action', lambda i: self.manager_client.patch(
+                reverse('task-action', args=[created[i]]), {"action": "approve"}, content_type='application/json'
+            )),
+            ('task-delete', lambda i: self.employee_client.delete(reverse('task-delete', args=[created[i]]))),
+            ('task-bulk-create', lambda i: bulk_create()),
+            ('task-bulk-action', lambda i: bulk_action()),
+        ]
+
+        self.client = Client()
+        for name, request in scenarios:
+            results[name] = self.measure(request, count)
+            self.stderr.write(
+                f"{name:<22} p50 {results[name]['p50_ms']:>8.2f} ms  "
+                f"p95 {results[name]['p95_ms']:>8.2f} ms  "
+                f"{results[name]['requests_per_second']:>8.1f} req/s  "
+                f"{results[name]['queries_per_request']:>5.1f} queries  "
+                f"{results[name]['connections_per_request']:>4.2f} connects"
+            )
+        return results
+
+    def measure(self, request, count):
+        latencies = []
+        statuses = {}
+        counter = QueryCounter()
+        connections_opened = ConnectionCounter()
+        connection_created.connect(connections_opened)
+        with connection.execute_wrapper(counter):
+            started = time.perf_counter()
+            for i in range(count):
+                start = time.perf_counter()
+                response = request(i)
+                # The test client skips the end-of-request connection handling a real
+                # server does, so run it here to honour CONN_MAX_AGE and pooling
+                close_old_connections()
+                latencies.append((time.perf_counter() - start) * 1000)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            elapsed = time.perf_counter() - started
+        connection_created.disconnect(connections_opened)
+
+        latencies.sort()
+        return {
+            "requests": count,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "mean_ms": sum(latencies) / count,
+            "requests_per_second": count / elapsed,
+            "queries_per_request": counter.count / count,
+            # With persistent or pooled connections this stays near zero
+            "connections_per_request": connections_opened.count / count,
+            "status_codes": {str(code): n for code, n in sorted(statuses.items())},
+        }
+
+    def measure_connect(self, samples=5):
+        """Average time in ms to open a database connection and run a trivial query."""
+        timings = []
+        for _ in range(samples):
+            connection.close()
+            start = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            timings.append((time.perf_counter() - start) * 1000)
+        return sum(timings) / samples
+
+    def cleanup(self):
+        # Everything the benchmark employee owns was created by the benchmark
+        Task.objects.filter(employee=self.employee).delete()
+        DailyHours.objects.filter(employee=self.employee).delete()
+        TaskRollup.objects.filter(employee=self.employee).delete()
+        TaskTombstone.objects.filter(employee=self.employee).delete()
+        CustomUser.objects.filter(email__startswith=f'{BENCH_PREFIX}-register-').delete()
+
+    def git_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, cwd=settings.BASE_DIR, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,272 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from accounts.tokens import RoleRefreshToken
+from tracker.models import Task
+
+from .bench_api import BENCH_PREFIX, percentile
+
+
+class DatabaseLatency:
+    """
+    connection_created receiver adding a fixed delay to every query, to
+    stand in for the network round trip to a remote database.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def __call__(self, sender, connection, **kwargs):
+        connection.execute_wrappers.append(self.wrap)
+
+    def wrap(self, execute, sql, params, many, context):
+        time.sleep(self.seconds)
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync views served over WSGI with the async views served over ASGI "
+        "at a fixed worker count. The same requests are sent by --concurrency clients to "
+        "a WSGI handler with --workers threads and to one ASGI event loop (a single "
+        "ASGI worker). Reports latency percentiles and requests/second as JSON. "
+        "Run seed_tracker first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint.')
+        parser.add_argument('--concurrency', type=int, default=32, help='Concurrent clients.')
+        parser.add_argument('--workers', type=int, default=4, help='WSGI worker threads.')
+        parser.add_argument('--db-latency-ms', type=float, default=0,
+                            help='Delay added to every query to simulate a remote database.')
+        parser.add_argument('--password', default='password', help='Password of the benchmark user.')
+        parser.add_argument('--output', help='Write the JSON results to this file instead of stdout.')
+        parser.add_argument('--no-cache', action='store_true', help='Disable the tracker response cache.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for picking tasks.')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.password = options['password']
+        # Every login comes from one client, which the login throttles would turn away
+        overrides = {'ALLOWED_HOSTS': ['testserver'], 'LOGIN_THROTTLE_IP_RATE': None, 'LOGIN_THROTTLE_EMAIL_RATE': None}
+        if options['no_cache']:
+            overrides['TRACKER_CACHE_TIMEOUT'] = 0
+
+        latency = DatabaseLatency(options['db_latency_ms'] / 1000)
+        with override_settings(**overrides):
+            scenarios = self.prepare()
+            # New connections, in every thread, get the simulated latency
+            connections.close_all()
+            if latency.seconds:
+                connection_created.connect(latency)
+            try:
+                results = {}
+                for name, request in scenarios:
+                    results[name] = {
+                        "wsgi": self.run_wsgi(request, options['requests'], options['concurrency'], options['workers']),
+                        "asgi": self.run_asgi(request, options['requests'], options['concurrency']),
+                    }
+                    for mode in ('wsgi', 'asgi'):
+                        result = results[name][mode]
+                        self.stderr.write(
+                            f"{name:<22} {mode}  p50 {result['p50_ms']:>8.2f} ms  "
+                            f"p95 {result['p95_ms']:>8.2f} ms  {result['requests_per_second']:>8.1f} req/s"
+                        )
+            finally:
+                connection_created.disconnect(latency)
+                self.cleanup()
+
+        report = {
+            "meta": {
+                "timestamp": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "requests_per_endpoint": options['requests'],
+                "concurrency": options['concurrency'],
+                "wsgi_workers": options['workers'],
+                "asgi_workers": 1,
+                "db_latency_ms": options['db_latency_ms'],
+                "cache_timeout": 0 if options['no_cache'] else settings.TRACKER_CACHE_TIMEOUT,
+            },
+            "endpoints": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+    def prepare(self):
+        manager = CustomUser.objects.filter(role='manager').first()
+        employee = CustomUser.objects.filter(role='employee', tasks__isnull=False).first()
+        if manager is None or employee is None:
+            raise CommandError("No data to benchmark against. Run `manage.py seed_tracker` first.")
+
+        self.login_user, _ = CustomUser.objects.get_or_create(
+            email=f'{BENCH_PREFIX}-asgi@example.com',
+            defaults={'username': f'{BENCH_PREFIX}-asgi', 'role': 'employee'},
+        )
+        self.login_user.set_password(self.password)
+        self.login_user.save()
+
+        employee_auth = self.bearer(employee)
+        manager_auth = self.bearer(manager)
+        task_ids = list(Task.objects.order_by('-id').values_list('id', flat=True)[:1000])
+        login = json.dumps({"email": self.login_user.email, "password": self.password}).encode()
+
+        # Each scenario returns (method, path, query, body, authorization) for request i
+        return [
+            ('login', lambda i: ('POST', reverse('login'), {}, login, None)),
+            ('task-list (employee)', lambda i: ('GET', reverse('task-list'), {}, b'', employee_auth)),
+            ('task-list (manager)', lambda i: ('GET', reverse('task-list'), {"status": "pending"}, b'', manager_auth)),
+            ('task-detail', lambda i: (
+                'GET', reverse('task-detail', args=[self.rng.choice(task_ids)]), {}, b'', manager_auth
+            )),
+            ('task-stats', lambda i: ('GET', reverse('task-stats'), {}, b'', manager_auth)),
+        ]
+
+    def bearer(self, user):
+        return f'Bearer {RoleRefreshToken.for_user(user).access_token}'
+
+    def run_wsgi(self, request, count, concurrency, workers):
+        """
+        Send `count` requests from `concurrency` client threads to the sync
+        views, with at most `workers` requests being handled at once like a
+        WSGI server with that many worker threads. Latencies include the time
+        a request waits for a free worker.
+        """
+        with override_settings(ROOT_URLCONF='task_time_tracker.urls'):
+            handler = WSGIHandler()
+            slots = threading.BoundedSemaphore(workers)
+
+            def call(i):
+                method, path, query, body, authorization = request(i)
+                environ = {
+                    'REQUEST_METHOD': method,
+                    'PATH_INFO': path,
+                    'QUERY_STRING': urlencode(query),
+                    'SERVER_NAME': 'testserver',
+                    'SERVER_PORT': '80',
+                    'SERVER_PROTOCOL': 'HTTP/1.1',
+                    'CONTENT_TYPE': 'application/json',
+                    'CONTENT_LENGTH': str(len(body)),
+                    'wsgi.input': BytesIO(body),
+                    'wsgi.url_scheme': 'http',
+                    'wsgi.errors': BytesIO(),
+                    'wsgi.multithread': True,
+                    'wsgi.multiprocess': False,
+                    'wsgi.run_once': False,
+                }
+                if authorization:
+                    environ['HTTP_AUTHORIZATION'] = authorization
+                statuses = []
+                start = time.perf_counter()
+                with slots:
+                    response = handler(environ, lambda status, headers: statuses.append(int(status[:3])))
+                    try:
+                        b''.join(response)
+                    finally:
+                        response.close()
+                return (time.perf_counter() - start) * 1000, statuses[0]
+
+            with ThreadPoolExecutor(max_workers=concurrency) as clients:
+                started = time.perf_counter()
+                results = list(clients.map(call, range(count)))
+                elapsed = time.perf_counter() - started
+        return self.summarize(results, elapsed)
+
+    def run_asgi(self, request, count, concurrency):
+        """
+        Send `count` requests from `concurrency` concurrent clients to the
+        async views, all served by one event loop.
+        """
+        with override_settings(ROOT_URLCONF='task_time_tracker.urls_async'):
+            return asyncio.run(self.drive_asgi(ASGIHandler(), request, count, concurrency))
+
+    async def drive_asgi(self, handler, request, count, concurrency):
+        pending = iter(range(count))
+        results = []
+
+        async def call(i):
+            method, path, query, body, authorization = request(i)
+            headers = [(b'host', b'testserver'), (b'content-type', b'application/json')]
+            if authorization:
+                headers.append((b'authorization', authorization.encode()))
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': method,
+                'scheme': 'http',
+                'path': path,
+                'raw_path': path.encode(),
+                'query_string': urlencode(query).encode(),
+                'root_path': '',
+                'headers': headers,
+                'client': ('127.0.0.1', 0),
+                'server': ('testserver', 80),
+            }
+            messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+            disconnected = asyncio.Event()
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                # The client never disconnects early
+                await disconnected.wait()
+                return {'type': 'http.disconnect'}
+
+            status = []
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+
+            start = time.perf_counter()
+            await handler(scope, receive, send)
+            disconnected.set()
+            return (time.perf_counter() - start) * 1000, status[0]
+
+        async def client():
+            for i in pending:
+                results.append(await call(i))
+
+        started = time.perf_counter()
+        await asyncio.gather(*[client() for _ in range(concurrency)])
+        return self.summarize(results, time.perf_counter() - started)
+
+    def summarize(self, results, elapsed):
+        latencies = sorted(latency for latency, _ in results)
+        statuses = {}
+        for _, code in results:
+            statuses[code] = statuses.get(code, 0) + 1
+        return {
+            "requests": len(results),
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "mean_ms": sum(latencies) / len(latencies),
+            "requests_per_second": len(results) / elapsed,
+            "status_codes": {str(code): n for code, n in sorted(statuses.items())},
+        }
+
+    def cleanup(self):
+        CustomUser.objects.filter(pk=self.login_user.pk).delete()
@@ -0,0 +1,66 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+
+from tracker.models import Task
+from tracker.seeding import seed_tasks, seed_users
+from tracker.serializers import TaskReadSerializer, TaskSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rows/second of TaskSerializer and TaskReadSerializer. Missing rows are "
+        "seeded inside a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+        parser.add_argument('--repeat', type=int, default=3, help='Best of N runs per serializer.')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options['rows'], options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, row_counts, repeat):
+        missing = max(row_counts) - Task.objects.count()
+        if missing > 0:
+            self.stdout.write(f"Seeding {missing} tasks...")
+            users = seed_users(max(1, missing // 500), manager_ratio=0, prefix='bench')
+            seed_tasks([u.id for u in users], missing)
+
+        encoder = JSONEncoder()
+        for count in row_counts:
+            # A fresh queryset per run, so both paths pay for their query and row building
+            def tasks():
+                return Task.objects.order_by('id')[:count]
+
+            model_output = encoder.encode(TaskSerializer(tasks(), many=True).data)
+            fast_output = encoder.encode(TaskReadSerializer.many(TaskReadSerializer.rows(tasks())))
+            if model_output != fast_output:
+                raise CommandError("TaskReadSerializer output differs from TaskSerializer.")
+
+            model_time = self.best_of(repeat, lambda: TaskSerializer(tasks(), many=True).data)
+            fast_time = self.best_of(repeat, lambda: TaskReadSerializer.many(TaskReadSerializer.rows(tasks())))
+            self.stdout.write(
+                f"{count:>8} rows  TaskSerializer: {count / model_time:>10.0f} rows/s  "
+                f"TaskReadSerializer: {count / fast_time:>10.0f} rows/s  "
+                f"speedup: {model_time / fast_time:.1f}x"
+            )
+
+    def best_of(self, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
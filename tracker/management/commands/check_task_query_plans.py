@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from tracker.models import Task
+from tracker.query_plans import analyze, hot_task_queries, is_sequential_scan
+from tracker.seeding import seed_tasks, seed_users
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Explain the hot Task queries and fail if any of them falls back to a "
+        "sequential scan of the task table. Use --seed to load a large data set "
+        "first; it is rolled back afterwards. The same check runs as part of the "
+        "test suite (tracker.tests.test_query_plans)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help='Number of tasks to seed before explaining.')
+        parser.add_argument('--users', type=int, default=2000, help='Number of users to seed alongside --seed.')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options['seed'], options['users'])
+                # The seeded rows are only needed while explaining
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, seed, user_count):
+        if seed:
+            self.stdout.write(f"Seeding {seed} tasks for {user_count} users...")
+            users = seed_users(user_count)
+            employee_ids = [u.id for u in users if u.role == 'employee']
+            seed_tasks(employee_ids, seed)
+            analyze()
+
+        failures = []
+        for name, queryset in hot_task_queries().items():
+            plan = queryset.explain()
+            self.stdout.write(f"--- {name}\n{plan}\n")
+            if is_sequential_scan(plan):
+                failures.append(name)
+
+        if failures:
+            raise CommandError(f"Sequential scan on {Task._meta.db_table} for: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All hot Task queries use an index."))
@@ -0,0 +1,188 @@
+import csv
+import time
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from accounts.models import CustomUser
+from tracker.models import DAILY_HOURS_LIMIT, DailyHours, Task
+
+MAX_ATTEMPTS = 3
+# Employees whose logged hours are read per ledger query
+EMPLOYEE_BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        "Import tasks from a CSV file with email, date (YYYY-MM-DD), hours, title and "
+        "optional tags and description columns. The file is read in chunks; each chunk "
+        "is checked against the 8-hour daily limit in memory and inserted with "
+        "Task.objects.create_many, which keeps the ledger, rollups, tag links and change "
+        "feed in sync. Invalid rows, and rows that would go over the limit, are written "
+        "to a reject file, in input order, with the reason."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with a header row.')
+        parser.add_argument('--rejects', help='Reject file; defaults to <path>.rejects.csv.')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows validated and inserted together.')
+        parser.add_argument('--status', default='pending', choices=dict(Task.STATUS_CHOICES),
+                            help='Status of the imported tasks.')
+
+    def handle(self, *args, **options):
+        self.status = options['status']
+        self.rejects_path = options['rejects'] or f"{options['path']}.rejects.csv"
+        self.rejects = None
+        # email -> employee id (None for unknown emails), filled one query per chunk
+        self.employees = {}
+
+        started = time.perf_counter()
+        read = imported = rejected = 0
+        try:
+            with open(options['path'], newline='') as f:
+                reader = csv.DictReader(f)
+                self.fieldnames = reader.fieldnames or []
+                missing = {'email', 'date', 'hours', 'title'} - set(self.fieldnames)
+                if missing:
+                    raise CommandError(f"The CSV file is missing the {', '.join(sorted(missing))} column(s).")
+
+                lines = enumerate(reader, start=2)
+                while chunk := list(islice(lines, options['chunk_size'])):
+                    created, failed = self.import_chunk(chunk)
+                    read += len(chunk)
+                    imported += created
+                    rejected += failed
+                    elapsed = time.perf_counter() - started
+                    self.stderr.write(
+                        f"{read} rows read, {imported} imported, {rejected} rejected ({read / elapsed:.0f} rows/s)"
+                    )
+        except OSError as e:
+            raise CommandError(f"Could not read {options['path']}: {e}")
+        finally:
+            if self.rejects:
+                self.rejects_file.close()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported} of {read} rows in {elapsed:.1f}s ({read / elapsed if elapsed else 0:.0f} rows/s)."
+        ))
+        if rejected:
+            self.stdout.write(self.style.WARNING(f"{rejected} rows rejected; see {self.rejects_path}."))
+
+    def import_chunk(self, chunk):
+        """Validate and insert one chunk. Returns (imported, rejected) counts."""
+        self.resolve_employees(chunk)
+        parsed = []
+        rejects = []
+        try:
+            for line, record in chunk:
+                try:
+                    parsed.append((line, record, self.parse(record)))
+                except ValueError as e:
+                    rejects.append((line, record, str(e)))
+
+            for attempt in range(MAX_ATTEMPTS):
+                hours = self.logged_hours([task for _, _, task in parsed])
+                accepted = []
+                for line, record, task in parsed:
+                    key = (task.employee_id, task.date)
+                    if hours[key] + task.hours_spent > DAILY_HOURS_LIMIT:
+                        rejects.append((line, record, "Total hours for the day cannot exceed 8 hours."))
+                        continue
+                    hours[key] += task.hours_spent
+                    accepted.append((line, record, task))
+
+                try:
+                    Task.objects.create_many([task for _, _, task in accepted])
+                except ValidationError:
+                    # Someone else logged hours for one of these days meanwhile;
+                    # read the ledger again and re-check the accepted rows
+                    parsed = accepted
+                    continue
+                return len(accepted), len(rejects)
+            raise CommandError(f"Gave up on the chunk starting at line {chunk[0][0]} after concurrent updates.")
+        finally:
+            # In input order, whichever check turned them down
+            for line, record, error in sorted(rejects, key=lambda reject: reject[0]):
+                self.reject(line, record, error)
+
+    def resolve_employees(self, chunk):
+        """Look up the employee ids of the chunk's emails not seen before, in one query."""
+        emails = {(record.get('email') or '').strip().lower() for _, record in chunk} - self.employees.keys()
+        if not emails:
+            return
+        found = dict(CustomUser.objects.filter(email__in=emails).values_list('email', 'id'))
+        for email in emails:
+            self.employees[email] = found.get(email)
+
+    def logged_hours(self, tasks):
+        """
+        Return the hours already logged for the (employee, date) pairs of
+        the tasks, read from the daily-hours ledger, as a dict defaulting
+        to 0. One query per EMPLOYEE_BATCH_SIZE employees.
+        """
+        dates = {}
+        for task in tasks:
+            dates.setdefault(task.employee_id, set()).add(task.date)
+        hours = defaultdict(Decimal)
+        employee_ids = list(dates)
+        for start in range(0, len(employee_ids), EMPLOYEE_BATCH_SIZE):
+            pairs = Q()
+            for employee_id in employee_ids[start:start + EMPLOYEE_BATCH_SIZE]:
+                pairs |= Q(employee_id=employee_id, date__in=dates[employee_id])
+            ledger = DailyHours.objects.filter(pairs).values_list('employee_id', 'date', 'total_hours')
+            for employee_id, day, total in ledger:
+                hours[employee_id, day] = total
+        return hours
+
+    def parse(self, record):
+        """Build an unsaved Task from a CSV record, raising ValueError if it is invalid."""
+        email = (record.get('email') or '').strip().lower()
+        employee_id = self.employees.get(email)
+        if employee_id is None:
+            raise ValueError(f"Unknown employee {email!r}.")
+
+        try:
+            day = date.fromisoformat((record.get('date') or '').strip())
+        except ValueError:
+            raise ValueError("Invalid date format. Use YYYY-MM-DD.")
+
+        try:
+            hours = Decimal((record.get('hours') or '').strip())
+        except InvalidOperation:
+            raise ValueError("Invalid hours.")
+        if not hours.is_finite() or hours <= 0 or hours > DAILY_HOURS_LIMIT or hours.as_tuple().exponent < -2:
+            raise ValueError("Hours must be a positive number of at most 8 with up to 2 decimal places.")
+
+        title = (record.get('title') or '').strip()
+        if not title:
+            raise ValueError("Title is required.")
+        if len(title) > Task._meta.get_field('title').max_length:
+            raise ValueError("Title is too long.")
+
+        # Stored as submitted, like tags entered through the API
+        tags = (record.get('tags') or '').strip() or None
+        if tags and len(tags) > Task._meta.get_field('tags').max_length:
+            raise ValueError("Tags are too long.")
+
+        return Task(
+            employee_id=employee_id,
+            title=title,
+            description=(record.get('description') or '').strip(),
+            hours_spent=hours,
+            tags=tags,
+            date=day,
+            status=self.status,
+        )
+
+    def reject(self, line, record, error):
+        if self.rejects is None:
+            self.rejects_file = open(self.rejects_path, 'w', newline='')
+            self.rejects = csv.DictWriter(self.rejects_file, [*self.fieldnames, 'line', 'error'], extrasaction='ignore')
+            self.rejects.writeheader()
+        self.rejects.writerow({**record, 'line': line, 'error': error})
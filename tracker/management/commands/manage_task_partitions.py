@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from tracker.cache import invalidate
+from tracker.partitions import (
+    add_months, create_partition, detach_partition, is_partitioned, list_partitions, month_start, partition_name,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the monthly task partitions for the coming months and detach the ones "
+        "older than the retention window. Detached partitions are kept as standalone "
+        "tables unless --archive-schema or --drop is given. PostgreSQL only; run it "
+        "daily or at least monthly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ahead', type=int, default=settings.TASK_PARTITION_MONTHS_AHEAD,
+                            help='Months after the current one to create partitions for.')
+        parser.add_argument('--retain', type=int, default=settings.TASK_PARTITION_RETAIN_MONTHS,
+                            help='Months before the current one to keep attached; 0 keeps every partition.')
+        parser.add_argument('--archive-schema', help='Move detached partitions into this schema.')
+        parser.add_argument('--drop', action='store_true', help='Drop detached partitions and their tag links.')
+        parser.add_argument('--dry-run', action='store_true', help='Report the changes without making them.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Task partitioning requires PostgreSQL.")
+        if not is_partitioned(connection):
+            raise CommandError("The task table is not partitioned; run migrate first.")
+        if options['drop'] and options['archive_schema']:
+            raise CommandError("Use either --drop or --archive-schema, not both.")
+
+        dry_run = options['dry_run']
+        partitions, default = list_partitions(connection)
+        existing = {partition.start for partition in partitions}
+        current = month_start(timezone.localdate())
+
+        created = 0
+        for offset in range(options['ahead'] + 1):
+            month = add_months(current, offset)
+            if month in existing:
+                continue
+            self.stdout.write(f"Creating {partition_name(month)}")
+            if not dry_run:
+                create_partition(connection, month, default)
+            created += 1
+
+        detached = 0
+        if options['retain'] > 0:
+            cutoff = add_months(current, -options['retain'])
+            for partition in partitions:
+                if partition.end > cutoff:
+                    break
+                if options['drop']:
+                    self.stdout.write(f"Dropping {partition.name}")
+                elif options['archive_schema']:
+                    self.stdout.write(f"Detaching {partition.name} into schema {options['archive_schema']}")
+                else:
+                    self.stdout.write(f"Detaching {partition.name}")
+                if not dry_run:
+                    detach_partition(connection, partition, options['archive_schema'], options['drop'])
+                detached += 1
+
+        if detached and not dry_run:
+            # Cached lists and stats may still include the detached tasks
+            invalidate()
+        if dry_run:
+            summary = f"Dry run: would create {created} and detach {detached} partitions."
+        else:
+            summary = f"Created {created} and detached {detached} partitions."
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,28 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from tracker.cache import invalidate
+from tracker.models import TaskRollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the day, week and month task rollups from the task table. Periods "
+        "before the oldest attached task partition are kept, as their tasks may have "
+        "been detached."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=date.fromisoformat,
+                            help='Only recompute periods starting on or after this date (YYYY-MM-DD).')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        TaskRollup.rebuild(since=options['since'])
+        # Cached series were built from the old rollups
+        invalidate()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {TaskRollup.objects.count()} rollup rows in {time.perf_counter() - start:.1f}s."
+        ))
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tracker.seeding import seed_tasks, seed_users
+
+
+class Command(BaseCommand):
+    help = "Seed users and tasks with realistic date, tag and status distributions."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--tasks', type=int, default=10000)
+        parser.add_argument('--manager-ratio', type=float, default=0.1)
+        parser.add_argument('--password', default='password', help='Password shared by all seeded users.')
+        parser.add_argument('--prefix', default='seed', help='Prefix for seeded emails and usernames.')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        with transaction.atomic():
+            users = seed_users(
+                options['users'],
+                manager_ratio=options['manager_ratio'],
+                password=options['password'],
+                prefix=options['prefix'],
+            )
+            employee_ids = [u.id for u in users if u.role == 'employee']
+            seed_tasks(employee_ids, options['tasks'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(users)} users and {options['tasks']} tasks in {time.perf_counter() - start:.1f}s."
+        ))
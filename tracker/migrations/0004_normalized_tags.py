@@ -0,0 +1,72 @@
+# Generated by Django 5.2 on 2026-10-17 19:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def split_tags(value):
+    tags = []
+    for tag in (value or '').split(','):
+        tag = tag.strip().lower()
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def backfill_tags(apps, schema_editor):
+    Task = apps.get_model('tracker', 'Task')
+    Tag = apps.get_model('tracker', 'Tag')
+    TaskTag = apps.get_model('tracker', 'TaskTag')
+
+    tag_ids = {}
+    links = []
+    tasks = Task.objects.exclude(tags__isnull=True).exclude(tags='').values_list('id', 'tags')
+    for task_id, raw_tags in tasks.iterator(chunk_size=2000):
+        # Task.tags is left as entered; only the links are normalized
+        for name in split_tags(raw_tags):
+            if name not in tag_ids:
+                tag_ids[name] = Tag.objects.get_or_create(name=name)[0].id
+            links.append(TaskTag(task_id=task_id, tag_id=tag_ids[name]))
+        if len(links) >= 5000:
+            TaskTag.objects.bulk_create(links)
+            links = []
+    TaskTag.objects.bulk_create(links)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0003_task_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TaskTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='task_links', to='tracker.tag')),
+                ('task', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='tracker.task')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='tag_set',
+            field=models.ManyToManyField(blank=True, related_name='tasks', through='tracker.TaskTag', to='tracker.tag'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktag',
+            index=models.Index(fields=['tag', 'task'], name='tasktag_tag_task_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='tasktag',
+            constraint=models.UniqueConstraint(fields=('task', 'tag'), name='unique_task_tag'),
+        ),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-17 19:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_daily_hours(apps, schema_editor):
+    Task = apps.get_model('tracker', 'Task')
+    DailyHours = apps.get_model('tracker', 'DailyHours')
+    totals = Task.objects.order_by().values('employee_id', 'date').annotate(total_hours=Sum('hours_spent'))
+    DailyHours.objects.bulk_create(
+        (DailyHours(employee_id=row['employee_id'], date=row['date'], total_hours=row['total_hours']) for row in totals.iterator()),
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0004_normalized_tags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyHours',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('total_hours', models.DecimalField(decimal_places=2, default=0, max_digits=6)),
+                ('employee', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='daily_hours', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('employee', 'date'), name='unique_daily_hours')],
+            },
+        ),
+        migrations.RunPython(backfill_daily_hours, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2 on 2026-10-17 19:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+
+
+def backfill_task_rollups(apps, schema_editor):
+    Task = apps.get_model('tracker', 'Task')
+    TaskRollup = apps.get_model('tracker', 'TaskRollup')
+    truncations = {'day': F('date'), 'week': TruncWeek('date'), 'month': TruncMonth('date')}
+    for period, truncation in truncations.items():
+        totals = Task.objects.order_by().values('employee_id', 'status', start=truncation).annotate(
+            task_count=Count('id'), hours=Sum('hours_spent')
+        )
+        TaskRollup.objects.bulk_create(
+            (
+                TaskRollup(employee_id=row['employee_id'], period=period, period_start=row['start'],
+                           status=row['status'], task_count=row['task_count'], hours=row['hours'])
+                for row in totals.iterator()
+            ),
+            batch_size=5000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0006_task_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month')], max_length=5)),
+                ('period_start', models.DateField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')], max_length=10)),
+                ('task_count', models.IntegerField(default=0)),
+                ('hours', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('employee', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='task_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['period', 'period_start'], name='taskrollup_period_start_idx')],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'period', 'period_start', 'status'), name='unique_task_rollup')],
+            },
+        ),
+        migrations.RunPython(backfill_task_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-17 19:40
+
+from django.db import migrations
+
+# Replaced by the stored search_document column in migration 0011
+SEARCH_DOCUMENT = (
+    "((setweight(to_tsvector('english', coalesce(title, '')), 'A')"
+    " || setweight(to_tsvector('english', coalesce(tags, '')), 'B'))"
+    " || setweight(to_tsvector('english', coalesce(description, '')), 'C'))"
+)
+
+
+def create_search_indexes(apps, schema_editor):
+    # Full-text and trigram indexes only exist on PostgreSQL; other
+    # databases search with plain substring matching
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(f'CREATE INDEX task_search_idx ON tracker_task USING gin (({SEARCH_DOCUMENT}))')
+    schema_editor.execute('CREATE INDEX task_title_trgm_idx ON tracker_task USING gin (title gin_trgm_ops)')
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS task_title_trgm_idx')
+    schema_editor.execute('DROP INDEX IF EXISTS task_search_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0008_task_change_feed'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
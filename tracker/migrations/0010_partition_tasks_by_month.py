@@ -0,0 +1,122 @@
+# Generated by Django 5.2 on 2026-10-17 19:52
+
+import copy
+import django.db.models.deletion
+from datetime import date
+from django.db import migrations, models
+
+# Partitions created ahead of the current month
+MONTHS_AHEAD = 3
+
+
+def add_months(month, count):
+    years, month_index = divmod(month.month - 1 + count, 12)
+    return date(month.year + years, month_index + 1, 1)
+
+
+def rebuild_task_table(schema_editor, partitioned):
+    """
+    Copy tracker_task into a new table, partitioned by month on date or
+    plain again, keeping its columns, foreign keys and indexes. The copy
+    runs in the migration's transaction and blocks task reads and writes
+    until it commits; schedule it for a quiet window on large tables.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_get_indexdef(indexrelid) FROM pg_index "
+            "WHERE indrelid = 'tracker_task'::regclass AND NOT indisprimary"
+        )
+        index_definitions = [row[0].replace(' ON ONLY ', ' ON ') for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = 'tracker_task'::regclass AND contype = 'f'"
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute('SELECT min(date), max(id) FROM tracker_task')
+        first_date, last_id = cursor.fetchone()
+
+    schema_editor.execute('ALTER TABLE tracker_task RENAME TO tracker_task_old')
+    if partitioned:
+        schema_editor.execute(
+            'CREATE TABLE tracker_task (LIKE tracker_task_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+            'PARTITION BY RANGE (date)'
+        )
+        current = date.today().replace(day=1)
+        month = min(first_date.replace(day=1), current) if first_date else current
+        while month <= add_months(current, MONTHS_AHEAD):
+            end = add_months(month, 1)
+            schema_editor.execute(
+                f"CREATE TABLE tracker_task_p{month:%Y_%m} PARTITION OF tracker_task "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            month = end
+        schema_editor.execute('CREATE TABLE tracker_task_default PARTITION OF tracker_task DEFAULT')
+    else:
+        schema_editor.execute(
+            'CREATE TABLE tracker_task (LIKE tracker_task_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        )
+
+    schema_editor.execute('INSERT INTO tracker_task SELECT * FROM tracker_task_old')
+    # Frees the old table's index, constraint and sequence names
+    schema_editor.execute('DROP TABLE tracker_task_old')
+
+    # The partition key has to be part of the primary key
+    primary_key = 'id, date' if partitioned else 'id'
+    schema_editor.execute(f'ALTER TABLE tracker_task ADD CONSTRAINT tracker_task_pkey PRIMARY KEY ({primary_key})')
+    # Identity columns cannot be relied on for partitioned tables on every
+    # supported PostgreSQL version, so ids come from an owned sequence
+    schema_editor.execute('CREATE SEQUENCE tracker_task_id_seq OWNED BY tracker_task.id')
+    if last_id:
+        schema_editor.execute("SELECT setval('tracker_task_id_seq', %s)", [last_id])
+    schema_editor.execute("ALTER TABLE tracker_task ALTER COLUMN id SET DEFAULT nextval('tracker_task_id_seq')")
+    for name, definition in foreign_keys:
+        schema_editor.execute(f'ALTER TABLE tracker_task ADD CONSTRAINT "{name}" {definition}')
+    for definition in index_definitions:
+        schema_editor.execute(definition)
+
+
+def task_link_fields(apps):
+    """Return TaskTag.task with and without its foreign key constraint."""
+    TaskTag = apps.get_model('tracker', 'TaskTag')
+    unconstrained = TaskTag._meta.get_field('task')
+    constrained = copy.copy(unconstrained)
+    constrained.db_constraint = True
+    return TaskTag, constrained, unconstrained
+
+
+def partition_tasks(apps, schema_editor):
+    # Declarative partitioning is PostgreSQL only; elsewhere the table and
+    # the tag links' foreign key stay as they are
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # No unique key on id alone is left for the foreign key to reference
+    TaskTag, constrained, unconstrained = task_link_fields(apps)
+    schema_editor.alter_field(TaskTag, constrained, unconstrained)
+    rebuild_task_table(schema_editor, partitioned=True)
+
+
+def unpartition_tasks(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    rebuild_task_table(schema_editor, partitioned=False)
+    TaskTag, constrained, unconstrained = task_link_fields(apps)
+    schema_editor.alter_field(TaskTag, unconstrained, constrained)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0009_task_search_indexes'),
+    ]
+
+    operations = [
+        # The constraint is only dropped on PostgreSQL, by partition_tasks
+        migrations.SeparateDatabaseAndState(state_operations=[
+            migrations.AlterField(
+                model_name='tasktag',
+                name='task',
+                field=models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='tracker.task'),
+            ),
+        ]),
+        migrations.RunPython(partition_tasks, unpartition_tasks),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2 on 2026-10-17 20:31
+
+from django.db import migrations
+
+# The weighted tsvector stored in tracker_task.search_document
+SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A')"
+    " || setweight(to_tsvector('english', coalesce(tags, '')), 'B')"
+    " || setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+# The expression index migration 0009 created
+EXPRESSION_INDEX = f'gin (({SEARCH_DOCUMENT}))'
+
+
+def task_partitions(schema_editor):
+    """The task table's partitions, or None if it is not partitioned."""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'tracker_task'::regclass")
+        if cursor.fetchone() is None:
+            return None
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = 'tracker_task'::regclass"
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def create_index_concurrently(schema_editor, name, method):
+    """
+    Build an index on tracker_task without blocking writes. A partitioned
+    table cannot be indexed concurrently, so each partition's index is
+    built concurrently and attached to an index created on the parent only.
+    """
+    partitions = task_partitions(schema_editor)
+    if partitions is None:
+        schema_editor.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON tracker_task USING {method}')
+        return
+    schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON ONLY tracker_task USING {method}')
+    for partition in partitions:
+        partition_index = f'{partition}_{name}'
+        schema_editor.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} ON {partition} USING {method}')
+        schema_editor.execute(f'ALTER INDEX {name} ATTACH PARTITION {partition_index}')
+
+
+def add_search_document(apps, schema_editor):
+    # Full-text search only exists on PostgreSQL; other databases search
+    # with plain substring matching and have no column to store
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # Filling the column rewrites the table while holding an exclusive lock
+    schema_editor.execute(
+        'ALTER TABLE tracker_task ADD COLUMN IF NOT EXISTS search_document tsvector '
+        f'GENERATED ALWAYS AS ({SEARCH_DOCUMENT}) STORED'
+    )
+    create_index_concurrently(schema_editor, 'task_search_document_idx', 'gin (search_document)')
+    # Only dropped once its replacement is in place
+    schema_editor.execute('DROP INDEX IF EXISTS task_search_idx')
+
+
+def remove_search_document(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    create_index_concurrently(schema_editor, 'task_search_idx', EXPRESSION_INDEX)
+    schema_editor.execute('DROP INDEX IF EXISTS task_search_document_idx')
+    schema_editor.execute('ALTER TABLE tracker_task DROP COLUMN IF EXISTS search_document')
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('tracker', '0010_partition_tasks_by_month'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_document, remove_search_document),
+    ]
@@ -1,8 +1,142 @@
-from django.db import models
+from django.db import connections, models, router, transaction
 from django.core.exceptions import ValidationError
-from django.db.models import Sum
+from django.db.models import Case, Count, Exists, F, OuterRef, Sum, Value, When
+from django.db.models.functions import Now
+from django.db.models.functions import TruncMonth, TruncWeek
+from datetime import timedelta
+from decimal import Decimal
+from .search import filter_tasks
+from .signals import tasks_changed
+
+DAILY_HOURS_LIMIT = Decimal('8')
+
+
+def split_tags(value):
+    """
+    Split a comma-separated tags string into individual, normalized (stripped
+    and lowercased) tags, dropping empty entries and duplicates while keeping
+    their order.
+    """
+    if not value:
+        return []
+    tags = []
+    for tag in value.split(','):
+        tag = tag.strip().lower()
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+class TaskQuerySet(models.QuerySet):
+    def with_tags(self, names, match_all=False):
+        """
+        Filter tasks by exact tag names using the indexed TaskTag table.
+        By default a task matches if it has any of the tags; with match_all
+        it must have every one of them.
+        """
+        names = split_tags(','.join(names))
+        if not names:
+            return self
+        if match_all:
+            queryset = self
+            for name in names:
+                queryset = queryset.filter(
+                    Exists(TaskTag.objects.filter(task=OuterRef('pk'), tag__name=name))
+                )
+            return queryset
+        return self.filter(
+            Exists(TaskTag.objects.filter(task=OuterRef('pk'), tag__name__in=names))
+        )
+
+    def search(self, text):
+        """
+        Filter tasks by keywords in their title, tags or description; see
+        tracker.search.
+        """
+        return filter_tasks(self, text)
+
+    def create_many(self, tasks, check_limit=True):
+        """
+        Insert unsaved tasks with a single bulk_create, updating the
+        daily-hours ledger and tag links in the same transaction.
+        Raises ValidationError if check_limit is set and any day would go
+        over the limit.
+        """
+        deltas = {}
+        rollup_changes = []
+        for task in tasks:
+            employee_id, day, hours = task.ledger_values()
+            deltas[(employee_id, day)] = deltas.get((employee_id, day), 0) + hours
+            rollup_changes.append((employee_id, day, task.status, 1, hours))
+        with transaction.atomic():
+            DailyHours.apply(deltas, check=check_limit)
+            TaskRollup.apply(rollup_changes)
+            tasks = self.bulk_create(tasks)
+            sync_task_tags(tasks, created=True)
+            change_seqs = TaskChangeCounter.stamp(self.model, [task.pk for task in tasks])
+            for task in tasks:
+                task.change_seq = change_seqs[task.pk]
+            notify_tasks_changed('created', [(task.pk, employee_id) for task, (employee_id, _, _, _, _) in zip(tasks, rollup_changes)])
+        return tasks
+
+    def apply_actions(self, actions):
+        """
+        Approve or reject tasks in bulk with set-based UPDATEs.
+
+        `actions` maps task ids to (action, comment) pairs. Only tasks that are
+        still pending are changed; the status='pending' condition is part of
+        each UPDATE, so a task decided concurrently is never overwritten.
+        Returns (updated_ids, skipped) where skipped maps ids to a reason.
+        """
+        with transaction.atomic():
+            found = {
+                pk: (task_status, employee_id, day, hours)
+                for pk, task_status, employee_id, day, hours in self.select_for_update().filter(
+                    pk__in=actions
+                ).order_by('pk').values_list('pk', 'status', 'employee_id', 'date', 'hours_spent')
+            }
+            skipped = {}
+            for pk in actions:
+                if pk not in found:
+                    skipped[pk] = 'not_found'
+                elif found[pk][0] != 'pending':
+                    skipped[pk] = 'already_decided'
+
+            approve = [pk for pk, (action, _) in actions.items() if action == 'approve' and pk not in skipped]
+            reject = {pk: comment for pk, (action, comment) in actions.items() if action == 'reject' and pk not in skipped}
+
+            # Move the decided tasks from the pending to the new status in the rollups
+            rollup_changes = []
+            for new_status, pks in (('approved', approve), ('rejected', reject)):
+                for pk in pks:
+                    _, employee_id, day, hours = found[pk]
+                    rollup_changes.append((employee_id, day, 'pending', -1, -hours))
+                    rollup_changes.append((employee_id, day, new_status, 1, hours))
+            TaskRollup.apply(rollup_changes)
+
+            if approve:
+                self.filter(pk__in=approve, status='pending').update(status='approved', updated_at=Now())
+                notify_tasks_changed('approved', [(pk, found[pk][1]) for pk in approve])
+            if reject:
+                self.filter(pk__in=reject, status='pending').update(
+                    status='rejected',
+                    updated_at=Now(),
+                    manager_comment=Case(
+                        *[When(pk=pk, then=Value(comment)) for pk, comment in reject.items()],
+                        output_field=models.TextField(),
+                    ),
+                )
+                notify_tasks_changed('rejected', [(pk, found[pk][1]) for pk in reject])
+            # Allocated last, so the counter row stays locked for as short as possible
+            TaskChangeCounter.stamp(self.model, approve + list(reject))
+        return approve + list(reject), skipped
+
 
 class Task(models.Model):
+    """
+    On PostgreSQL the table is range-partitioned by month on `date`, with a
+    (id, date) primary key; see tracker.partitions.
+    """
     # Task status options
     STATUS_CHOICES = (
         ('pending', 'Pending'),
@@ -17,10 +151,33 @@ class Task(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
     hours_spent = models.DecimalField(max_digits=4, decimal_places=2)  # Max 9999.99 hours
-    tags = models.CharField(max_length=255, blank=True, null=True)  # Optional tags
+    tags = models.CharField(max_length=255, blank=True, null=True)  # Optional tags, comma-separated
+    # Normalized copy of `tags` used for indexed filtering, kept in sync on save
+    tag_set = models.ManyToManyField('Tag', through='TaskTag', related_name='tasks', blank=True)
     date = models.DateField()  # Date when the task was performed
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
     manager_comment = models.TextField(blank=True, null=True)
+    # Version token for conditional GETs; bulk UPDATEs must set it explicitly
+    updated_at = models.DateTimeField(auto_now=True)
+    # Position in the change feed used by delta sync; every write takes a new value
+    change_seq = models.BigIntegerField(default=0)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Daily-limit checks and employee task lists filter on (employee, date)
+            models.Index(fields=['employee', 'date'], name='task_employee_date_idx'),
+            # Manager views filter on status and order by date
+            models.Index(fields=['status', 'date'], name='task_status_date_idx'),
+            # Keyset pagination of the task list is ordered by (date, id)
+            models.Index(fields=['date', 'id'], name='task_date_id_idx'),
+            # The approval queue only ever looks at pending tasks
+            models.Index(fields=['date'], condition=models.Q(status='pending'), name='task_pending_date_idx'),
+            # Delta sync reads changes after a cursor, for everyone or one employee
+            models.Index(fields=['change_seq'], name='task_change_seq_idx'),
+            models.Index(fields=['employee', 'change_seq'], name='task_employee_change_seq_idx'),
+        ]
 
     def __str__(self):
         return f"Task: {self.title} - {self.status} - {self.hours_spent} hours"
@@ -30,29 +187,508 @@ class Task(models.Model):
         Ensure that total logged hours for the employee on the same date
         do not exceed the 8-hour daily limit.
         """
-        # Fetch the total hours already logged by the employee on the given date
-        total_hours_today = Task.objects.filter(
-            employee=self.employee, date=self.date
-        ).aggregate(total_hours=Sum('hours_spent'))['total_hours'] or 0
+        # Read the employee's running total for the date from the ledger
+        total_hours_today = DailyHours.total_for(self.employee_id, self.date)
 
         # If this task is being updated, exclude its previous hours from the total
-        if self.pk:
-            total_hours_today -= self.hours_spent
+        current = self.ledger_values()
+        stored = self.stored_hours()
+        if stored and stored[:2] == current[:2]:
+            total_hours_today -= stored[2]
 
         # Ensure that adding this task's hours doesn't exceed the 8-hour daily limit
-        if total_hours_today + self.hours_spent > 8:
+        if total_hours_today + current[2] > DAILY_HOURS_LIMIT:
             raise ValidationError("Total hours for the day cannot exceed 8 hours.")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored tags so save() only re-links tags when they change
+        instance._loaded_tags = instance.__dict__.get('tags')
+        # Remember what this task contributes to the daily-hours ledger
+        instance._loaded_hours = (
+            instance.__dict__.get('employee_id'),
+            instance.__dict__.get('date'),
+            instance.__dict__.get('hours_spent'),
+        )
+        return instance
+
+    def ledger_values(self):
+        """
+        Return the (employee_id, date, hours_spent) this task counts under in
+        the ledger and rollups, converted to the types the database returns,
+        so they key the same rows whether the attributes were assigned as
+        model values or as strings.
+        """
+        return (
+            self._meta.get_field('employee').to_python(self.employee_id),
+            self._meta.get_field('date').to_python(self.date),
+            self._meta.get_field('hours_spent').to_python(self.hours_spent),
+        )
+
+    def stored_hours(self):
+        """
+        Return the (employee_id, date, hours_spent) this task is currently
+        counted under in the ledger, or None if it has not been saved yet.
+        """
+        if self._state.adding:
+            return None
+        loaded = getattr(self, '_loaded_hours', None)
+        if loaded is None or None in loaded:
+            loaded = Task.objects.filter(pk=self.pk).values_list('employee_id', 'date', 'hours_spent').first()
+        return loaded
+
+    def lock_stored(self):
+        """
+        Lock this task's row and return its stored (employee_id, date,
+        hours_spent, status), or None if it has not been saved yet.
+
+        Writers lock the task row before the ledger, rollup and change
+        counter rows, the same order apply_actions uses, so they cannot
+        deadlock each other.
+        """
+        if self._state.adding:
+            return None
+        return Task.objects.select_for_update().filter(pk=self.pk).values_list(
+            'employee_id', 'date', 'hours_spent', 'status'
+        ).first()
+
     def save(self, *args, **kwargs):
-        """Override save method to call clean method for validation."""
-        self.clean()  # Validate before saving the task
-        super().save(*args, **kwargs)
+        """
+        Save the task, keeping the daily-hours ledger, rollups and tag links
+        in sync. The 8-hour limit is checked against the locked ledger row,
+        and only when the hours, date or employee actually change.
+        """
+        created = self._state.adding
+        tags_changed = created or self.tags != getattr(self, '_loaded_tags', None)
+        current = self.ledger_values()
+
+        with transaction.atomic():
+            locked = self.lock_stored()
+            stored, stored_status = (locked[:3], locked[3]) if locked else (None, None)
+            if stored != current:
+                deltas = {current[:2]: current[2]}
+                if stored:
+                    deltas[stored[:2]] = deltas.get(stored[:2], 0) - stored[2]
+                DailyHours.apply(deltas)
+            if (stored, stored_status) != (current, self.status):
+                rollup_changes = [(*current[:2], self.status, 1, current[2])]
+                if stored:
+                    rollup_changes.append((*stored[:2], stored_status, -1, -stored[2]))
+                TaskRollup.apply(rollup_changes)
+            super().save(*args, **kwargs)
+            if tags_changed:
+                sync_task_tags([self], created=created)
+            self.change_seq = TaskChangeCounter.stamp(Task, [self.pk])[self.pk]
+            if created:
+                action = 'created'
+            elif self.status != (stored_status or self.status) and self.status != 'pending':
+                action = self.status
+            else:
+                action = 'updated'
+            notify_tasks_changed(action, [(self.pk, current[0])])
+
+        self._loaded_tags = self.tags
+        self._loaded_hours = current
+
+    def delete(self, *args, **kwargs):
+        pk = self.pk
+        with transaction.atomic():
+            locked = self.lock_stored()
+            if locked:
+                employee_id, date, hours, stored_status = locked
+                DailyHours.apply({(employee_id, date): -hours}, check=False)
+                TaskRollup.apply([(employee_id, date, stored_status, -1, -hours)])
+            notify_tasks_changed('deleted', [(pk, self.employee_id)])
+            deleted = super().delete(*args, **kwargs)
+            if locked:
+                # Leave a tombstone so delta sync clients learn about the delete
+                TaskTombstone.objects.create(task_id=pk, employee_id=employee_id, change_seq=TaskChangeCounter.allocate()[0])
+        return deleted
 
     @classmethod
     def total_hours_for_employee_on_date(cls, employee, date):
         """
         Class method to calculate the total hours worked by an employee on a specific date.
         """
-        return cls.objects.filter(employee=employee, date=date).aggregate(
-            total_hours=Sum('hours_spent')
-        )['total_hours'] or 0
+        return DailyHours.total_for(getattr(employee, 'pk', employee), date)
+
+
+def add_to_counters(model, unique_fields, counter_fields, deltas, returning=(), rows_per_query=1000):
+    """
+    Add the {key: (delta per counter field)} deltas to the model's rows, keyed
+    by the values of `unique_fields`, creating the rows that do not exist.
+
+    Each batch is one INSERT ... ON CONFLICT (key) DO UPDATE SET counter =
+    counter + EXCLUDED.counter, instead of a read, an insert, a locking read
+    and an update. The statement locks the rows it touches until the
+    transaction ends, and rows are written in key order so concurrent
+    writers cannot deadlock.
+
+    Returns {key: (value per returned field)} with the updated values of
+    the `returning` fields.
+    """
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    opts = model._meta
+    key_fields = [opts.get_field(name) for name in unique_fields]
+    counters = [opts.get_field(name) for name in counter_fields]
+    fields = key_fields + counters
+    table = quote(opts.db_table)
+    insert = 'INSERT INTO {} ({}) VALUES '.format(table, ', '.join(quote(field.column) for field in fields))
+    upsert = ' ON CONFLICT ({}) DO UPDATE SET {}'.format(
+        ', '.join(quote(field.column) for field in key_fields),
+        ', '.join(
+            f'{quote(field.column)} = {table}.{quote(field.column)} + EXCLUDED.{quote(field.column)}'
+            for field in counters
+        ),
+    )
+    returned = key_fields + [opts.get_field(name) for name in returning]
+    use_returning = returning and connection.features.can_return_columns_from_insert
+    if use_returning:
+        upsert += ' RETURNING ' + ', '.join(quote(field.column) for field in returned)
+
+    results = {}
+    keys = sorted(deltas)
+    batch_size = min(rows_per_query, connection.ops.bulk_batch_size(fields, keys) or rows_per_query)
+    placeholders = f"({', '.join(['%s'] * len(fields))})"
+    for start in range(0, len(keys), batch_size):
+        batch = keys[start:start + batch_size]
+        params = [
+            field.get_db_prep_save(value, connection)
+            for key in batch
+            for field, value in zip(fields, (*key, *deltas[key]))
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(insert + ', '.join([placeholders] * len(batch)) + upsert, params)
+            rows = cursor.fetchall() if use_returning else []
+        if returning and not use_returning:
+            condition = models.Q()
+            for key in batch:
+                condition |= models.Q(**dict(zip(unique_fields, key)))
+            rows = model.objects.using(connection.alias).filter(condition).values_list(*unique_fields, *returning)
+        for row in rows:
+            # Raw rows hold the database's types, e.g. floats for SQLite decimals
+            values = [field.to_python(value) for field, value in zip(returned, row)]
+            results[tuple(values[:len(key_fields)])] = tuple(values[len(key_fields):])
+    return results
+
+
+def rebuild_start(connection):
+    """
+    Return the first day the ledger and rollup rebuilds may recompute: the
+    start of the oldest attached task partition, since detached months no
+    longer have their tasks to count. None when the task table is not
+    partitioned, and everything can be recomputed.
+    """
+    # partitions imports this module
+    from .partitions import first_attached_month
+    return first_attached_month(connection)
+
+
+class DailyHours(models.Model):
+    """
+    Running total of hours logged per (employee, date), maintained alongside
+    Task writes so the daily limit check reads and locks a single row.
+    """
+    # The (employee, date) unique constraint already indexes lookups by employee
+    employee = models.ForeignKey('accounts.CustomUser', on_delete=models.CASCADE, related_name='daily_hours', db_index=False)
+    date = models.DateField()
+    total_hours = models.DecimalField(max_digits=6, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'date'], name='unique_daily_hours'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.date}: {self.total_hours} hours"
+
+    @classmethod
+    def total_for(cls, employee_id, date):
+        total = cls.objects.filter(employee_id=employee_id, date=date).values_list('total_hours', flat=True).first()
+        return total or Decimal('0')
+
+    @classmethod
+    def apply(cls, deltas, check=True):
+        """
+        Add the {(employee_id, date): hours} deltas to the ledger in one
+        upsert, which creates the rows if needed and locks them, so
+        concurrent writers for the same employee and date queue up instead
+        of both passing the check. With check=True a ValidationError is
+        raised if any increase took a day over the limit. Must be called
+        inside an atomic block, which the error rolls back.
+        """
+        deltas = {key: Decimal(str(hours)) for key, hours in deltas.items() if hours}
+        if not deltas:
+            return
+
+        totals = add_to_counters(
+            cls, ['employee', 'date'], ['total_hours'], {key: (hours,) for key, hours in deltas.items()},
+            returning=['total_hours'] if check else (),
+        )
+        if not check:
+            return
+        for key, hours in deltas.items():
+            if hours > 0 and totals[key][0] > DAILY_HOURS_LIMIT:
+                raise ValidationError(
+                    "Total hours for the day cannot exceed 8 hours.",
+                    code='daily_limit',
+                    params={'employee': key[0], 'date': key[1]},
+                )
+
+    @classmethod
+    def rebuild(cls, since=None):
+        """
+        Recompute the ledger from the task table for the days from `since`
+        on, by default the first one whose tasks are all still attached (see
+        rebuild_start); earlier rows are left as they are.
+        """
+        using = router.db_for_write(cls)
+        if since is None:
+            since = rebuild_start(connections[using])
+        rows, tasks = cls.objects.using(using), Task.objects.using(using)
+        if since is not None:
+            rows, tasks = rows.filter(date__gte=since), tasks.filter(date__gte=since)
+        with transaction.atomic(using=using):
+            rows.delete()
+            totals = tasks.order_by().values('employee_id', 'date').annotate(total_hours=Sum('hours_spent'))
+            cls.objects.using(using).bulk_create(
+                (cls(employee_id=row['employee_id'], date=row['date'], total_hours=row['total_hours']) for row in totals.iterator()),
+                batch_size=5000,
+            )
+
+
+class TaskChangeCounter(models.Model):
+    """
+    Single-row counter handing out Task.change_seq values.
+
+    Allocating increments the row, which keeps it locked until the
+    transaction commits. Writers therefore commit in sequence order, and a
+    sync client that has seen a sequence number can never later miss a
+    smaller one. Every writer queues on that one row, so they allocate as
+    the last step of their transaction, after their other writes.
+    """
+    value = models.BigIntegerField(default=0)
+
+    @classmethod
+    def allocate(cls, count=1):
+        """Reserve `count` consecutive sequence numbers and return them as a range."""
+        if count <= 0:
+            return range(0)
+        if not cls.objects.filter(pk=1).update(value=F('value') + count):
+            # The counter row is created by migration; recreate it if it was flushed
+            cls.objects.bulk_create([cls(pk=1)], ignore_conflicts=True)
+            cls.objects.filter(pk=1).update(value=F('value') + count)
+        last = cls.objects.filter(pk=1).values_list('value', flat=True).get()
+        return range(last - count + 1, last + 1)
+
+    @classmethod
+    def stamp(cls, model, pks):
+        """
+        Allocate sequence numbers to the already written rows of `model`
+        with the given pks, in pk order, and store them in their change_seq
+        column. Returns a {pk: change_seq} mapping.
+        """
+        pks = sorted(pks)
+        change_seqs = dict(zip(pks, cls.allocate(len(pks))))
+        # Runs of consecutive pks, such as a bulk insert's, are stamped with one UPDATE each
+        start = 0
+        for end in range(1, len(pks) + 1):
+            if end == len(pks) or pks[end] != pks[end - 1] + 1:
+                first, last = pks[start], pks[end - 1]
+                model.objects.filter(pk__range=(first, last)).update(change_seq=F('pk') + (change_seqs[first] - first))
+                start = end
+        return change_seqs
+
+
+class TaskTombstone(models.Model):
+    """Record of a deleted task, kept so delta sync can report the delete."""
+    task_id = models.BigIntegerField()
+    # Covered by the (employee, change_seq) index below
+    employee = models.ForeignKey('accounts.CustomUser', on_delete=models.CASCADE, related_name='task_tombstones', db_index=False)
+    change_seq = models.BigIntegerField(unique=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['employee', 'change_seq'], name='tombstone_employee_seq_idx'),
+        ]
+
+    def __str__(self):
+        return f"Deleted task {self.task_id} at {self.change_seq}"
+
+
+def period_start(period, day):
+    """Return the first day of the day, week (Monday) or month containing `day`."""
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_period_start(period, day):
+    """Return the first day of the period after the one starting on `day`."""
+    if period == 'week':
+        return day + timedelta(days=7)
+    if period == 'month':
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=1)
+
+
+class TaskRollup(models.Model):
+    """
+    Task count and hours per (employee, period, period_start, status), kept
+    up to date by every Task write path so time-series stats read one row
+    per bucket instead of scanning tasks.
+    """
+    PERIOD_CHOICES = (
+        ('day', 'Day'),
+        ('week', 'Week'),
+        ('month', 'Month'),
+    )
+
+    # The unique constraint below already indexes lookups by employee
+    employee = models.ForeignKey('accounts.CustomUser', on_delete=models.CASCADE, related_name='task_rollups', db_index=False)
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES)
+    period_start = models.DateField()
+    status = models.CharField(max_length=10, choices=Task.STATUS_CHOICES)
+    task_count = models.IntegerField(default=0)
+    hours = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'period', 'period_start', 'status'], name='unique_task_rollup'),
+        ]
+        indexes = [
+            # Series across all employees filter on the period and a date range
+            models.Index(fields=['period', 'period_start'], name='taskrollup_period_start_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.period} {self.period_start} {self.status}: {self.task_count} tasks, {self.hours} hours"
+
+    @classmethod
+    def apply(cls, changes):
+        """
+        Add (employee_id, date, status, count, hours) changes to the day,
+        week and month rollups containing each date.
+
+        Rows are created if needed and incremented in one upsert like the
+        daily-hours ledger, so concurrent writers never lose an increment.
+        Must be called inside a transaction.
+        """
+        deltas = {}
+        for employee_id, day, task_status, count, hours in changes:
+            for period, _ in cls.PERIOD_CHOICES:
+                key = (employee_id, period, period_start(period, day), task_status)
+                task_count, total = deltas.get(key, (0, Decimal('0')))
+                deltas[key] = (task_count + count, total + Decimal(str(hours)))
+        deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+        if deltas:
+            add_to_counters(cls, ['employee', 'period', 'period_start', 'status'], ['task_count', 'hours'], deltas)
+
+    @classmethod
+    def rebuild(cls, since=None):
+        """
+        Recompute the rollups from the task table for the periods starting
+        on or after `since`, by default the first day whose tasks are all
+        still attached (see rebuild_start). A week or month that began
+        earlier is left as it is, since part of it may no longer be there to
+        count.
+        """
+        truncations = {'day': models.F('date'), 'week': TruncWeek('date'), 'month': TruncMonth('date')}
+        using = router.db_for_write(cls)
+        if since is None:
+            since = rebuild_start(connections[using])
+        with transaction.atomic(using=using):
+            for period, truncation in truncations.items():
+                rows, tasks = cls.objects.using(using).filter(period=period), Task.objects.using(using)
+                if since is not None:
+                    start = period_start(period, since)
+                    if start < since:
+                        start = next_period_start(period, start)
+                    rows, tasks = rows.filter(period_start__gte=start), tasks.filter(date__gte=start)
+                rows.delete()
+                totals = tasks.order_by().values(
+                    'employee_id', 'status', start=truncation
+                ).annotate(task_count=Count('id'), hours=Sum('hours_spent'))
+                cls.objects.using(using).bulk_create(
+                    (
+                        cls(employee_id=row['employee_id'], period=period, period_start=row['start'],
+                            status=row['status'], task_count=row['task_count'], hours=row['hours'])
+                        for row in totals.iterator()
+                    ),
+                    batch_size=5000,
+                )
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def ids_for(cls, names):
+        """
+        Return a {name: id} mapping for the given tag names, creating any
+        tags that do not exist yet.
+        """
+        names = set(names)
+        if not names:
+            return {}
+        ids = dict(cls.objects.filter(name__in=names).values_list('name', 'id'))
+        missing = names - ids.keys()
+        if missing:
+            cls.objects.bulk_create([cls(name=name) for name in missing], ignore_conflicts=True)
+            ids.update(cls.objects.filter(name__in=missing).values_list('name', 'id'))
+        return ids
+
+
+class TaskTag(models.Model):
+    # Lookups by task and by tag are covered by the composite indexes below
+    # No database constraint on PostgreSQL, where the partitioned task table has no
+    # unique key on id alone; migration 0010 keeps it on other databases
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='tag_links', db_index=False, db_constraint=False)
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='task_links', db_index=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'tag'], name='unique_task_tag'),
+        ]
+        indexes = [
+            # Tag filters look up tasks by tag
+            models.Index(fields=['tag', 'task'], name='tasktag_tag_task_idx'),
+        ]
+
+
+def notify_tasks_changed(action, changes):
+    """
+    Send tasks_changed for the (task_id, employee_id) pairs once the current
+    transaction commits, so receivers never see uncommitted writes.
+    """
+    changes = list(changes)
+    task_ids = [task_id for task_id, _ in changes]
+    employee_ids = {employee_id for _, employee_id in changes}
+    transaction.on_commit(lambda: tasks_changed.send(
+        sender=Task, action=action, task_ids=task_ids, employee_ids=employee_ids, changes=changes
+    ))
+
+
+def sync_task_tags(tasks, created=False):
+    """
+    Replace the TaskTag rows of the given saved tasks with the tags in their
+    comma-separated `tags` field. Pass created=True for freshly inserted
+    tasks to skip deleting links that cannot exist yet.
+    """
+    wanted = {task.pk: split_tags(task.tags) for task in tasks}
+    tag_ids = Tag.ids_for(name for names in wanted.values() for name in names)
+    if not created:
+        TaskTag.objects.filter(task_id__in=wanted).delete()
+    TaskTag.objects.bulk_create([
+        TaskTag(task_id=task_id, tag_id=tag_ids[name])
+        for task_id, names in wanted.items()
+        for name in names
+    ])
@@ -0,0 +1,90 @@
+import base64
+import binascii
+from datetime import date
+
+from django.conf import settings
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(task_date, task_id):
+    """
+    Encode the (date, id) position of the last task on a page into an opaque cursor.
+    """
+    raw = f"{task_date.isoformat()}|{task_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor back into a (date, id) tuple.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        date_part, id_part = raw.split('|', 1)
+        return date.fromisoformat(date_part), int(id_part)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor("Invalid cursor.")
+
+
+def get_page_size(raw_value):
+    """
+    Parse the requested page size, falling back to the default and never
+    exceeding TASK_LIST_MAX_PAGE_SIZE.
+    """
+    try:
+        page_size = int(raw_value)
+    except (TypeError, ValueError):
+        return settings.TASK_LIST_PAGE_SIZE
+    return max(1, min(page_size, settings.TASK_LIST_MAX_PAGE_SIZE))
+
+
+def page_queryset(queryset, cursor=None, page_size=None):
+    """
+    Order the queryset by (date, id), skip to the cursor and slice one row
+    past the page so the caller can tell whether another page exists.
+    """
+    page_size = page_size or settings.TASK_LIST_PAGE_SIZE
+    queryset = queryset.order_by('date', 'id')
+
+    if cursor:
+        last_date, last_id = decode_cursor(cursor)
+        queryset = queryset.filter(Q(date__gt=last_date) | Q(date=last_date, id__gt=last_id))
+
+    # Fetch one extra row to know whether another page exists
+    return queryset[:page_size + 1]
+
+
+def page_result(tasks, page_size=None, position=None):
+    """Trim the rows fetched by page_queryset to a page and compute the next cursor."""
+    page_size = page_size or settings.TASK_LIST_PAGE_SIZE
+    if len(tasks) <= page_size:
+        return tasks, None
+
+    tasks = tasks[:page_size]
+    position = position or (lambda task: (task.date, task.id))
+    return tasks, encode_cursor(*position(tasks[-1]))
+
+
+def paginate_tasks(queryset, cursor=None, page_size=None, position=None):
+    """
+    Keyset pagination over tasks ordered by (date, id).
+
+    Returns the tasks on the requested page and the cursor for the next page
+    (None on the last page). Each page is a single indexed range query, so the
+    cost does not grow with how deep into the result set the client is.
+    For querysets that do not yield model instances (e.g. values_list),
+    `position` returns the (date, id) of an item.
+    """
+    tasks = list(page_queryset(queryset, cursor, page_size))
+    return page_result(tasks, page_size, position)
+
+
+async def apaginate_tasks(queryset, cursor=None, page_size=None, position=None):
+    """Async version of paginate_tasks using the async ORM."""
+    tasks = [task async for task in page_queryset(queryset, cursor, page_size)]
+    return page_result(tasks, page_size, position)
@@ -0,0 +1,144 @@
+"""
+Monthly range partitions of the task table on PostgreSQL.
+
+Migration 0010 turns tracker_task into a table partitioned by RANGE (date),
+with one partition per month named tracker_task_pYYYY_MM and a default
+partition catching dates outside them. Queries filtering on date only
+touch the matching partitions, and each partition's indexes and vacuum
+work stay the size of one month.
+
+PostgreSQL requires the partition key in every unique constraint, so the
+primary key is (id, date) and nothing can hold a database-level foreign
+key to a task: TaskTag.task has db_constraint=False and the ORM cascades
+deletes instead. Other databases keep the constraint.
+
+manage_task_partitions creates partitions ahead of time and detaches old
+ones. Rollups and the daily-hours ledger keep counting detached tasks, so
+the stats series still covers archived months; their rebuilds start at
+first_attached_month() and leave the archived months' rows alone.
+"""
+import re
+from collections import namedtuple
+from datetime import date
+
+from django.db import transaction
+
+from .models import Task, TaskTag
+
+Partition = namedtuple('Partition', ['name', 'start', 'end'])
+
+BOUNDS = re.compile(r"FROM \('(\d{4}-\d{2}-\d{2})'\) TO \('(\d{4}-\d{2}-\d{2})'\)")
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(month, count):
+    years, month_index = divmod(month.month - 1 + count, 12)
+    return date(month.year + years, month_index + 1, 1)
+
+
+def partition_name(month):
+    return f'{Task._meta.db_table}_p{month:%Y_%m}'
+
+
+def is_partitioned(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)', [Task._meta.db_table]
+        )
+        return cursor.fetchone() is not None
+
+
+def first_attached_month(connection):
+    """
+    Return the first day of the oldest monthly partition still attached, or
+    None when the task table is not partitioned.
+    """
+    if connection.vendor != 'postgresql' or not is_partitioned(connection):
+        return None
+    partitions, _ = list_partitions(connection)
+    return partitions[0].start if partitions else None
+
+
+def list_partitions(connection):
+    """
+    Return the monthly partitions ordered by start date, and the name of the
+    default partition (or None).
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(%s)
+            """,
+            [Task._meta.db_table],
+        )
+        rows = cursor.fetchall()
+
+    partitions = []
+    default = None
+    for name, bound in rows:
+        if bound == 'DEFAULT':
+            default = name
+            continue
+        match = BOUNDS.search(bound)
+        if match:
+            partitions.append(Partition(name, date.fromisoformat(match[1]), date.fromisoformat(match[2])))
+    return sorted(partitions, key=lambda partition: partition.start), default
+
+
+def create_partition(connection, month, default=None):
+    """
+    Create and attach the partition for `month`. Tasks for that month that
+    landed in the `default` partition are moved into it first, since
+    PostgreSQL refuses to attach a range the default partition still holds
+    rows for.
+
+    The table is created on its own and then attached, which only takes a
+    SHARE UPDATE EXCLUSIVE lock on the task table instead of blocking reads
+    and writes like CREATE TABLE ... PARTITION OF.
+    """
+    qn = connection.ops.quote_name
+    table = Task._meta.db_table
+    name = partition_name(month)
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        # Generated columns such as search_document must stay generated to attach
+        cursor.execute(
+            f'CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED)'
+        )
+        if default:
+            # Generated columns cannot be inserted into, so only the model's columns are moved
+            columns = ', '.join(qn(field.column) for field in Task._meta.concrete_fields)
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM {qn(default)} WHERE date >= %s AND date < %s RETURNING *) '
+                f'INSERT INTO {qn(name)} ({columns}) SELECT {columns} FROM moved',
+                [start, end],
+            )
+        cursor.execute(f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} FOR VALUES FROM ('{start}') TO ('{end}')")
+    return name
+
+
+def detach_partition(connection, partition, archive_schema=None, drop=False):
+    """
+    Detach a partition from the task table so its tasks drop out of every
+    query. The detached table is kept as is, moved to `archive_schema`, or
+    dropped along with its tasks' tag links.
+    """
+    qn = connection.ops.quote_name
+    table = Task._meta.db_table
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {qn(table)} DETACH PARTITION {qn(partition.name)}')
+        if drop:
+            # No foreign key cascades the delete to the tag links
+            cursor.execute(
+                f'DELETE FROM {qn(TaskTag._meta.db_table)} WHERE task_id IN (SELECT id FROM {qn(partition.name)})'
+            )
+            cursor.execute(f'DROP TABLE {qn(partition.name)}')
+        elif archive_schema:
+            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS {qn(archive_schema)}')
+            cursor.execute(f'ALTER TABLE {qn(partition.name)} SET SCHEMA {qn(archive_schema)}')
@@ -0,0 +1,56 @@
+"""
+The hot Task queries and whether the database answers them with an index.
+Shared by the check_task_query_plans command and the query plan tests.
+"""
+from datetime import date
+
+from django.db import connection
+from django.db.models import Sum
+
+from accounts.models import CustomUser
+
+from .models import Task
+
+
+def hot_task_queries():
+    """Return the hot Task queries by name, for an existing employee and date."""
+    employee_id = CustomUser.objects.filter(role='employee').values_list('id', flat=True).first()
+    task_date = Task.objects.values_list('date', flat=True).order_by('-date').first() or date.today()
+
+    queries = {
+        # Task.clean and total_hours_for_employee_on_date
+        'daily hours': Task.objects.filter(employee_id=employee_id, date=task_date).values('employee').annotate(
+            total_hours=Sum('hours_spent')
+        ),
+        # TaskListView for employees
+        'employee task list': Task.objects.filter(employee_id=employee_id).order_by('date', 'id')[:100],
+        # TaskListView for managers filtering on status and date
+        'status by date': Task.objects.filter(status='approved', date=task_date).order_by('id')[:100],
+        # Approval queue and task_stats pending count
+        'pending queue': Task.objects.filter(status='pending').order_by('date')[:100],
+    }
+    if connection.vendor == 'postgresql':
+        # Keyword search through task_search_document_idx; elsewhere it is a substring scan by design
+        queries['keyword search'] = Task.objects.search('review').order_by('date', 'id')[:100]
+    return queries
+
+
+def analyze():
+    """Refresh planner statistics so plans reflect the current data."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'ANALYZE {Task._meta.db_table}')
+        elif connection.vendor == 'sqlite':
+            cursor.execute('ANALYZE')
+
+
+def is_sequential_scan(plan):
+    """Whether an EXPLAIN output scans the whole task table."""
+    table = Task._meta.db_table
+    if connection.vendor == 'postgresql':
+        return f'Seq Scan on {table}' in plan
+    if connection.vendor == 'sqlite':
+        return any(
+            line.strip().endswith(f'SCAN {table}') for line in plan.splitlines()
+        )
+    return False
@@ -0,0 +1,136 @@
+"""
+Keyword search over task titles, tags and descriptions.
+
+On PostgreSQL tasks are matched with full-text search against a weighted
+tsvector (title, then tags, then description) kept in the generated
+search_document column, covered by the task_search_document_idx GIN
+index. Every term is prefix matched and results are ranked with
+ts_rank_cd. When nothing matches, search_tasks() falls back to trigram
+word similarity on the title, covered by task_title_trgm_idx, so a
+misspelled keyword still finds its task.
+
+Other databases (SQLite in tests and benchmarks) fall back to
+case-insensitive substring matching of every term, without ranking.
+
+Migration 0011 adds search_document on PostgreSQL only, so it is not a
+model field; search_document() refers to it directly.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, F, FloatField, Func, Q, TextField, Value
+from django.db.models.expressions import Col, Expression
+
+SEARCH_CONFIG = 'english'
+# Longer queries are cut down to this many terms
+MAX_TERMS = 8
+
+WORD = re.compile(r'\w+')
+
+
+def search_terms(text):
+    """Split a search string into distinct lowercase words."""
+    terms = []
+    for term in WORD.findall((text or '').lower()):
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+# Stands in for the column in queries; it has no model and no place in Task._meta
+SEARCH_DOCUMENT = TextField()
+SEARCH_DOCUMENT.set_attributes_from_name('search_document')
+
+
+class SearchDocument(Expression):
+    def resolve_expression(self, query=None, allow_joins=True, reuse=None, summarize=False, for_save=False):
+        # A column reference relabels along with the task table when the query is nested
+        return Col(query.get_initial_alias(), SEARCH_DOCUMENT)
+
+
+def search_document():
+    """The stored weighted tsvector of a task (PostgreSQL only)."""
+    return SearchDocument(output_field=TextField())
+
+
+def search_query(terms):
+    """A tsquery requiring every term, each matched as a prefix."""
+    return Func(
+        Value(' & '.join(f'{term}:*' for term in terms)),
+        template=f"to_tsquery('{SEARCH_CONFIG}', %(expressions)s)",
+        output_field=TextField(),
+    )
+
+
+def matches(terms):
+    return Func(search_document(), search_query(terms), arg_joiner=' @@ ', template='%(expressions)s',
+                output_field=BooleanField())
+
+
+def rank(terms):
+    return Func(search_document(), search_query(terms), function='ts_rank_cd', output_field=FloatField())
+
+
+def title_resembles(text):
+    # The %> operator (word similarity above pg_trgm.word_similarity_threshold) can use the trigram index
+    return Func(F('title'), Value(text), arg_joiner=' %%> ', template='%(expressions)s', output_field=BooleanField())
+
+
+def title_similarity(text):
+    return Func(Value(text), F('title'), function='word_similarity', output_field=FloatField())
+
+
+def substring_match(terms):
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(tags__icontains=term) | Q(description__icontains=term)
+    return condition
+
+
+def uses_full_text(queryset):
+    return connections[queryset.db].vendor == 'postgresql'
+
+
+def filter_tasks(queryset, text):
+    """
+    Narrow the queryset down to tasks matching every word of `text`,
+    keeping its ordering. Matches nothing if `text` has no words.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return queryset.none()
+    if uses_full_text(queryset):
+        return queryset.filter(matches(terms))
+    return queryset.filter(substring_match(terms))
+
+
+def search_tasks(queryset, text, limit):
+    """
+    Return up to `limit` (task, rank) rows of the queryset best matching
+    `text`, best first, as TaskReadSerializer rows with the rank appended,
+    and whether they came from the fuzzy fallback. Ranks are None where
+    the database has no full-text search.
+    """
+    # Imported here to avoid a circular import through the models
+    from .serializers import TaskReadSerializer
+
+    terms = search_terms(text)
+    if not terms:
+        return [], False
+    if not uses_full_text(queryset):
+        rows = TaskReadSerializer.rows(
+            queryset.filter(substring_match(terms)).annotate(rank=Value(None, output_field=FloatField())), 'rank'
+        ).order_by('-date', '-id')
+        return list(rows[:limit]), False
+
+    rows = list(TaskReadSerializer.rows(
+        queryset.filter(matches(terms)).annotate(rank=rank(terms)), 'rank'
+    ).order_by('-rank', '-id')[:limit])
+    if rows:
+        return rows, False
+
+    text = ' '.join(terms)
+    rows = list(TaskReadSerializer.rows(
+        queryset.filter(title_resembles(text)).annotate(rank=title_similarity(text)), 'rank'
+    ).order_by('-rank', '-id')[:limit])
+    return rows, True
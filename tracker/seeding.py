@@ -0,0 +1,104 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+
+from accounts.models import CustomUser
+from .models import Task
+
+TAG_POOL = [
+    'api', 'frontend', 'backend', 'bugfix', 'meeting', 'review', 'testing',
+    'deployment', 'design', 'docs', 'support', 'research', 'planning', 'ops',
+]
+STATUS_WEIGHTS = (('approved', 60), ('pending', 30), ('rejected', 10))
+HOUR_CHOICES = [Decimal(h) for h in ('0.50', '1.00', '1.50', '2.00', '2.50', '3.00', '4.00')]
+
+
+def seed_users(count, manager_ratio=0.1, password='password', prefix='seed'):
+    """
+    Create `count` users, roughly `manager_ratio` of them managers.
+
+    The password is hashed once and shared by every seeded user so that seeding
+    thousands of users does not pay the hashing cost per row.
+    """
+    hashed = make_password(password)
+    offset = CustomUser.objects.filter(email__startswith=f'{prefix}-').count()
+    managers = max(1, int(count * manager_ratio)) if count else 0
+    users = [
+        CustomUser(
+            email=f'{prefix}-{offset + i}@example.com',
+            username=f'{prefix}-{offset + i}',
+            role='manager' if i < managers else 'employee',
+            password=hashed,
+        )
+        for i in range(count)
+    ]
+    return CustomUser.objects.bulk_create(users, batch_size=1000)
+
+
+def weekdays_back(end_date):
+    """Yield weekdays going backwards from `end_date`."""
+    current = end_date
+    while True:
+        if current.weekday() < 5:
+            yield current
+        current -= timedelta(days=1)
+
+
+def generate_tasks(employee_ids, count, end_date=None, rng=None):
+    """
+    Yield `count` unsaved tasks, filling weekdays backwards from `end_date`.
+
+    Every (employee, date) pair is used at most once and gets a handful of
+    tasks whose hours never add up to more than 8, so the generated data
+    respects the daily limit.
+    """
+    if not employee_ids:
+        return
+    rng = rng or random.Random(0)
+    statuses = [s for s, _ in STATUS_WEIGHTS]
+    weights = [w for _, w in STATUS_WEIGHTS]
+
+    produced = 0
+    for task_date in weekdays_back(end_date or date.today()):
+        for employee_id in employee_ids:
+            if produced >= count:
+                return
+            # Not everyone logs work every day
+            if rng.random() < 0.15:
+                continue
+            remaining = Decimal('8.00')
+            for i in range(rng.randint(1, 4)):
+                choices = [h for h in HOUR_CHOICES if h <= remaining]
+                if not choices or produced >= count:
+                    break
+                hours = rng.choice(choices)
+                remaining -= hours
+                status = rng.choices(statuses, weights)[0]
+                yield Task(
+                    employee_id=employee_id,
+                    title=f'Task {produced}',
+                    description=f'Seeded task {i + 1} for {task_date.isoformat()}',
+                    hours_spent=hours,
+                    tags=','.join(rng.sample(TAG_POOL, rng.randint(0, 3))) or None,
+                    date=task_date,
+                    status=status,
+                    manager_comment='Please add more detail.' if status == 'rejected' else None,
+                )
+                produced += 1
+
+
+def seed_tasks(employee_ids, count, batch_size=5000, **kwargs):
+    """
+    Insert `count` generated tasks with bulk_create in batches of `batch_size`,
+    keeping the tag links and the daily-hours ledger in sync.
+    """
+    batch = []
+    for task in generate_tasks(employee_ids, count, **kwargs):
+        batch.append(task)
+        if len(batch) >= batch_size:
+            Task.objects.create_many(batch, check_limit=False)
+            batch = []
+    if batch:
+        Task.objects.create_many(batch, check_limit=False)
@@ -1,3 +1,4 @@
+from decimal import Decimal, localcontext
 from rest_framework import serializers
 from .models import Task
 
@@ -7,7 +8,46 @@ class TaskSerializer(serializers.ModelSerializer):
         fields = ['id', 'employee', 'title', 'description', 'hours_spent', 'tags', 'date', 'status', 'manager_comment']
         read_only_fields = ['employee', 'status']  # Prevents modification of these fields from API
 
+class TaskReadSerializer:
+    """
+    Read-only fast path for task listings.
+
+    Pulls plain tuples with values_list and builds the dicts directly instead
+    of instantiating models and walking DRF fields for every row. The output is
+    identical to TaskSerializer(task).data.
+    """
+    fields = TaskSerializer.Meta.fields
+    date_index = fields.index('date')
+    hours_index = fields.index('hours_spent')
+    hours_field = Task._meta.get_field('hours_spent')
+    hours_quantum = Decimal(1).scaleb(-hours_field.decimal_places)
+
+    @classmethod
+    def rows(cls, queryset, *extra_fields):
+        return queryset.values_list(*cls.fields, *extra_fields)
+
+    @classmethod
+    def position(cls, row):
+        """The (date, id) keyset position of a row, for pagination."""
+        return row[cls.date_index], row[0]
+
+    @classmethod
+    def to_representation(cls, row):
+        data = dict(zip(cls.fields, row))
+        # Mirror DRF's DecimalField: quantize, then render as a plain string
+        with localcontext() as context:
+            context.prec = cls.hours_field.max_digits
+            data['hours_spent'] = '{:f}'.format(row[cls.hours_index].quantize(cls.hours_quantum))
+        data['date'] = row[cls.date_index].isoformat()
+        return data
+
+    @classmethod
+    def many(cls, rows):
+        return [cls.to_representation(row) for row in rows]
+
+
 class TaskStatsSerializer(serializers.Serializer):
     total_hours = serializers.FloatField()
     most_used_tags = serializers.ListField(child=serializers.DictField())
     pending_approvals = serializers.IntegerField()
+    status_breakdown = serializers.DictField(child=serializers.DictField())
@@ -0,0 +1,7 @@
+from django.dispatch import Signal
+
+# Sent after a transaction that created, updated or deleted tasks commits.
+# Arguments: action ('created', 'updated', 'deleted', 'approved' or
+# 'rejected'), task_ids, employee_ids and changes, the (task_id, employee_id)
+# pairs.
+tasks_changed = Signal()
@@ -0,0 +1,131 @@
+from decimal import Decimal
+
+from django.db.models import Count, Q, Sum
+
+from .models import Task, TaskRollup, TaskTag, next_period_start, period_start
+
+
+def task_stats_aggregates():
+    """
+    The conditional aggregation behind compute_task_stats: total hours and
+    the task count and hours per status, computed in a single pass.
+    """
+    aggregates = {'total_hours': Sum('hours_spent')}
+    for status, _ in Task.STATUS_CHOICES:
+        aggregates[f'{status}_count'] = Count('id', filter=Q(status=status))
+        aggregates[f'{status}_hours'] = Sum('hours_spent', filter=Q(status=status))
+    return aggregates
+
+
+def most_used_tags(queryset, limit):
+    """The `limit` most used tags among the tasks, grouped in the TaskTag table."""
+    return TaskTag.objects.filter(task__in=queryset.order_by().values('pk')).values('tag__name').annotate(
+        count=Count('id'),
+    ).order_by('-count', 'tag__name')[:limit]
+
+
+def summarize_task_stats(totals, tags):
+    """Shape the aggregates and tag counts into the dashboard stats."""
+    status_breakdown = {
+        status: {"count": totals[f'{status}_count'], "hours": totals[f'{status}_hours'] or Decimal('0')}
+        for status, _ in Task.STATUS_CHOICES
+    }
+    return {
+        "total_hours": totals['total_hours'] or Decimal('0'),
+        "most_used_tags": [
+            {"tags": tag['tag__name'], "count": tag['count']} for tag in tags
+        ],
+        "pending_approvals": status_breakdown['pending']['count'],
+        "status_breakdown": status_breakdown,
+    }
+
+
+def compute_task_stats(queryset, top_tags=5):
+    """
+    Compute dashboard stats for a filtered task queryset in two queries.
+
+    One conditional aggregation yields the total hours and the per-status
+    breakdown (and with it the pending count); the tag frequencies are a
+    GROUP BY over the TaskTag links of the same tasks. Neither returns more
+    rows than there are statuses or requested tags.
+    """
+    return summarize_task_stats(
+        queryset.order_by().aggregate(**task_stats_aggregates()),
+        most_used_tags(queryset, top_tags),
+    )
+
+
+async def acompute_task_stats(queryset, top_tags=5):
+    """Async version of compute_task_stats using the async ORM."""
+    return summarize_task_stats(
+        await queryset.order_by().aaggregate(**task_stats_aggregates()),
+        [tag async for tag in most_used_tags(queryset, top_tags)],
+    )
+
+
+def period_starts(period, start, end, limit=None):
+    """
+    Return the start dates of the periods overlapping [start, end]. Raises
+    ValueError if there would be more than `limit` of them.
+    """
+    starts = []
+    day = period_start(period, start)
+    while day <= end:
+        if limit is not None and len(starts) >= limit:
+            raise ValueError(f"The range covers more than {limit} {period} buckets.")
+        starts.append(day)
+        day = next_period_start(period, day)
+    return starts
+
+
+def compute_task_series(period, start, end, employee_id=None, by_employee=False, limit=None):
+    """
+    Build a time series of task counts and hours between `start` and `end`
+    from the pre-aggregated rollups.
+
+    Each bucket reads at most one rollup row per employee and status, so
+    the cost depends on the number of buckets, not on how many tasks were
+    logged. Buckets without tasks are included with zero values. With
+    by_employee a separate series is returned per employee.
+    """
+    starts = period_starts(period, start, end, limit)
+    if not starts:
+        return []
+
+    rollups = TaskRollup.objects.filter(period=period, period_start__range=(starts[0], end))
+    if employee_id is not None:
+        rollups = rollups.filter(employee_id=employee_id)
+    group = ['employee_id'] if by_employee else []
+    rows = rollups.order_by().values(*group, 'period_start', 'status').annotate(
+        count=Sum('task_count'),
+        hours=Sum('hours'),
+    )
+
+    series = {}
+    for row in rows:
+        buckets = series.setdefault(row['employee_id'] if by_employee else None, {})
+        buckets.setdefault(row['period_start'], {})[row['status']] = row
+
+    def bucket(day, statuses):
+        breakdown = {
+            status: {"count": 0, "hours": Decimal('0')} for status, _ in Task.STATUS_CHOICES
+        }
+        for status, row in statuses.items():
+            breakdown[status] = {"count": row['count'], "hours": row['hours']}
+        decided = breakdown['approved']['count'] + breakdown['rejected']['count']
+        return {
+            "period_start": day,
+            "task_count": sum(entry['count'] for entry in breakdown.values()),
+            "total_hours": sum((entry['hours'] for entry in breakdown.values()), Decimal('0')),
+            "approval_rate": breakdown['approved']['count'] / decided if decided else None,
+            "status_breakdown": breakdown,
+        }
+
+    def dense(buckets):
+        return [bucket(day, buckets.get(day, {})) for day in starts]
+
+    if by_employee:
+        return [
+            {"employee": employee, "series": dense(buckets)} for employee, buckets in sorted(series.items())
+        ]
+    return dense(series.get(None, {}))
@@ -0,0 +1,45 @@
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from accounts.tokens import RoleRefreshToken
+from tracker.models import Task
+
+
+class TrackerTestMixin:
+    """
+    Users, authenticated API clients and task factories shared by the
+    tracker tests. Mix into TestCase or TransactionTestCase.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # Response cache generations, JWT user state and login throttles live in the cache
+        for alias in settings.CACHES:
+            caches[alias].clear()
+        self.employee = self.create_user('employee@example.com')
+        self.manager = self.create_user('manager@example.com', role='manager')
+        self.employee_client = self.client_for(self.employee)
+        self.manager_client = self.client_for(self.manager)
+
+    def create_user(self, email, role='employee'):
+        return CustomUser.objects.create(email=email, role=role)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RoleRefreshToken.for_user(user).access_token}')
+        return client
+
+    def create_task(self, employee=None, **fields):
+        fields = {
+            'title': 'Task',
+            'description': 'Work',
+            'hours_spent': Decimal('1.00'),
+            'date': date(2025, 1, 6),
+            **fields,
+        }
+        return Task.objects.create(employee=employee or self.employee, **fields)
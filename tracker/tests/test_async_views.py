@@ -0,0 +1,60 @@
+from datetime import date
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .base import TrackerTestMixin
+
+
+@override_settings(TRACKER_CACHE_TIMEOUT=0)
+class AsyncViewParityTests(TrackerTestMixin, TestCase):
+    """The async views answer exactly like the DRF views they replace."""
+
+    def setUp(self):
+        super().setUp()
+        other = self.create_user('other@example.com')
+        self.task = self.create_task(title='First', hours_spent=Decimal('2.00'), tags='api, web')
+        self.create_task(title='Second', status='approved', date=date(2025, 1, 7))
+        self.create_task(employee=other, title='Third', hours_spent=Decimal('3.50'), tags='docs')
+
+    def assertSameResponse(self, client, url, params=None):
+        expected = client.get(url, params)
+        headers = {'Authorization': client._credentials['HTTP_AUTHORIZATION']} if client._credentials else {}
+        with override_settings(ROOT_URLCONF='task_time_tracker.urls_async'):
+            response = async_to_sync(AsyncClient().get)(url, params or {}, headers=headers)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.json(), expected.json())
+        self.assertEqual(response.get('ETag'), expected.get('ETag'))
+        return response
+
+    def test_task_list(self):
+        url = reverse('task-list')
+        for client, params in (
+            (self.manager_client, None),
+            (self.employee_client, None),
+            (self.manager_client, {'status': 'pending', 'tags': 'api'}),
+            (self.manager_client, {'start': '2025-01-07', 'end': '2025-01-31'}),
+            (self.manager_client, {'date': 'not-a-date'}),
+            (self.manager_client, {'cursor': 'invalid'}),
+        ):
+            with self.subTest(params=params):
+                self.assertSameResponse(client, url, params)
+
+        first_page = self.assertSameResponse(self.manager_client, url, {'page_size': 2}).json()
+        self.assertSameResponse(self.manager_client, url, {'page_size': 2, 'cursor': first_page['next_cursor']})
+
+    def test_task_detail(self):
+        self.assertSameResponse(self.manager_client, reverse('task-detail', args=[self.task.pk]))
+        self.assertSameResponse(self.manager_client, reverse('task-detail', args=[self.task.pk + 100]))
+
+    def test_task_stats(self):
+        url = reverse('task-stats')
+        for params in (None, {'employee': self.employee.pk}, {'status': 'approved'}, {'date': 'bad'}):
+            with self.subTest(params=params):
+                self.assertSameResponse(self.manager_client, url, params)
+
+    def test_unauthenticated(self):
+        self.assertSameResponse(APIClient(), reverse('task-list'))
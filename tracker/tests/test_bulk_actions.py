@@ -0,0 +1,122 @@
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tracker.models import Task, TaskRollup
+
+from .base import TrackerTestMixin
+
+
+class TaskBulkActionTests(TrackerTestMixin, TestCase):
+    url = reverse('task-bulk-action')
+
+    def test_approves_and_rejects_pending_tasks(self):
+        first, second, third = (self.create_task(title=title) for title in 'ABC')
+        response = self.manager_client.patch(self.url, {'actions': [
+            {'id': first.pk, 'action': 'approve'},
+            {'id': second.pk, 'action': 'reject', 'comment': 'Too vague'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['detail'], '2 tasks updated successfully.')
+        self.assertEqual(sorted(response.data['updated']), [first.pk, second.pk])
+        self.assertEqual(response.data['skipped'], [])
+
+        statuses = {pk: (task_status, comment) for pk, task_status, comment in Task.objects.values_list(
+            'pk', 'status', 'manager_comment'
+        )}
+        self.assertEqual(statuses[first.pk][0], 'approved')
+        self.assertEqual(statuses[second.pk], ('rejected', 'Too vague'))
+        self.assertEqual(statuses[third.pk][0], 'pending')
+
+    def test_shorthand_applies_one_action_to_every_id(self):
+        tasks = [self.create_task(title=title) for title in 'AB']
+        response = self.manager_client.patch(
+            self.url, {'ids': [task.pk for task in tasks], 'action': 'reject', 'comment': 'Redo'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(Task.objects.values_list('status', 'manager_comment')), {('rejected', 'Redo')})
+
+    def test_skips_missing_and_decided_tasks(self):
+        pending = self.create_task(title='A')
+        decided = self.create_task(title='B', status='approved')
+        missing = decided.pk + 100
+        response = self.manager_client.patch(self.url, {'actions': [
+            {'id': pending.pk, 'action': 'reject'},
+            {'id': decided.pk, 'action': 'reject'},
+            {'id': missing, 'action': 'approve'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], [pending.pk])
+        self.assertEqual(response.data['skipped'], [
+            {'id': decided.pk, 'reason': 'already_decided'},
+            {'id': missing, 'reason': 'not_found'},
+        ])
+        self.assertEqual(Task.objects.get(pk=decided.pk).status, 'approved')
+
+    def test_moves_the_rollups_to_the_new_status(self):
+        self.create_task(hours_spent=Decimal('2.00'))
+        task = self.create_task(hours_spent=Decimal('3.00'))
+        self.manager_client.patch(self.url, {'ids': [task.pk], 'action': 'approve'}, format='json')
+        rollups = {
+            status: (count, hours)
+            for status, count, hours in TaskRollup.objects.filter(
+                period='day', period_start=date(2025, 1, 6)
+            ).values_list('status', 'task_count', 'hours')
+        }
+        self.assertEqual(rollups, {'pending': (1, Decimal('2.00')), 'approved': (1, Decimal('3.00'))})
+
+    def test_advances_the_change_sequence(self):
+        task = self.create_task()
+        before = Task.objects.get(pk=task.pk).change_seq
+        self.manager_client.patch(self.url, {'ids': [task.pk], 'action': 'approve'}, format='json')
+        self.assertGreater(Task.objects.get(pk=task.pk).change_seq, before)
+
+    def test_allocates_the_change_sequence_last(self):
+        tasks = [self.create_task(title=title) for title in 'AB']
+        with CaptureQueriesContext(connection) as queries:
+            Task.objects.apply_actions({tasks[0].pk: ('approve', ''), tasks[1].pk: ('reject', 'Redo')})
+        writes = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+        counter = [index for index, sql in enumerate(writes) if 'tracker_taskchangecounter' in sql]
+        decisions = [index for index, sql in enumerate(writes) if sql.startswith('UPDATE "tracker_task" SET "status"')]
+        self.assertEqual(len(decisions), 2)
+        self.assertGreater(min(counter), max(decisions))
+        stored = dict(Task.objects.values_list('pk', 'change_seq'))
+        self.assertEqual(stored[tasks[1].pk], stored[tasks[0].pk] + 1)
+
+    def test_invalid_items_change_nothing(self):
+        task = self.create_task()
+        response = self.manager_client.patch(self.url, {'actions': [
+            {'id': task.pk, 'action': 'approve'},
+            {'id': 'x', 'action': 'approve'},
+            {'id': task.pk + 1, 'action': 'delete'},
+            {'id': task.pk, 'action': 'reject'},
+            'approve',
+        ]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['detail'], 'Invalid data. No tasks were changed.')
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2, 3, 4])
+        self.assertEqual(Task.objects.get(pk=task.pk).status, 'pending')
+
+    def test_rejects_an_empty_body(self):
+        response = self.manager_client.patch(self.url, {'actions': []}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'detail': 'Expected a non-empty list of actions.'})
+
+    @override_settings(TASK_BULK_ACTION_MAX_ITEMS=1)
+    def test_rejects_too_many_items(self):
+        tasks = [self.create_task(title=title) for title in 'AB']
+        response = self.manager_client.patch(
+            self.url, {'ids': [task.pk for task in tasks], 'action': 'approve'}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'detail': 'At most 1 tasks can be actioned at once.'})
+
+    def test_employees_are_forbidden(self):
+        task = self.create_task()
+        response = self.employee_client.patch(self.url, {'ids': [task.pk], 'action': 'approve'}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Task.objects.get(pk=task.pk).status, 'pending')
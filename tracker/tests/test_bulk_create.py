@@ -0,0 +1,104 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tracker.models import DailyHours, Task, TaskTag
+
+from .base import TrackerTestMixin
+
+
+def item(**fields):
+    return {'title': 'Task', 'description': 'Work', 'hours_spent': '1.00', 'date': '2025-01-06', **fields}
+
+
+class TaskBulkCreateTests(TrackerTestMixin, TestCase):
+    url = reverse('task-bulk-create')
+
+    def test_creates_every_task_for_the_user(self):
+        response = self.employee_client.post(self.url, [
+            item(title='A', hours_spent='3.00', tags='web, api'),
+            item(title='B', hours_spent='2.50', date='2025-01-07'),
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['detail'], '2 tasks created successfully.')
+        self.assertEqual([task['title'] for task in response.data['tasks']], ['A', 'B'])
+        self.assertTrue(all(task['id'] for task in response.data['tasks']))
+
+        tasks = Task.objects.order_by('title')
+        self.assertEqual([(task.title, task.employee_id, task.status) for task in tasks], [
+            ('A', self.employee.pk, 'pending'),
+            ('B', self.employee.pk, 'pending'),
+        ])
+        self.assertEqual(DailyHours.total_for(self.employee.pk, date(2025, 1, 6)), Decimal('3.00'))
+        self.assertEqual(DailyHours.total_for(self.employee.pk, date(2025, 1, 7)), Decimal('2.50'))
+        self.assertEqual(
+            sorted(TaskTag.objects.filter(task__title='A').values_list('tag__name', flat=True)), ['api', 'web']
+        )
+
+    def test_accepts_a_tasks_object(self):
+        response = self.employee_client.post(self.url, {'tasks': [item()]}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_ignores_employee_and_status_from_the_client(self):
+        response = self.employee_client.post(
+            self.url, [item(employee=self.manager.pk, status='approved')], format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(list(Task.objects.values_list('employee_id', 'status')), [(self.employee.pk, 'pending')])
+
+    def test_invalid_items_are_reported_by_index_and_nothing_is_created(self):
+        response = self.employee_client.post(self.url, [
+            item(),
+            item(title=''),
+            item(date='06/01/2025'),
+        ], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['detail'], 'Validation failed. No tasks were created.')
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        self.assertIn('title', response.data['errors'][0]['errors'])
+        self.assertIn('date', response.data['errors'][1]['errors'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_daily_limit_counts_logged_hours_and_the_batch(self):
+        self.create_task(hours_spent=Decimal('5.00'))
+        response = self.employee_client.post(self.url, [
+            item(hours_spent='2.00'),
+            item(hours_spent='2.00', date='2025-01-07'),
+            item(hours_spent='1.50'),
+        ], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'], [
+            {'index': 2, 'errors': {'hours_spent': ['Total hours for the day cannot exceed 8 hours.']}},
+        ])
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertEqual(DailyHours.total_for(self.employee.pk, date(2025, 1, 6)), Decimal('5.00'))
+
+    def test_rejected_items_do_not_count_toward_the_limit(self):
+        self.create_task(hours_spent=Decimal('5.00'))
+        response = self.employee_client.post(self.url, [
+            item(hours_spent='4.00'),
+            item(hours_spent='3.00'),
+        ], format='json')
+        self.assertEqual(response.status_code, 400)
+        # Only the 4 hours go over; the 3 hours would fit alongside the logged 5
+        self.assertEqual([error['index'] for error in response.data['errors']], [0])
+
+    def test_rejects_an_empty_or_malformed_body(self):
+        for body in ([], {'tasks': []}, {'title': 'Task'}):
+            response = self.employee_client.post(self.url, body, format='json')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.data, {'detail': 'Expected a non-empty list of tasks.'})
+
+    @override_settings(TASK_BULK_CREATE_MAX_ITEMS=2)
+    def test_rejects_too_many_items(self):
+        response = self.employee_client.post(self.url, [item(), item(), item()], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'detail': 'At most 2 tasks can be created at once.'})
+        self.assertFalse(Task.objects.exists())
+
+    def test_requires_authentication(self):
+        response = self.client.post(self.url, [item()], content_type='application/json')
+        self.assertEqual(response.status_code, 401)
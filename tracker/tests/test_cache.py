@@ -0,0 +1,139 @@
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+
+from tracker.cache import current_generation, invalidate
+from tracker.checks import check_replica_pin_cache, check_shared_cache
+
+from .base import TrackerTestMixin
+
+
+@override_settings(TRACKER_CACHE_TIMEOUT=60)
+class ResponseCacheTests(TrackerTestMixin, TestCase):
+    url = reverse('task-list')
+
+    def setUp(self):
+        super().setUp()
+        self.other = self.create_user('other@example.com')
+        self.other_client = self.client_for(self.other)
+
+    def titles(self, client):
+        return [task['title'] for task in client.get(self.url).data['tasks']]
+
+    def test_writes_start_new_generations_for_everyone_and_the_employee(self):
+        everyone, employee, other = (current_generation(pk) for pk in (None, self.employee.pk, self.other.pk))
+        invalidate(employee_ids={self.employee.pk})
+        self.assertNotEqual(current_generation(), everyone)
+        self.assertNotEqual(current_generation(self.employee.pk), employee)
+        self.assertEqual(current_generation(self.other.pk), other)
+
+    def test_full_invalidation_reaches_every_employee(self):
+        generations = [current_generation(pk) for pk in (None, self.employee.pk, self.other.pk)]
+        invalidate()
+        for pk, generation in zip((None, self.employee.pk, self.other.pk), generations):
+            self.assertNotEqual(current_generation(pk), generation)
+
+    def test_lists_see_the_writes_that_affect_them(self):
+        self.assertEqual(self.titles(self.employee_client), [])
+        self.assertEqual(self.titles(self.other_client), [])
+        self.assertEqual(self.titles(self.manager_client), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_task(title='Mine')
+        self.assertEqual(self.titles(self.employee_client), ['Mine'])
+        self.assertEqual(self.titles(self.manager_client), ['Mine'])
+        # Another employee's cached list is not invalidated by the write
+        with self.assertNumQueries(0):
+            self.assertEqual(self.titles(self.other_client), [])
+
+    def test_filtered_stats_use_the_employee_generation(self):
+        url = reverse('task-stats')
+        params = {'employee': self.other.pk}
+        self.assertEqual(self.manager_client.get(url, params).data['total_hours'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_task()
+        with self.assertNumQueries(0):
+            self.manager_client.get(url, params)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_task(employee=self.other)
+        self.assertEqual(self.manager_client.get(url, params).data['total_hours'], 1)
+
+    def test_revalidation_needs_no_queries(self):
+        self.create_task()
+        response = self.employee_client.get(self.url)
+        self.assertNotIn('Last-Modified', response)
+        with self.assertNumQueries(0):
+            response = self.employee_client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(TRACKER_CACHE_TIMEOUT=0)
+    def test_revalidation_without_the_response_cache(self):
+        self.create_task()
+        etag = self.employee_client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            self.assertEqual(self.employee_client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_delete_changes_the_etag(self):
+        kept = self.create_task(title='Kept')
+        deleted = self.create_task(title='Deleted', date=kept.date.replace(day=1))
+        clients = (self.manager_client, self.employee_client)
+        etags = [client.get(self.url)['ETag'] for client in clients]
+        with self.captureOnCommitCallbacks(execute=True):
+            deleted.delete()
+        for client, etag in zip(clients, etags):
+            response = client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([task['title'] for task in response.data['tasks']], ['Kept'])
+
+    def test_etag_depends_on_the_parameters(self):
+        self.create_task()
+        etag = self.employee_client.get(self.url)['ETag']
+        response = self.employee_client.get(self.url, {'status': 'approved'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['tasks'], [])
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}, TRACKER_CACHE_TIMEOUT=60,
+)
+class DummyCacheTests(TrackerTestMixin, TestCase):
+    """A cache that keeps nothing disables response caching without breaking the endpoints."""
+
+    def test_sync_endpoints(self):
+        self.create_task()
+        for name in ('task-list', 'task-stats'):
+            with self.subTest(name):
+                first = self.employee_client.get(reverse(name))
+                self.assertEqual(first.status_code, 200)
+                # Every request gets a generation of its own, so nothing revalidates
+                second = self.employee_client.get(reverse(name), HTTP_IF_NONE_MATCH=first['ETag'])
+                self.assertEqual(second.status_code, 200)
+
+    @override_settings(ROOT_URLCONF='task_time_tracker.urls_async')
+    async def test_async_endpoints(self):
+        headers = {'Authorization': self.employee_client._credentials['HTTP_AUTHORIZATION']}
+        for url in ('/api/tracker/tasks/', '/api/tracker/tasks/stats/'):
+            with self.subTest(url):
+                response = await AsyncClient().get(url, headers=headers)
+                self.assertEqual(response.status_code, 200)
+
+
+class SharedCacheCheckTests(TestCase):
+    @override_settings(WEB_CONCURRENCY=4, CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_local_memory_cache_with_several_workers(self):
+        self.assertEqual([error.id for error in check_shared_cache(None)], ['tracker.E001'])
+
+    @override_settings(WEB_CONCURRENCY=1, CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_local_memory_cache_with_one_worker(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+    @override_settings(WEB_CONCURRENCY=4, CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+    def test_other_caches(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+    @override_settings(READ_REPLICA_ALIAS='default', CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_replica_with_a_local_memory_cache(self):
+        self.assertEqual([error.id for error in check_replica_pin_cache(None)], ['tracker.E002'])
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_local_memory_cache_without_a_replica(self):
+        self.assertEqual(check_replica_pin_cache(None), [])
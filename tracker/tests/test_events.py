@@ -0,0 +1,144 @@
+import asyncio
+from unittest import mock
+
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from tracker.events import RESYNC, InProcessBroker, channels_for, publish_task_events
+from tracker.models import Task
+
+from .base import TrackerTestMixin
+
+
+class RecordingBroker:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+class InProcessBrokerTests(SimpleTestCase):
+    async def test_delivers_to_subscribed_channels(self):
+        broker = InProcessBroker()
+        manager = await broker.subscribe(['role:manager'])
+        employee = await broker.subscribe(['user:1'])
+        broker.publish('role:manager', {"action": "created", "task_ids": [5]})
+        self.assertEqual(await manager.get(1), {"action": "created", "task_ids": [5]})
+        self.assertIsNone(await employee.get(0.01))
+
+    async def test_publishes_from_worker_threads(self):
+        broker = InProcessBroker()
+        subscription = await broker.subscribe(['user:1'])
+        await asyncio.to_thread(broker.publish, 'user:1', {"action": "deleted", "task_ids": [2]})
+        self.assertEqual(await subscription.get(1), {"action": "deleted", "task_ids": [2]})
+
+    @override_settings(TASK_EVENTS_QUEUE_SIZE=2)
+    async def test_overflow_asks_for_a_resync(self):
+        broker = InProcessBroker()
+        subscription = await broker.subscribe(['user:1'])
+        for task_id in range(3):
+            broker.publish('user:1', {"action": "updated", "task_ids": [task_id]})
+        # Let the loop run the scheduled deliveries
+        await asyncio.sleep(0)
+        self.assertEqual(await subscription.get(1), RESYNC)
+        self.assertIsNone(await subscription.get(0.01))
+
+    async def test_close_unsubscribes(self):
+        broker = InProcessBroker()
+        subscription = await broker.subscribe(['user:1', 'role:manager'])
+        await subscription.close()
+        self.assertEqual(broker.subscriptions, {})
+        broker.publish('user:1', {"action": "created", "task_ids": [1]})
+
+
+class PublishTaskEventsTests(TrackerTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.broker = RecordingBroker()
+        patcher = mock.patch('tracker.events.get_broker', return_value=self.broker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_channels(self):
+        self.assertEqual(channels_for(self.manager), ['role:manager'])
+        self.assertEqual(channels_for(self.employee), [f'user:{self.employee.pk}'])
+
+    def test_publishes_to_managers_and_each_employee(self):
+        publish_task_events(None, action='approved', changes=[(1, 10), (2, 11), (3, 10)])
+        self.assertEqual(self.broker.published, [
+            ('role:manager', {"action": "approved", "task_ids": [1, 2, 3], "employee_ids": [10, 11]}),
+            ('user:10', {"action": "approved", "task_ids": [1, 3]}),
+            ('user:11', {"action": "approved", "task_ids": [2]}),
+        ])
+
+    def test_writes_publish_once_committed(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            task = self.create_task()
+        self.assertEqual(self.broker.published, [])
+        for callback in callbacks:
+            callback()
+        self.assertIn((f'user:{self.employee.pk}', {"action": "created", "task_ids": [task.pk]}), self.broker.published)
+
+    def test_broker_failures_do_not_fail_the_write(self):
+        self.broker.publish = mock.Mock(side_effect=ConnectionError)
+        with self.assertLogs('tracker.events', 'ERROR'), self.captureOnCommitCallbacks(execute=True):
+            self.create_task()
+        self.assertEqual(Task.objects.count(), 1)
+
+
+class TaskEventsViewTests(TrackerTestMixin, TestCase):
+    url = reverse('task-events')
+
+    def setUp(self):
+        super().setUp()
+        self.broker = InProcessBroker()
+        patcher = mock.patch('tracker.events.get_broker', return_value=self.broker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def token(self, client):
+        return client._credentials['HTTP_AUTHORIZATION'].split()[1]
+
+    def test_refused_under_wsgi(self):
+        response = self.employee_client.get(self.url)
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.streaming)
+
+    async def test_requires_authentication(self):
+        response = await AsyncClient().get(self.url)
+        self.assertEqual(response.status_code, 401)
+        response = await AsyncClient().get(self.url, {'token': 'invalid'})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_streams_the_users_channel(self):
+        response = await AsyncClient().get(self.url, {'token': self.token(self.employee_client)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        try:
+            self.assertEqual(await anext(stream), b'retry: 3000\n\n')
+            self.broker.publish('role:manager', {"action": "created", "task_ids": [2]})
+            self.broker.publish(f'user:{self.employee.pk}', {"action": "created", "task_ids": [1]})
+            self.assertEqual(
+                await anext(stream),
+                b'event: created\ndata: {"action": "created", "task_ids": [1]}\n\n',
+            )
+        finally:
+            await stream.aclose()
+
+    @override_settings(TASK_EVENTS_HEARTBEAT_SECONDS=0)
+    async def test_idle_streams_send_keepalives(self):
+        headers = {'Authorization': self.manager_client._credentials['HTTP_AUTHORIZATION']}
+        response = await AsyncClient().get(self.url, headers=headers)
+        stream = aiter(response.streaming_content)
+        try:
+            self.assertEqual(await anext(stream), b'retry: 3000\n\n')
+            self.assertEqual(await anext(stream), b': keepalive\n\n')
+        finally:
+            await stream.aclose()
+
+    @override_settings(TASK_EVENTS_MAX_SECONDS=0)
+    async def test_stream_ends_at_the_deadline(self):
+        response = await AsyncClient().get(self.url, {'token': self.token(self.manager_client)})
+        self.assertEqual([chunk async for chunk in response.streaming_content], [b'retry: 3000\n\n'])
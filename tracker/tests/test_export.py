@@ -0,0 +1,107 @@
+import csv
+import gzip
+import io
+import json
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from .base import TrackerTestMixin
+
+
+class TaskExportTests(TrackerTestMixin, TestCase):
+    url = reverse('task-export')
+
+    def setUp(self):
+        super().setUp()
+        self.other = self.create_user('other@example.com')
+        self.first = self.create_task(title='First', description='Line one\nline "two", three',
+                                      hours_spent=Decimal('1.5'), date=date(2025, 1, 6), tags='api, Web')
+        self.second = self.create_task(employee=self.other, title='Second', date=date(2025, 1, 31))
+        self.third = self.create_task(title='Third', date=date(2025, 2, 1))
+
+    def export(self, client, headers=None, **params):
+        response = client.get(self.url, params, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    def csv_rows(self, client, **params):
+        response, body = self.export(client, **params)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        return list(csv.reader(io.StringIO(body.decode())))
+
+    def test_csv(self):
+        header, *rows = self.csv_rows(self.manager_client)
+        self.assertEqual(header, [
+            'id', 'employee', 'title', 'description', 'hours_spent', 'tags', 'date', 'status', 'manager_comment',
+            'employee_email',
+        ])
+        self.assertEqual(rows[0], [
+            str(self.first.pk), str(self.employee.pk), 'First', 'Line one\nline "two", three', '1.50', 'api, Web',
+            '2025-01-06', 'pending', '', 'employee@example.com',
+        ])
+        # Ordered by date, across employees for a manager
+        self.assertEqual([row[2] for row in rows], ['First', 'Second', 'Third'])
+        self.assertEqual(rows[1][-1], 'other@example.com')
+
+    def test_ndjson(self):
+        response, body = self.export(self.manager_client, output='ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual([line['title'] for line in lines], ['First', 'Second', 'Third'])
+        self.assertEqual(lines[0]['hours_spent'], '1.50')
+        self.assertEqual(lines[0]['employee_email'], 'employee@example.com')
+        self.assertIsNone(lines[1]['tags'])
+
+    def test_invalid_output(self):
+        response = self.manager_client.get(self.url, {'output': 'xml'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"detail": "Invalid output. Use csv or ndjson."})
+
+    def test_date_range_is_inclusive(self):
+        rows = self.csv_rows(self.manager_client, start='2025-01-06', end='2025-01-31')[1:]
+        self.assertEqual([row[2] for row in rows], ['First', 'Second'])
+        rows = self.csv_rows(self.manager_client, start='2025-01-07')[1:]
+        self.assertEqual([row[2] for row in rows], ['Second', 'Third'])
+
+    def test_invalid_date_range(self):
+        cases = [
+            ({'start': '01/06/2025'}, "Invalid date format. Use YYYY-MM-DD."),
+            ({'end': '2025-02-30'}, "Invalid date format. Use YYYY-MM-DD."),
+            ({'start': '2025-02-01', 'end': '2025-01-01'}, "start must not be after end."),
+            ({'employee': 'me'}, "Invalid employee."),
+        ]
+        for params, detail in cases:
+            with self.subTest(params):
+                response = self.manager_client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data, {"detail": detail})
+
+    def test_role_scoping(self):
+        rows = self.csv_rows(self.employee_client)[1:]
+        self.assertEqual([row[2] for row in rows], ['First', 'Third'])
+        # An employee filter cannot widen an employee's export
+        rows = self.csv_rows(self.employee_client, employee=self.other.pk)[1:]
+        self.assertEqual(rows, [])
+        rows = self.csv_rows(self.manager_client, employee=self.other.pk)[1:]
+        self.assertEqual([row[2] for row in rows], ['Second'])
+
+    def test_gzip(self):
+        _, plain = self.export(self.manager_client)
+        for accept_encoding in ('gzip', 'deflate, gzip;q=0.5', 'br, *', 'GZIP; Q=1'):
+            with self.subTest(accept_encoding):
+                response, body = self.export(self.manager_client, headers={'Accept-Encoding': accept_encoding})
+                self.assertEqual(response['Content-Encoding'], 'gzip')
+                self.assertEqual(gzip.decompress(body), plain)
+                self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_gzip_refused(self):
+        _, plain = self.export(self.manager_client)
+        for accept_encoding in ('', 'identity', 'gzip;q=0', 'gzip;q=0.0, deflate', '*, gzip;q=0', 'x-gzip-like'):
+            with self.subTest(accept_encoding):
+                response, body = self.export(self.manager_client, headers={'Accept-Encoding': accept_encoding})
+                self.assertNotIn('Content-Encoding', response)
+                self.assertEqual(body, plain)
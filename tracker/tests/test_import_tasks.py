@@ -0,0 +1,149 @@
+import csv
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from tracker.management.commands.import_tasks import Command
+from tracker.models import DailyHours, Task
+
+from .base import TrackerTestMixin
+
+LIMIT_ERROR = "Total hours for the day cannot exceed 8 hours."
+
+
+class ImportTasksTests(TrackerTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'tasks.csv')
+        self.rejects_path = f'{self.path}.rejects.csv'
+
+    def write(self, rows):
+        with open(self.path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['email', 'date', 'hours', 'title', 'tags'])
+            writer.writerows(rows)
+
+    def run_import(self, **options):
+        out = StringIO()
+        call_command('import_tasks', self.path, stdout=out, stderr=StringIO(), **options)
+        return out.getvalue()
+
+    def rejects(self):
+        with open(self.rejects_path, newline='') as f:
+            return [(row['line'], row['title'], row['error']) for row in csv.DictReader(f)]
+
+    def test_imports_valid_rows(self):
+        self.write([
+            ['Employee@Example.com', '2025-01-06', '2.5', 'Design', ' Backend, API '],
+            ['employee@example.com', '2025-01-07', '8', 'Build', ''],
+        ])
+        out = self.run_import(status='approved')
+        self.assertIn("Imported 2 of 2 rows", out)
+        self.assertFalse(os.path.exists(self.rejects_path))
+
+        tasks = {task.title: task for task in Task.objects.all()}
+        self.assertEqual(tasks['Design'].employee_id, self.employee.pk)
+        self.assertEqual(tasks['Design'].hours_spent, Decimal('2.50'))
+        self.assertEqual(tasks['Design'].status, 'approved')
+        # Tags are stored as submitted; only the links are normalized
+        self.assertEqual(tasks['Design'].tags, 'Backend, API')
+        self.assertEqual(set(tasks['Design'].tag_set.values_list('name', flat=True)), {'backend', 'api'})
+        self.assertIsNone(tasks['Build'].tags)
+        self.assertEqual(DailyHours.total_for(self.employee.pk, date(2025, 1, 6)), Decimal('2.50'))
+
+    def test_rejects_invalid_rows(self):
+        self.write([
+            ['nobody@example.com', '2025-01-06', '1', 'Unknown', ''],
+            ['employee@example.com', '06/01/2025', '1', 'Bad date', ''],
+            ['employee@example.com', '2025-01-06', '1.005', 'Bad hours', ''],
+            ['employee@example.com', '2025-01-06', '1', 'Valid', ''],
+            ['employee@example.com', '2025-01-06', '1', 'Long tags', 'x' * 300],
+        ])
+        out = self.run_import()
+        self.assertIn("Imported 1 of 5 rows", out)
+        self.assertIn("4 rows rejected", out)
+        self.assertEqual(self.rejects(), [
+            ('2', 'Unknown', "Unknown employee 'nobody@example.com'."),
+            ('3', 'Bad date', "Invalid date format. Use YYYY-MM-DD."),
+            ('4', 'Bad hours', "Hours must be a positive number of at most 8 with up to 2 decimal places."),
+            ('6', 'Long tags', "Tags are too long."),
+        ])
+
+    def test_rejects_rows_over_the_daily_limit_in_line_order(self):
+        self.create_task(hours_spent=Decimal('3.00'))
+        self.write([
+            ['employee@example.com', '2025-01-06', '4', 'Fits', ''],
+            ['employee@example.com', '2025-01-06', '2', 'Over', ''],
+            ['employee@example.com', '2025-01-06', 'x', 'Invalid', ''],
+            ['employee@example.com', '2025-01-06', '1', 'Fills the day', ''],
+            ['manager@example.com', '2025-01-06', '8', 'Other employee', ''],
+        ])
+        out = self.run_import()
+        self.assertIn("Imported 3 of 5 rows", out)
+        self.assertEqual(self.rejects(), [
+            ('3', 'Over', LIMIT_ERROR),
+            ('4', 'Invalid', "Invalid hours."),
+        ])
+        self.assertEqual(DailyHours.total_for(self.employee.pk, date(2025, 1, 6)), Decimal('8.00'))
+
+    def test_limit_spans_chunks(self):
+        self.write([['employee@example.com', '2025-01-06', '3', f'Task {index}', ''] for index in range(4)])
+        out = self.run_import(chunk_size=1)
+        self.assertIn("Imported 2 of 4 rows", out)
+        self.assertEqual([error for _, _, error in self.rejects()], [LIMIT_ERROR, LIMIT_ERROR])
+
+    def test_rerunning_counts_the_first_import(self):
+        self.write([
+            ['employee@example.com', '2025-01-06', '5', 'Monday', ''],
+            ['employee@example.com', '2025-01-07', '5', 'Tuesday', ''],
+        ])
+        self.run_import()
+        out = self.run_import()
+        self.assertIn("Imported 0 of 2 rows", out)
+        self.assertEqual(self.rejects(), [('2', 'Monday', LIMIT_ERROR), ('3', 'Tuesday', LIMIT_ERROR)])
+        self.assertEqual(Task.objects.count(), 2)
+
+    def test_reads_only_the_chunks_days_from_the_ledger(self):
+        self.create_task(date=date(2025, 1, 7))
+        self.create_task(employee=self.manager, date=date(2025, 1, 6))
+        self.write([
+            ['employee@example.com', '2025-01-06', '1', 'Monday', ''],
+            ['manager@example.com', '2025-01-08', '1', 'Wednesday', ''],
+        ])
+        with CaptureQueriesContext(connection) as queries:
+            self.run_import()
+        ledger_reads = [
+            query['sql'] for query in queries
+            if query['sql'].startswith('SELECT') and DailyHours._meta.db_table in query['sql']
+        ]
+        self.assertEqual(len(ledger_reads), 1)
+        self.assertNotIn('BETWEEN', ledger_reads[0])
+
+    def test_retries_after_concurrent_writes(self):
+        self.write([['employee@example.com', '2025-01-06', '6', 'Import', '']])
+        logged_hours = Command.logged_hours
+        reads = []
+
+        def concurrent_write(command, tasks):
+            hours = logged_hours(command, tasks)
+            # Someone logs hours for the same day after the first read
+            if not reads:
+                self.create_task(hours_spent=Decimal('4.00'), title='Concurrent')
+            reads.append(tasks)
+            return hours
+
+        with mock.patch.object(Command, 'logged_hours', concurrent_write):
+            out = self.run_import()
+        self.assertEqual(len(reads), 2)
+        self.assertIn("Imported 0 of 1 rows", out)
+        self.assertEqual(self.rejects(), [('2', 'Import', LIMIT_ERROR)])
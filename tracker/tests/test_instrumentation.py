@@ -0,0 +1,48 @@
+import re
+
+from django.test import AsyncClient, TestCase, modify_settings, override_settings
+
+from .base import TrackerTestMixin
+
+MIDDLEWARE = 'task_time_tracker.instrumentation.RequestInstrumentationMiddleware'
+
+
+def query_count(response):
+    return int(re.search(r'desc="(\d+) queries"', response['Server-Timing']).group(1))
+
+
+@override_settings(TRACKER_CACHE_TIMEOUT=0)
+@modify_settings(MIDDLEWARE={'prepend': MIDDLEWARE})
+class RequestInstrumentationTests(TrackerTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_task()
+
+    def test_counts_queries_under_wsgi(self):
+        response = self.manager_client.get('/api/tracker/tasks/stats/')
+        self.assertEqual(response.status_code, 200)
+        # Authentication, the totals and the tag counts
+        self.assertEqual(query_count(response), 3)
+
+    @override_settings(ROOT_URLCONF='task_time_tracker.urls_async')
+    async def test_counts_queries_of_async_views(self):
+        headers = {'Authorization': self.manager_client._credentials['HTTP_AUTHORIZATION']}
+        response = await AsyncClient().get('/api/tracker/tasks/stats/', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(query_count(response), 3)
+
+    @override_settings(ROOT_URLCONF='task_time_tracker.urls_async')
+    async def test_counts_queries_of_sync_views_under_asgi(self):
+        headers = {'Authorization': self.manager_client._credentials['HTTP_AUTHORIZATION']}
+        response = await AsyncClient().get('/api/tracker/tasks/stats/series/', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(query_count(response), 0)
+
+    def test_queries_outside_requests_are_not_counted(self):
+        # The first request also caches the user's state for authentication
+        self.manager_client.get('/api/tracker/tasks/stats/')
+        first = self.manager_client.get('/api/tracker/tasks/stats/')
+        self.create_task(title='Other')
+        second = self.manager_client.get('/api/tracker/tasks/stats/')
+        self.assertEqual(query_count(first), 2)
+        self.assertEqual(query_count(second), 2)
@@ -0,0 +1,237 @@
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+
+from tracker.models import DailyHours, Task, TaskRollup
+
+from .base import TrackerTestMixin
+
+DAY = date(2025, 1, 6)
+
+
+class LedgerTests(TrackerTestMixin, TransactionTestCase):
+    """The daily-hours ledger and rollups kept by Task writes, outside a test transaction."""
+
+    def ledger(self):
+        return {
+            (employee_id, day): total
+            for employee_id, day, total in DailyHours.objects.values_list('employee_id', 'date', 'total_hours')
+            if total
+        }
+
+    def rollups(self, period='day'):
+        return {
+            (employee_id, start, status): (count, hours)
+            for employee_id, start, status, count, hours in TaskRollup.objects.filter(period=period).values_list(
+                'employee_id', 'period_start', 'status', 'task_count', 'hours'
+            )
+            if count or hours
+        }
+
+    def test_string_attributes_key_the_same_rows(self):
+        self.create_task(hours_spent=Decimal('3.00'))
+        Task.objects.create(
+            employee_id=str(self.employee.pk), title='Task', description='Work', hours_spent='2.50', date='2025-01-06'
+        )
+        self.assertEqual(self.ledger(), {(self.employee.pk, DAY): Decimal('5.50')})
+        self.assertEqual(self.rollups(), {(self.employee.pk, DAY, 'pending'): (2, Decimal('5.50'))})
+        self.assertEqual(self.rollups('month'), {(self.employee.pk, date(2025, 1, 1), 'pending'): (2, Decimal('5.50'))})
+
+        with self.assertRaises(ValidationError):
+            Task.objects.create(
+                employee_id=str(self.employee.pk), title='Task', description='Work', hours_spent='3', date='2025-01-06'
+            )
+
+    def test_create_many_with_string_attributes(self):
+        Task.objects.create_many([
+            Task(employee_id=str(self.employee.pk), title='Task', description='Work', hours_spent='2', date='2025-01-06'),
+            Task(employee=self.employee, title='Task', description='Work', hours_spent=Decimal('1'), date=DAY),
+        ])
+        self.assertEqual(self.ledger(), {(self.employee.pk, DAY): Decimal('3.00')})
+        self.assertEqual(self.rollups('week'), {(self.employee.pk, DAY, 'pending'): (2, Decimal('3.00'))})
+
+    def test_update_with_string_attributes(self):
+        task = self.create_task(hours_spent=Decimal('6.00'))
+        task.date = '2025-01-06'
+        task.hours_spent = '7.5'
+        task.save()
+        self.assertEqual(self.ledger(), {(self.employee.pk, DAY): Decimal('7.50')})
+        self.assertEqual(self.rollups(), {(self.employee.pk, DAY, 'pending'): (1, Decimal('7.50'))})
+
+    def test_clean_excludes_the_stored_hours(self):
+        task = self.create_task(hours_spent=Decimal('6.00'))
+        task.date = '2025-01-06'
+        task.hours_spent = '8'
+        task.clean()
+        task.hours_spent = '8.25'
+        with self.assertRaises(ValidationError):
+            task.clean()
+
+    def test_limit_rejects_the_write(self):
+        self.create_task(hours_spent=Decimal('6.00'))
+        with self.assertRaises(ValidationError):
+            self.create_task(hours_spent=Decimal('2.50'))
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertEqual(self.ledger(), {(self.employee.pk, DAY): Decimal('6.00')})
+        self.assertEqual(self.rollups(), {(self.employee.pk, DAY, 'pending'): (1, Decimal('6.00'))})
+
+    def test_create_many_over_the_limit_rolls_back(self):
+        self.create_task(hours_spent=Decimal('4.00'))
+        other_day = date(2025, 1, 7)
+        with self.assertRaises(ValidationError):
+            Task.objects.create_many([
+                Task(employee=self.employee, title='A', description='Work', hours_spent=Decimal('3'), date=other_day),
+                Task(employee=self.employee, title='B', description='Work', hours_spent=Decimal('3'), date=DAY),
+                Task(employee=self.employee, title='C', description='Work', hours_spent=Decimal('2'), date=DAY),
+            ])
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertEqual(self.ledger(), {(self.employee.pk, DAY): Decimal('4.00')})
+        self.assertEqual(self.rollups(), {(self.employee.pk, DAY, 'pending'): (1, Decimal('4.00'))})
+
+    def test_enclosing_rollback_undoes_the_ledger(self):
+        self.create_task(hours_spent=Decimal('2.00'))
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.create_task(hours_spent=Decimal('5.00'))
+                raise RuntimeError
+        self.assertEqual(self.ledger(), {(self.employee.pk, DAY): Decimal('2.00')})
+        self.assertEqual(self.rollups(), {(self.employee.pk, DAY, 'pending'): (1, Decimal('2.00'))})
+
+    def test_moving_a_task_decrements_the_old_day(self):
+        task = self.create_task(hours_spent=Decimal('5.00'))
+        self.create_task(hours_spent=Decimal('3.00'), date=date(2025, 1, 7))
+        task.date = date(2025, 1, 8)
+        task.status = 'approved'
+        task.save()
+        self.assertEqual(self.ledger(), {
+            (self.employee.pk, date(2025, 1, 7)): Decimal('3.00'),
+            (self.employee.pk, date(2025, 1, 8)): Decimal('5.00'),
+        })
+        self.assertEqual(self.rollups(), {
+            (self.employee.pk, date(2025, 1, 7), 'pending'): (1, Decimal('3.00')),
+            (self.employee.pk, date(2025, 1, 8), 'approved'): (1, Decimal('5.00')),
+        })
+        # The freed hours can be logged again
+        self.create_task(hours_spent=Decimal('8.00'))
+
+    def test_moving_to_a_full_day_is_rejected(self):
+        self.create_task(hours_spent=Decimal('7.00'))
+        task = self.create_task(hours_spent=Decimal('2.00'), date=date(2025, 1, 7))
+        task.date = DAY
+        with self.assertRaises(ValidationError):
+            task.save()
+        self.assertEqual(Task.objects.get(pk=task.pk).date, date(2025, 1, 7))
+        self.assertEqual(self.ledger(), {
+            (self.employee.pk, DAY): Decimal('7.00'),
+            (self.employee.pk, date(2025, 1, 7)): Decimal('2.00'),
+        })
+
+    def test_delete_decrements(self):
+        task = self.create_task(hours_spent=Decimal('5.00'))
+        self.create_task(hours_spent=Decimal('2.00'))
+        task.delete()
+        self.assertEqual(self.ledger(), {(self.employee.pk, DAY): Decimal('2.00')})
+        self.assertEqual(self.rollups(), {(self.employee.pk, DAY, 'pending'): (1, Decimal('2.00'))})
+        self.create_task(hours_spent=Decimal('6.00'))
+
+    def test_ledger_matches_a_rebuild(self):
+        other = self.create_user('other@example.com')
+        task = self.create_task(hours_spent=Decimal('3.00'))
+        self.create_task(employee=other, hours_spent=Decimal('4.00'))
+        Task.objects.create_many([
+            Task(employee=other, title='Task', description='Work', hours_spent=Decimal('1.25'), date=DAY),
+            Task(employee=self.employee, title='Task', description='Work', hours_spent=Decimal('2'), date=date(2025, 2, 3)),
+        ])
+        task.hours_spent = Decimal('4.50')
+        task.save()
+        self.create_task(hours_spent=Decimal('1.00'), date=date(2025, 2, 3)).delete()
+
+        ledger, rollups = self.ledger(), {period: self.rollups(period) for period in ('day', 'week', 'month')}
+        DailyHours.rebuild()
+        TaskRollup.rebuild()
+        self.assertEqual(self.ledger(), ledger)
+        self.assertEqual({period: self.rollups(period) for period in ('day', 'week', 'month')}, rollups)
+
+    def test_rebuild_since_keeps_earlier_periods(self):
+        # The week of Monday 2024-12-30 straddles the rebuild start
+        for day in (date(2024, 12, 31), date(2025, 1, 2), DAY):
+            self.create_task(hours_spent=Decimal('2.00'), date=day)
+        ledger, rollups = self.ledger(), {period: self.rollups(period) for period in ('day', 'week', 'month')}
+        # As if December's partition was detached
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {Task._meta.db_table} WHERE date < %s', [date(2025, 1, 1)])
+        DailyHours.objects.filter(date__gte=date(2025, 1, 1)).update(total_hours=0)
+        TaskRollup.objects.filter(period_start__gte=date(2025, 1, 1)).update(task_count=0, hours=0)
+
+        DailyHours.rebuild(since=date(2025, 1, 1))
+        TaskRollup.rebuild(since=date(2025, 1, 1))
+        # December, and the week that began in it, still count the detached task
+        self.assertEqual(self.ledger(), ledger)
+        self.assertEqual({period: self.rollups(period) for period in ('day', 'week', 'month')}, rollups)
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_concurrent_writes_cannot_both_pass_the_limit(self):
+        self.create_task(hours_spent=Decimal('2.00'))
+        first_saved = threading.Event()
+        release_first = threading.Event()
+        errors = {}
+
+        def log(name, hours, hold):
+            try:
+                with transaction.atomic():
+                    self.create_task(hours_spent=hours)
+                    if hold:
+                        first_saved.set()
+                        release_first.wait(5)
+            except ValidationError as e:
+                errors[name] = e
+            finally:
+                connection.close()
+
+        first = threading.Thread(target=log, args=('first', Decimal('4.00'), True))
+        first.start()
+        self.assertTrue(first_saved.wait(5))
+        # The second writer has to wait for the first one's ledger row lock
+        second = threading.Thread(target=log, args=('second', Decimal('3.00'), False))
+        second.start()
+        time.sleep(0.2)
+        self.assertTrue(second.is_alive())
+        release_first.set()
+        first.join(5)
+        second.join(5)
+
+        self.assertEqual(list(errors), ['second'])
+        self.assertEqual(self.ledger(), {(self.employee.pk, DAY): Decimal('6.00')})
+        self.assertEqual(Task.objects.count(), 2)
+
+
+class LedgerQueryTests(TrackerTestMixin, TestCase):
+    """The ledger and rollups are written with one upsert each, however many rows change."""
+
+    def test_create(self):
+        # Savepoint, ledger, rollups, insert, change counter (update and read), stamp, release
+        with self.assertNumQueries(8):
+            self.create_task()
+
+    def test_status_change(self):
+        task = self.create_task()
+        task.status = 'approved'
+        # Savepoint, lock, rollups, update, change counter (update and read), stamp, release
+        with self.assertNumQueries(8):
+            task.save()
+
+    def test_create_many(self):
+        tasks = [
+            Task(employee=self.employee, title='Task', description='Work', hours_spent=Decimal('1'), date=date(2025, 1, day))
+            for day in range(1, 29)
+        ]
+        # Savepoint, ledger, rollups, insert, change counter (update and read), stamp, release
+        with self.assertNumQueries(8):
+            Task.objects.create_many(tasks)
+        self.assertEqual(DailyHours.objects.count(), 28)
+        self.assertEqual(TaskRollup.objects.filter(period='week').count(), 5)
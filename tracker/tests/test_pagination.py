@@ -0,0 +1,94 @@
+import json
+from datetime import date, timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tracker.pagination import decode_cursor, encode_cursor
+
+from .base import TrackerTestMixin
+
+
+@override_settings(TRACKER_CACHE_TIMEOUT=0)
+class TaskListPaginationTests(TrackerTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        # Several tasks per date so pages split inside a date as well as between dates
+        self.tasks = [
+            self.create_task(title=f'Task {i}', date=date(2025, 1, 6) + timedelta(days=i % 3))
+            for i in range(7)
+        ]
+        self.expected_ids = [task.id for task in sorted(self.tasks, key=lambda task: (task.date, task.id))]
+
+    def fetch_all(self, client, page_size, **params):
+        ids = []
+        cursor = None
+        while True:
+            query = {'page_size': page_size, **params}
+            if cursor:
+                query['cursor'] = cursor
+            response = client.get(reverse('task-list'), query)
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertLessEqual(len(response.data['tasks']), page_size)
+            ids += [task['id'] for task in response.data['tasks']]
+            cursor = response.data['next_cursor']
+            if cursor is None:
+                return ids
+
+    def test_pages_cover_every_task_once_in_date_order(self):
+        for page_size in (1, 2, 3, 7, 100):
+            with self.subTest(page_size=page_size):
+                self.assertEqual(self.fetch_all(self.manager_client, page_size), self.expected_ids)
+
+    def test_last_page_has_no_cursor(self):
+        response = self.manager_client.get(reverse('task-list'), {'page_size': 7})
+        self.assertEqual(len(response.data['tasks']), 7)
+        self.assertIsNone(response.data['next_cursor'])
+
+    def test_cursor_is_stable_when_earlier_tasks_are_added(self):
+        first = self.manager_client.get(reverse('task-list'), {'page_size': 3})
+        seen = [task['id'] for task in first.data['tasks']]
+        # A task sorting before the cursor does not shift the following pages
+        self.create_task(title='Backdated', date=date(2024, 12, 1))
+        seen += self.fetch_all(self.manager_client, 3, cursor=first.data['next_cursor'])
+        self.assertEqual(seen, self.expected_ids)
+
+    def test_filters_apply_to_every_page(self):
+        other = self.create_user('other@example.com')
+        other_task = self.create_task(employee=other, date=date(2025, 1, 7))
+        # Employees only page through their own tasks
+        self.assertEqual(self.fetch_all(self.employee_client, 2), self.expected_ids)
+        self.assertEqual(
+            self.fetch_all(self.manager_client, 2, date='2025-01-07'),
+            [task.id for task in self.tasks if task.date == date(2025, 1, 7)] + [other_task.id],
+        )
+
+    def test_invalid_cursor(self):
+        for cursor in ('not-a-cursor', encode_cursor(date(2025, 1, 6), 1)[:-2]):
+            with self.subTest(cursor=cursor):
+                response = self.manager_client.get(reverse('task-list'), {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data, {"detail": "Invalid cursor."})
+
+    def test_invalid_filters(self):
+        for params in ({'date': '2025-13-01'}, {'start': 'x'}, {'start': '2025-01-08', 'end': '2025-01-06'},
+                       {'employee': 'me'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.manager_client.get(reverse('task-list'), params).status_code, 400)
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(date(2025, 1, 6), 42)), (date(2025, 1, 6), 42))
+
+    @override_settings(TASK_LIST_PAGE_SIZE=2, TASK_LIST_MAX_PAGE_SIZE=4)
+    def test_page_size_default_and_limit(self):
+        self.assertEqual(len(self.manager_client.get(reverse('task-list')).data['tasks']), 2)
+        self.assertEqual(len(self.manager_client.get(reverse('task-list'), {'page_size': 100}).data['tasks']), 4)
+        self.assertEqual(len(self.manager_client.get(reverse('task-list'), {'page_size': 'x'}).data['tasks']), 2)
+
+    @override_settings(TASK_LIST_STREAM_CHUNK_SIZE=2)
+    def test_stream_returns_every_task(self):
+        response = self.manager_client.get(reverse('task-list'), {'stream': 'true'})
+        self.assertEqual(response.status_code, 200)
+        body = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([task['id'] for task in body['tasks']], self.expected_ids)
+        self.assertEqual(body['detail'], "Tasks fetched successfully.")
@@ -0,0 +1,26 @@
+from django.test import TestCase
+
+from tracker.query_plans import analyze, hot_task_queries, is_sequential_scan
+from tracker.seeding import seed_tasks, seed_users
+
+
+class TaskQueryPlanTests(TestCase):
+    """
+    Regression test for the Task indexes: none of the hot queries may fall
+    back to a sequential scan of the task table. The data set is seeded
+    inside the test transaction and rolled back with it.
+    """
+    seed_users = 100
+    seed_tasks = 5000
+
+    @classmethod
+    def setUpTestData(cls):
+        users = seed_users(cls.seed_users)
+        seed_tasks([user.id for user in users if user.role == 'employee'], cls.seed_tasks)
+        analyze()
+
+    def test_hot_queries_use_an_index(self):
+        for name, queryset in hot_task_queries().items():
+            plan = queryset.explain()
+            with self.subTest(query=name):
+                self.assertFalse(is_sequential_scan(plan), f"{name} scans the task table:\n{plan}")
@@ -0,0 +1,78 @@
+from unittest import mock
+
+from django.conf import settings
+from django.test import AsyncClient, TestCase, modify_settings, override_settings
+from django.urls import reverse
+
+from task_time_tracker.db_routers import ReplicaRouter
+
+from .base import TrackerTestMixin
+
+
+@override_settings(DATABASE_ROUTERS=['task_time_tracker.db_routers.ReplicaRouter'], TRACKER_CACHE_TIMEOUT=60)
+@modify_settings(MIDDLEWARE={'append': 'task_time_tracker.db_routers.ReplicaPinningMiddleware'})
+class ReplicaResponseCacheTests(TrackerTestMixin, TestCase):
+    """
+    A write bumps the cache generation as soon as it commits on the primary,
+    so a response built from a lagging replica must never be cached or
+    tagged with that generation.
+    """
+    url = reverse('task-list')
+
+    def setUp(self):
+        super().setUp()
+        self.replica_reads = []
+        route = ReplicaRouter.db_for_read
+
+        def db_for_read(router, model, **hints):
+            alias = route(router, model, **hints)
+            if alias == settings.READ_REPLICA_ALIAS:
+                self.replica_reads.append(model._meta.label)
+                # The test database stands in for the replica
+                return None
+            return alias
+
+        for patcher in (
+            mock.patch('task_time_tracker.db_routers.replica_enabled', return_value=True),
+            mock.patch.object(ReplicaRouter, 'db_for_read', db_for_read),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_uncached_views_read_the_replica(self):
+        task = self.create_task()
+        self.manager_client.get(reverse('task-detail', args=[task.pk]))
+        self.assertIn('tracker.Task', self.replica_reads)
+
+    def test_cache_fills_after_a_write_read_the_primary(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_task(title='Written')
+        # The manager did not write, so is not pinned to the primary
+        response = self.manager_client.get(self.url)
+        self.assertEqual([task['title'] for task in response.data['tasks']], ['Written'])
+        self.assertEqual(self.replica_reads, [])
+
+        # The cached response and its ETag stand until the next write
+        with self.assertNumQueries(0):
+            self.assertEqual(self.manager_client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_stats_fill_reads_the_primary(self):
+        self.create_task()
+        self.assertEqual(self.manager_client.get(reverse('task-stats')).status_code, 200)
+        self.assertEqual(self.replica_reads, [])
+
+    @override_settings(ROOT_URLCONF='task_time_tracker.urls_async')
+    async def test_async_cache_fills_read_the_primary(self):
+        headers = {'Authorization': self.manager_client._credentials['HTTP_AUTHORIZATION']}
+        for url in ('/api/tracker/tasks/', '/api/tracker/tasks/stats/'):
+            with self.subTest(url):
+                self.assertEqual((await AsyncClient().get(url, headers=headers)).status_code, 200)
+        self.assertEqual(self.replica_reads, [])
+
+    @override_settings(TRACKER_CACHE_TIMEOUT=0)
+    def test_replica_responses_get_no_etag(self):
+        self.create_task()
+        response = self.manager_client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('tracker.Task', self.replica_reads)
+        self.assertNotIn('ETag', response)
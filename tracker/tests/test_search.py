@@ -0,0 +1,93 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tracker.models import Task
+from tracker.search import matches, rank, search_terms
+
+from .base import TrackerTestMixin
+
+full_text = skipUnless(connection.vendor == 'postgresql', 'Full-text search requires PostgreSQL')
+
+
+@override_settings(TRACKER_CACHE_TIMEOUT=0)
+class TaskSearchTests(TrackerTestMixin, TestCase):
+    url = reverse('task-search')
+
+    def setUp(self):
+        super().setUp()
+        self.create_task(title='Deploy release', description='Roll out version 2', tags='ops')
+        self.create_task(title='Write notes', description='Notes on the deploy window', tags='docs')
+        self.create_task(title='Quarterly report', description='Numbers for finance', tags='finance')
+
+    def search(self, q, **params):
+        response = self.manager_client.get(self.url, {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def titles(self, data):
+        return [task['title'] for task in data['tasks']]
+
+    def test_search_terms(self):
+        self.assertEqual(search_terms('Deploy, deploy the  RELEASE!'), ['deploy', 'the', 'release'])
+        self.assertEqual(search_terms(' ,; '), [])
+
+    def test_requires_a_query(self):
+        self.assertEqual(self.manager_client.get(self.url, {'q': ' '}).status_code, 400)
+
+    def test_every_term_must_match(self):
+        self.assertEqual(sorted(self.titles(self.search('deploy'))), ['Deploy release', 'Write notes'])
+        self.assertEqual(self.titles(self.search('deploy window')), ['Write notes'])
+        self.assertEqual(self.titles(self.search('deploy finance')), [])
+
+    def test_matches_titles_tags_and_descriptions(self):
+        for q, title in (('quarterly', 'Quarterly report'), ('docs', 'Write notes'), ('version', 'Deploy release')):
+            with self.subTest(q):
+                self.assertEqual(self.titles(self.search(q)), [title])
+
+    def test_list_search_filter(self):
+        response = self.manager_client.get(reverse('task-list'), {'search': 'notes'})
+        self.assertEqual([task['title'] for task in response.data['tasks']], ['Write notes'])
+        self.assertEqual(Task.objects.search('report finance').get().title, 'Quarterly report')
+
+    def test_full_text_reads_the_stored_document(self):
+        # Compiling needs no PostgreSQL; the column is only created there
+        sql = str(Task.objects.filter(matches(['deploy'])).annotate(rank=rank(['deploy'])).query)
+        self.assertIn('"tracker_task"."search_document" @@', sql)
+        self.assertIn('ts_rank_cd("tracker_task"."search_document"', sql)
+        nested = str(Task.objects.filter(pk__in=Task.objects.filter(matches(['deploy'])).values('pk')).query)
+        self.assertIn('U0."search_document" @@', nested)
+
+    @skipUnless(connection.vendor != 'postgresql', 'Substring matching is the fallback without PostgreSQL')
+    def test_substring_matching_is_unranked(self):
+        data = self.search('epl')
+        self.assertEqual(sorted(self.titles(data)), ['Deploy release', 'Write notes'])
+        self.assertEqual({task['rank'] for task in data['tasks']}, {None})
+        self.assertFalse(data['fuzzy'])
+
+    @full_text
+    def test_ranks_title_matches_first(self):
+        data = self.search('deploy')
+        self.assertEqual(self.titles(data), ['Deploy release', 'Write notes'])
+        self.assertGreater(data['tasks'][0]['rank'], data['tasks'][1]['rank'])
+        self.assertFalse(data['fuzzy'])
+
+    @full_text
+    def test_terms_match_prefixes(self):
+        self.assertEqual(self.titles(self.search('quart')), ['Quarterly report'])
+
+    @full_text
+    def test_falls_back_to_similar_titles(self):
+        data = self.search('reportt')
+        self.assertEqual(self.titles(data), ['Quarterly report'])
+        self.assertTrue(data['fuzzy'])
+        self.assertGreater(data['tasks'][0]['rank'], 0)
+
+    @full_text
+    def test_document_follows_updates(self):
+        task = Task.objects.get(title='Quarterly report')
+        task.description = 'Budget review'
+        task.save()
+        self.assertEqual(self.titles(self.search('budget')), ['Quarterly report'])
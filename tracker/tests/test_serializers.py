@@ -0,0 +1,31 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from tracker.models import Task
+from tracker.serializers import TaskReadSerializer, TaskSerializer
+
+from .base import TrackerTestMixin
+
+
+class TaskReadSerializerTests(TrackerTestMixin, TestCase):
+    def test_output_matches_task_serializer(self):
+        other = self.create_user('other@example.com')
+        self.create_task(tags=None, hours_spent=Decimal('1'), date=date(2025, 1, 6))
+        self.create_task(tags='', hours_spent='7.5', date='2025-01-07')
+        self.create_task(employee=other, tags='Backend, API', hours_spent=Decimal('0.25'), date=date(1999, 12, 31))
+        task = self.create_task(employee=other, title='Ünïcode "quoted"', hours_spent=Decimal('7.99'),
+                                date=date(2025, 2, 28))
+        task.status = 'rejected'
+        task.manager_comment = 'Too long\nplease split'
+        task.save()
+
+        queryset = Task.objects.order_by('id')
+        renderer = JSONRenderer()
+        expected = renderer.render(TaskSerializer(queryset, many=True).data)
+        actual = renderer.render(TaskReadSerializer.many(TaskReadSerializer.rows(queryset)))
+        self.assertEqual(actual, expected)
+        self.assertIn(b'"hours_spent":"7.50"', actual)
+        self.assertIn(b'"tags":null', actual)
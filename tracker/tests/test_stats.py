@@ -0,0 +1,163 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tracker.models import Task
+from tracker.stats import compute_task_stats
+
+from .base import TrackerTestMixin
+
+
+@override_settings(TRACKER_CACHE_TIMEOUT=0)
+class TaskStatsTests(TrackerTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        other = self.create_user('other@example.com')
+        self.create_task(hours_spent=Decimal('2.00'), tags='api, web')
+        self.create_task(hours_spent=Decimal('1.50'), tags='API', status='approved')
+        self.create_task(hours_spent=Decimal('3.00'), tags='docs,web', status='rejected')
+        self.create_task(employee=other, hours_spent=Decimal('0.50'), tags='web', date=date(2025, 1, 7))
+
+    def test_totals_and_status_breakdown(self):
+        stats = compute_task_stats(Task.objects.all())
+        self.assertEqual(stats['total_hours'], Decimal('7.00'))
+        self.assertEqual(stats['pending_approvals'], 2)
+        self.assertEqual(stats['status_breakdown'], {
+            'pending': {"count": 2, "hours": Decimal('2.50')},
+            'approved': {"count": 1, "hours": Decimal('1.50')},
+            'rejected': {"count": 1, "hours": Decimal('3.00')},
+        })
+
+    def test_most_used_tags_are_counted_per_tag(self):
+        stats = compute_task_stats(Task.objects.all())
+        self.assertEqual(stats['most_used_tags'], [
+            {"tags": 'web', "count": 3},
+            {"tags": 'api', "count": 2},
+            {"tags": 'docs', "count": 1},
+        ])
+        self.assertEqual(compute_task_stats(Task.objects.all(), top_tags=1)['most_used_tags'], [{"tags": 'web', "count": 3}])
+
+    def test_empty_queryset(self):
+        stats = compute_task_stats(Task.objects.none())
+        self.assertEqual(stats['total_hours'], Decimal('0'))
+        self.assertEqual(stats['most_used_tags'], [])
+        self.assertEqual(stats['status_breakdown']['pending'], {"count": 0, "hours": Decimal('0')})
+
+    def test_query_count_does_not_depend_on_tags(self):
+        for i in range(20):
+            self.create_task(tags=f'tag-{i},web', hours_spent=Decimal('0.10'), date=date(2025, 2, 3))
+        # One conditional aggregation and one TaskTag GROUP BY
+        with self.assertNumQueries(2):
+            compute_task_stats(Task.objects.all())
+
+    def test_endpoint_filters(self):
+        response = self.manager_client.get(reverse('task-stats'), {'employee': self.employee.id, 'tags': 'web'})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data['total_hours'], Decimal('5.00'))
+        self.assertEqual(response.data['most_used_tags'][0], {"tags": 'web', "count": 2})
+
+        response = self.manager_client.get(reverse('task-stats'), {'date': '2025-01-07'})
+        self.assertEqual(response.data['total_hours'], Decimal('0.50'))
+
+    def test_invalid_parameters(self):
+        response = self.manager_client.get(reverse('task-stats'), {'date': '07/01/2025'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"error": "Invalid date format. Use YYYY-MM-DD."})
+
+        response = self.manager_client.get(reverse('task-stats'), {'employee': 'me'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"error": "Invalid employee."})
+
+
+@override_settings(TRACKER_CACHE_TIMEOUT=0)
+class TaskStatsSeriesTests(TrackerTestMixin, TestCase):
+    url = reverse('task-stats-series')
+
+    def setUp(self):
+        super().setUp()
+        self.other = self.create_user('other@example.com')
+        # 2025-01-06 is a Monday
+        self.create_task(hours_spent=Decimal('2.00'), date=date(2025, 1, 6))
+        self.create_task(hours_spent=Decimal('1.00'), date=date(2025, 1, 8), status='approved')
+        self.create_task(hours_spent=Decimal('3.00'), date=date(2025, 1, 20), status='rejected')
+        self.create_task(hours_spent=Decimal('1.00'), date=date(2025, 2, 3), status='approved')
+        self.create_task(employee=self.other, hours_spent=Decimal('0.50'), date=date(2025, 1, 7), status='approved')
+
+    def series(self, client, **params):
+        response = client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data
+
+    def summary(self, buckets):
+        return [
+            (bucket['period_start'], bucket['task_count'], bucket['total_hours'], bucket['approval_rate'])
+            for bucket in buckets
+        ]
+
+    def test_weeks(self):
+        # A start inside a week includes that whole week
+        data = self.series(self.manager_client, period='week', start='2025-01-08', end='2025-01-26')
+        self.assertEqual((data['period'], data['start'], data['end']), ('week', date(2025, 1, 8), date(2025, 1, 26)))
+        self.assertEqual(self.summary(data['series']), [
+            (date(2025, 1, 6), 3, Decimal('3.50'), 1.0),
+            # Empty weeks are reported with zeros
+            (date(2025, 1, 13), 0, Decimal('0'), None),
+            (date(2025, 1, 20), 1, Decimal('3.00'), 0.0),
+        ])
+        self.assertEqual(data['series'][0]['status_breakdown'], {
+            'pending': {'count': 1, 'hours': Decimal('2.00')},
+            'approved': {'count': 2, 'hours': Decimal('1.50')},
+            'rejected': {'count': 0, 'hours': Decimal('0')},
+        })
+
+    def test_months(self):
+        data = self.series(self.manager_client, period='month', start='2025-01-15', end='2025-03-31')
+        self.assertEqual(self.summary(data['series']), [
+            (date(2025, 1, 1), 4, Decimal('6.50'), 2 / 3),
+            (date(2025, 2, 1), 1, Decimal('1.00'), 1.0),
+            (date(2025, 3, 1), 0, Decimal('0'), None),
+        ])
+
+    def test_days(self):
+        data = self.series(self.manager_client, period='day', start='2025-01-06', end='2025-01-09')
+        self.assertEqual([bucket['task_count'] for bucket in data['series']], [1, 1, 1, 0])
+
+    def test_employee_filter(self):
+        params = {'period': 'month', 'start': '2025-01-01', 'end': '2025-01-31'}
+        data = self.series(self.manager_client, employee=self.other.pk, **params)
+        self.assertEqual(self.summary(data['series']), [(date(2025, 1, 1), 1, Decimal('0.50'), 1.0)])
+        # Employees only ever see their own series
+        data = self.series(self.employee_client, employee=self.other.pk, **params)
+        self.assertEqual(self.summary(data['series']), [(date(2025, 1, 1), 3, Decimal('6.00'), 0.5)])
+
+    def test_group_by_employee(self):
+        data = self.series(self.manager_client, period='month', start='2025-01-01', end='2025-01-31', group='employee')
+        self.assertEqual(
+            [(entry['employee'], self.summary(entry['series'])) for entry in data['employees']],
+            [
+                (self.employee.pk, [(date(2025, 1, 1), 3, Decimal('6.00'), 0.5)]),
+                (self.other.pk, [(date(2025, 1, 1), 1, Decimal('0.50'), 1.0)]),
+            ],
+        )
+
+    def test_invalid_parameters(self):
+        cases = [
+            ({'period': 'year'}, "Invalid period. Use day, week or month."),
+            ({'period': ''}, "Invalid period. Use day, week or month."),
+            ({'start': '06/01/2025'}, "Invalid date format. Use YYYY-MM-DD."),
+            ({'start': '2025-02-01', 'end': '2025-01-01'}, "start must not be after end."),
+            ({'employee': 'me'}, "Invalid employee."),
+        ]
+        for params, error in cases:
+            with self.subTest(params):
+                response = self.manager_client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data, {"error": error})
+
+    @override_settings(TASK_STATS_SERIES_MAX_BUCKETS=2)
+    def test_bucket_limit(self):
+        response = self.manager_client.get(self.url, {'period': 'day', 'start': '2025-01-06', 'end': '2025-01-08'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"error": "The range covers more than 2 day buckets."})
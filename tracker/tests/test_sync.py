@@ -0,0 +1,105 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from tracker.models import Task, TaskTombstone
+
+from .base import TrackerTestMixin
+
+
+class TaskSyncTests(TrackerTestMixin, TestCase):
+    url = reverse('task-sync')
+
+    def sync(self, client, cursor=None, **params):
+        if cursor is not None:
+            params['cursor'] = cursor
+        response = client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_full_sync(self):
+        first = self.create_task(title='First')
+        second = self.create_task(title='Second')
+        data = self.sync(self.employee_client)
+        self.assertEqual([task['id'] for task in data['tasks']], [first.pk, second.pk])
+        self.assertEqual(data['deleted'], [])
+        self.assertEqual(data['cursor'], Task.objects.get(pk=second.pk).change_seq)
+        self.assertFalse(data['has_more'])
+
+    def test_reports_changes_after_the_cursor(self):
+        kept = self.create_task(title='Kept')
+        changed = self.create_task(title='Changed')
+        cursor = self.sync(self.employee_client)['cursor']
+
+        changed.title = 'Renamed'
+        changed.save()
+        data = self.sync(self.employee_client, cursor)
+        self.assertEqual([task['title'] for task in data['tasks']], ['Renamed'])
+        self.assertGreater(data['cursor'], cursor)
+        self.assertNotIn(kept.pk, [task['id'] for task in data['tasks']])
+
+        self.assertEqual(self.sync(self.employee_client, data['cursor'])['tasks'], [])
+
+    def test_deletes_leave_tombstones(self):
+        task = self.create_task(hours_spent=Decimal('2.00'))
+        cursor = self.sync(self.employee_client)['cursor']
+        pk = task.pk
+        task.delete()
+
+        tombstone = TaskTombstone.objects.get()
+        self.assertEqual((tombstone.task_id, tombstone.employee_id), (pk, self.employee.pk))
+        self.assertGreater(tombstone.change_seq, cursor)
+
+        data = self.sync(self.employee_client, cursor)
+        self.assertEqual(data['tasks'], [])
+        self.assertEqual(data['deleted'], [pk])
+        self.assertEqual(data['cursor'], tombstone.change_seq)
+        # A full sync lists the delete too, so a client holding a stale copy drops the task
+        self.assertEqual(self.sync(self.employee_client)['deleted'], [pk])
+
+    def test_tombstones_follow_role_visibility(self):
+        other = self.create_user('other@example.com')
+        mine = self.create_task()
+        theirs = self.create_task(employee=other)
+        mine_pk, theirs_pk = mine.pk, theirs.pk
+        mine.delete()
+        theirs.delete()
+        self.assertEqual(self.sync(self.employee_client)['deleted'], [mine_pk])
+        self.assertEqual(self.sync(self.client_for(other))['deleted'], [theirs_pk])
+        self.assertEqual(self.sync(self.manager_client)['deleted'], [mine_pk, theirs_pk])
+
+    def test_pages_merge_tasks_and_tombstones_in_order(self):
+        tasks = [self.create_task(title=str(i), date=date(2025, 1, 6 + i)) for i in range(4)]
+        deleted = [tasks[1].pk, tasks[3].pk]
+        tasks[1].delete()
+        tasks[0].title = 'Changed'
+        tasks[0].save()
+        tasks[3].delete()
+
+        changes = []
+        cursor = 0
+        while True:
+            data = self.sync(self.employee_client, cursor, page_size=1)
+            changes += [('task', task['title']) for task in data['tasks']]
+            changes += [('deleted', pk) for pk in data['deleted']]
+            cursor = data['cursor']
+            if not data['has_more']:
+                break
+        self.assertEqual(changes, [('task', '2'), ('deleted', deleted[0]), ('task', 'Changed'), ('deleted', deleted[1])])
+
+    def test_bulk_creates_get_consecutive_change_numbers(self):
+        cursor = self.sync(self.employee_client)['cursor']
+        tasks = Task.objects.create_many([
+            Task(employee=self.employee, title=str(i), description='Work', hours_spent=Decimal('1'), date=date(2025, 1, 6))
+            for i in range(3)
+        ])
+        stored = dict(Task.objects.values_list('pk', 'change_seq'))
+        self.assertEqual([stored[task.pk] for task in tasks], [task.change_seq for task in tasks])
+        self.assertEqual([task.change_seq for task in tasks], [cursor + 1, cursor + 2, cursor + 3])
+
+    def test_invalid_cursor(self):
+        response = self.employee_client.get(self.url, {'cursor': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'detail': 'Invalid cursor.'})
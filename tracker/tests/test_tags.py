@@ -0,0 +1,74 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tracker.models import Task, TaskTag
+
+from .base import TrackerTestMixin
+
+
+@override_settings(TRACKER_CACHE_TIMEOUT=0)
+class TaskTagTests(TrackerTestMixin, TestCase):
+    def list_titles(self, **params):
+        response = self.manager_client.get(reverse('task-list'), params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(task['title'] for task in response.data['tasks'])
+
+    def linked_tags(self, task):
+        return set(TaskTag.objects.filter(task=task).values_list('tag__name', flat=True))
+
+    def test_tags_are_stored_as_submitted(self):
+        response = self.employee_client.post(reverse('task-create'), {
+            'title': 'Task', 'description': 'Work', 'hours_spent': '1.00', 'date': '2025-01-06',
+            'tags': 'Backend, API ,api',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['task']['tags'], 'Backend, API ,api')
+        task = Task.objects.get()
+        self.assertEqual(task.tags, 'Backend, API ,api')
+        # Only the links are normalized
+        self.assertEqual(self.linked_tags(task), {'backend', 'api'})
+
+        response = self.manager_client.get(reverse('task-detail', args=[task.pk]))
+        self.assertEqual(response.data['task']['tags'], 'Backend, API ,api')
+
+    def test_updates_relink_without_rewriting(self):
+        task = self.create_task(tags='api')
+        task.tags = ' Frontend,UI '
+        task.save()
+        task.refresh_from_db()
+        self.assertEqual(task.tags, ' Frontend,UI ')
+        self.assertEqual(self.linked_tags(task), {'frontend', 'ui'})
+
+    def test_create_many_keeps_tags(self):
+        tasks = Task.objects.create_many([Task(
+            employee=self.employee, title='Task', description='Work', hours_spent='1', date='2025-01-06', tags='A, b',
+        )])
+        self.assertEqual(Task.objects.get().tags, 'A, b')
+        self.assertEqual(self.linked_tags(tasks[0]), {'a', 'b'})
+
+    def test_tags_match_exactly(self):
+        self.create_task(title='api', tags='api')
+        self.create_task(title='rapid', tags='rapid')
+        self.create_task(title='apis', tags='apis,backend')
+        self.assertEqual(self.list_titles(tags='api'), ['api'])
+        self.assertEqual(self.list_titles(tags='API '), ['api'])
+
+    def test_any_and_all(self):
+        self.create_task(title='both', tags='api,backend')
+        self.create_task(title='api', tags='api')
+        self.create_task(title='frontend', tags='frontend')
+        self.create_task(title='none')
+        self.assertEqual(self.list_titles(tags='api,frontend'), ['api', 'both', 'frontend'])
+        self.assertEqual(self.list_titles(tags='api,backend', tags_match='any'), ['api', 'both'])
+        self.assertEqual(self.list_titles(tags='api,backend', tags_match='all'), ['both'])
+        self.assertEqual(self.list_titles(tags='api,frontend', tags_match='all'), [])
+
+    def test_stats_filter_by_tags(self):
+        self.create_task(title='both', tags='api,backend', hours_spent='2.00')
+        self.create_task(title='api', tags='api', hours_spent='3.00')
+        self.create_task(title='rapid', tags='rapid', hours_spent='1.50')
+        response = self.manager_client.get(reverse('task-stats'), {'tags': 'api'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_hours'], 5)
+        response = self.manager_client.get(reverse('task-stats'), {'tags': 'api,backend', 'tags_match': 'all'})
+        self.assertEqual(response.data['total_hours'], 2)
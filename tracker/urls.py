@@ -1,13 +1,20 @@
 from django.urls import path
-from .views import TaskCreateView, TaskListView, TaskUpdateView, TaskDeleteView, TaskActionView, TaskDetailView, task_stats
+from .views import TaskCreateView, TaskBulkCreateView, TaskListView, TaskUpdateView, TaskDeleteView, TaskActionView, TaskBulkActionView, TaskDetailView, TaskExportView, TaskSearchView, TaskSyncView, task_events, task_stats, task_stats_series
 
 urlpatterns = [
     path('tasks/', TaskListView.as_view(), name='task-list'),
+    path('tasks/export/', TaskExportView.as_view(), name='task-export'),
+    path('tasks/search/', TaskSearchView.as_view(), name='task-search'),
+    path('tasks/sync/', TaskSyncView.as_view(), name='task-sync'),
+    path('tasks/events/', task_events, name='task-events'),
     path('task/create/', TaskCreateView.as_view(), name='task-create'),
+    path('task/bulk-create/', TaskBulkCreateView.as_view(), name='task-bulk-create'),
     path('task/<int:pk>/update/', TaskUpdateView.as_view(), name='task-update'),
     path('task/<int:pk>/delete/', TaskDeleteView.as_view(), name='task-delete'),
     path('task/<int:pk>/action/', TaskActionView.as_view(), name='task-action'), 
+    path('tasks/action/', TaskBulkActionView.as_view(), name='task-bulk-action'),
     path('task/<int:pk>/', TaskDetailView.as_view(), name='task-detail'), 
     path('tasks/stats/', task_stats, name='task-stats'),
+    path('tasks/stats/series/', task_stats_series, name='task-stats-series'),
 ]
 
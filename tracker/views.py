@@ -2,23 +2,68 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.generics import ListAPIView
-from .models import Task
-from .serializers import TaskSerializer
+from .models import DAILY_HOURS_LIMIT, DailyHours, Task, TaskRollup, TaskTombstone
+from .serializers import TaskReadSerializer, TaskSerializer
 from django.core.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes
-from datetime import datetime
-from django.db.models import Count, Sum
+from datetime import datetime, timedelta
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils.text import compress_sequence
+from django.utils.cache import patch_vary_headers
+from django.db import connection, router
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import AuthenticationFailed
+from accounts.authentication import authenticate_request
+from .events import channels_for, event_stream
+import time
+import csv
+from rest_framework.utils.encoders import JSONEncoder
+from .stats import compute_task_series, compute_task_stats
+from .search import search_tasks
+from .cache import cached_response, employee_scope, not_modified_response, set_validators
+from django.utils.http import quote_etag
+from .pagination import InvalidCursor, get_page_size, paginate_tasks
+from django.conf import settings
+from task_time_tracker.db_routers import use_read_replica
+from task_time_tracker.instrumentation import timed
+from django.utils.decorators import method_decorator
+from django.utils import timezone
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])  # Ensure only authenticated users can access
+@use_read_replica
 def task_stats(request):
+    try:
+        tasks = stats_tasks(request.query_params)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        # Total hours, status breakdown and most-used tags in two queries
+        return cached_response(
+            request, 'stats', lambda: Response(compute_task_stats(tasks)),
+            employee_id=employee_scope(request, own_tasks=False),
+        )
+
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+def stats_tasks(params):
+    """
+    The tasks summarized by task_stats, filtered by the date, employee,
+    status and tags query parameters. Raises ValueError, with the message
+    to report, for a malformed date or employee id.
+    """
     # Extract query parameters for filtering
-    date = request.query_params.get('date', None)
-    employee = request.query_params.get('employee', None)
-    tags = request.query_params.get('tags', None)
-    status_filter = request.query_params.get('status', None)
+    date = params.get('date', None)
+    employee = params.get('employee', None)
+    tags = params.get('tags', None)
+    status_filter = params.get('status', None)
 
     # Build the filter dictionary based on the query parameters
     filters = {}
@@ -26,32 +71,119 @@ def task_stats(request):
         try:
             filters['date'] = datetime.strptime(date, '%Y-%m-%d').date()  # Convert to date if needed
         except ValueError:
-            return Response({"error": "Invalid date format. Use YYYY-MM-DD."}, status=status.HTTP_400_BAD_REQUEST)
+            raise ValueError("Invalid date format. Use YYYY-MM-DD.")
     if employee:
+        if not employee.isdigit():
+            raise ValueError("Invalid employee.")
         filters['employee'] = employee
-    if tags:
-        filters['tags'] = tags
     if status_filter:
         filters['status'] = status_filter
 
-    # Assuming you have a Task model or a similar structure
-    try:
-        tasks = Task.objects.filter(**filters)
-        
-        # Calculate total hours, most-used tags, and pending approvals
-        total_hours = tasks.aggregate(Sum('hours_spent'))['hours_spent__sum'] or 0
-        most_used_tags = tasks.values('tags').annotate(count=Count('tags')).order_by('-count')[:5]
-        pending_approvals = tasks.filter(status='pending').count()
-
-        # Return the stats as JSON
-        return Response({
-            "total_hours": total_hours,
-            "most_used_tags": most_used_tags,
-            "pending_approvals": pending_approvals
-        })
+    tasks = Task.objects.filter(**filters)
+    if tags:
+        tasks = tasks.with_tags(tags.split(','), match_all=params.get('tags_match') == 'all')
+    return tasks
 
-    except Exception as e:
-        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+# Range covered by the series endpoint when no start date is given
+SERIES_DEFAULT_SPAN = {'day': timedelta(days=30), 'week': timedelta(weeks=12), 'month': timedelta(days=365)}
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@use_read_replica
+def task_stats_series(request):
+    """
+    Task counts, hours and approval rates per day, week or month between
+    `start` and `end`, read from the rollup tables. Employees only see their
+    own series; managers see everyone's, optionally for one `employee` or
+    split per employee with group=employee.
+    """
+    period = request.query_params.get('period', 'week')
+    if period not in dict(TaskRollup.PERIOD_CHOICES):
+        return Response({"error": "Invalid period. Use day, week or month."}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        end = request.query_params.get('end')
+        end = datetime.strptime(end, '%Y-%m-%d').date() if end else timezone.localdate()
+        start = request.query_params.get('start')
+        start = datetime.strptime(start, '%Y-%m-%d').date() if start else end - SERIES_DEFAULT_SPAN[period]
+    except ValueError:
+        return Response({"error": "Invalid date format. Use YYYY-MM-DD."}, status=status.HTTP_400_BAD_REQUEST)
+    if start > end:
+        return Response({"error": "start must not be after end."}, status=status.HTTP_400_BAD_REQUEST)
+
+    if request.user.role == 'employee':
+        employee_id = request.user.id
+    elif request.user.role == 'manager':
+        employee_id = request.query_params.get('employee')
+        if employee_id is not None and not employee_id.isdigit():
+            return Response({"error": "Invalid employee."}, status=status.HTTP_400_BAD_REQUEST)
+    else:
+        return Response({"detail": "You are not authorized to view stats."}, status=status.HTTP_403_FORBIDDEN)
+    by_employee = request.query_params.get('group') == 'employee'
+
+    def build():
+        try:
+            series = compute_task_series(
+                period, start, end, employee_id=employee_id, by_employee=by_employee,
+                limit=settings.TASK_STATS_SERIES_MAX_BUCKETS,
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        key = 'employees' if by_employee else 'series'
+        return Response({"period": period, "start": start, "end": end, key: series})
+
+    return cached_response(request, 'stats-series', build, employee_id=employee_scope(request))
+
+def authenticate_event_stream(request):
+    """
+    Authenticate an event stream request. EventSource cannot set headers,
+    so the token may also be passed as the `token` query parameter.
+    """
+    try:
+        return authenticate_request(request, token_param='token')
+    finally:
+        # Event streams stay open for a long time; do not hold a database connection
+        if not connection.in_atomic_block:
+            connection.close()
+
+
+@require_GET
+async def task_events(request):
+    """
+    Push task changes as Server-Sent Events, replacing list polling.
+    Managers receive every change, employees the changes to their own
+    tasks; each event names the action and task ids, and clients fetch the
+    rows through the sync endpoint. Only served under ASGI.
+    """
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI the stream would hold a worker for its whole lifetime
+        return JsonResponse({
+            "detail": "Task events are not available on this server."
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    try:
+        authenticated = await sync_to_async(authenticate_event_stream)(request)
+    except AuthenticationFailed as e:
+        detail = e.detail if isinstance(e.detail, dict) else {"detail": e.detail}
+        return JsonResponse(detail, status=status.HTTP_401_UNAUTHORIZED)
+    if authenticated is None:
+        return JsonResponse({
+            "detail": "Authentication credentials were not provided."
+        }, status=status.HTTP_401_UNAUTHORIZED)
+
+    user, token = authenticated
+    if user.role not in ('employee', 'manager'):
+        return JsonResponse({
+            "detail": "You are not authorized to receive task events."
+        }, status=status.HTTP_403_FORBIDDEN)
+
+    # End the stream when the token expires so the client reconnects with a fresh one
+    deadline = min(token['exp'], time.time() + settings.TASK_EVENTS_MAX_SECONDS)
+    response = StreamingHttpResponse(event_stream(channels_for(user), deadline), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 class TaskCreateView(APIView):
     permission_classes = [IsAuthenticated]
@@ -61,7 +193,7 @@ class TaskCreateView(APIView):
 
         try:
             if serializer.is_valid():
-                serializer.save(employee=request.user)
+                serializer.save(employee_id=request.user.id)
                 return Response({
                     "detail": "Task created successfully.",
                     "task": serializer.data
@@ -76,50 +208,393 @@ class TaskCreateView(APIView):
                 "detail": str(e),
             }, status=status.HTTP_400_BAD_REQUEST)
 
+class TaskBulkCreateView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Create several tasks for the logged-in user in one request.
+
+        Accepts a list of tasks (or {"tasks": [...]}). Either every task is
+        created or none is, and errors are reported per item by index.
+        """
+        items = request.data.get('tasks') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response({
+                "detail": "Expected a non-empty list of tasks."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.TASK_BULK_CREATE_MAX_ITEMS:
+            return Response({
+                "detail": f"At most {settings.TASK_BULK_CREATE_MAX_ITEMS} tasks can be created at once."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = TaskSerializer(data=items, many=True)
+        errors = {}
+        if not serializer.is_valid():
+            # Depending on the DRF version list errors are a list or a dict keyed by index
+            item_errors = serializer.errors
+            if isinstance(item_errors, list):
+                item_errors = dict(enumerate(item_errors))
+            errors = {index: error for index, error in item_errors.items() if error}
+
+        tasks = []
+        if not errors:
+            tasks = [Task(employee_id=request.user.id, **data) for data in serializer.validated_data]
+
+            # Check the daily limit for every affected date with one query
+            logged = dict(DailyHours.objects.filter(
+                employee_id=request.user.id, date__in={task.date for task in tasks}
+            ).values_list('date', 'total_hours'))
+            for index, task in enumerate(tasks):
+                total = logged.get(task.date, 0) + task.hours_spent
+                if total > DAILY_HOURS_LIMIT:
+                    errors[index] = {"hours_spent": ["Total hours for the day cannot exceed 8 hours."]}
+                else:
+                    # Rejected items do not count against the later ones
+                    logged[task.date] = total
+
+        if errors:
+            return Response({
+                "detail": "Validation failed. No tasks were created.",
+                "errors": [
+                    {"index": index, "errors": item_errors} for index, item_errors in sorted(errors.items())
+                ]
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            tasks = Task.objects.create_many(tasks)
+        except ValidationError as e:
+            # Another request logged hours for the same day in the meantime
+            return Response({
+                "detail": str(e),
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "detail": f"{len(tasks)} tasks created successfully.",
+            "tasks": TaskSerializer(tasks, many=True).data
+        }, status=status.HTTP_201_CREATED)
+
+def tasks_for_user(user, model=Task):
+    """
+    Returns tasks (or tombstones, via `model`) based on the user role:
+    - Employees see only their own tasks
+    - Managers see all tasks
+    """
+    if user.role == 'employee':
+        return model.objects.filter(employee_id=user.id)
+    elif user.role == 'manager':
+        return model.objects.all()
+    return model.objects.none()  # Or you could raise PermissionDenied()
+
+def date_param(params, name):
+    """The `name` query parameter as a date, or None. Raises ValueError if malformed."""
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError("Invalid date format. Use YYYY-MM-DD.")
+
+
+def visible_tasks(user, params):
+    """
+    The tasks the user may see, narrowed down by the optional date,
+    start/end, employee, tags, status and search query parameters. Shared by the
+    task list, search and the export. Raises ValueError, with the message to
+    report, for a malformed date or employee id or a start after the end.
+    """
+    queryset = tasks_for_user(user)
+
+    # Optional filters from query params
+    date_filter = date_param(params, 'date')
+    if date_filter:
+        queryset = queryset.filter(date=date_filter)
+
+    # Inclusive date range, e.g. a payroll month
+    start_filter = date_param(params, 'start')
+    end_filter = date_param(params, 'end')
+    if start_filter and end_filter and start_filter > end_filter:
+        raise ValueError("start must not be after end.")
+    if start_filter:
+        queryset = queryset.filter(date__gte=start_filter)
+    if end_filter:
+        queryset = queryset.filter(date__lte=end_filter)
+
+    employee_filter = params.get('employee')
+    if employee_filter:
+        if not employee_filter.isdigit():
+            raise ValueError("Invalid employee.")
+        queryset = queryset.filter(employee=employee_filter)
+
+    # Exact tag match; any of the comma-separated tags unless tags_match=all
+    tags_filter = params.get('tags')
+    if tags_filter:
+        match_all = params.get('tags_match') == 'all'
+        queryset = queryset.with_tags(tags_filter.split(','), match_all=match_all)
+
+    status_filter = params.get('status')
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+
+    # Keywords in the title, tags or description
+    search_filter = params.get('search')
+    if search_filter:
+        queryset = queryset.search(search_filter)
+
+    return queryset
+
 class TaskListView(ListAPIView):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
+        return visible_tasks(self.request.user, self.request.query_params)
+
+    @method_decorator(use_read_replica)
+    def list(self, request, *args, **kwargs):
+        try:
+            queryset = self.get_queryset().order_by('date', 'id')
+        except ValueError as e:
+            return Response({
+                "detail": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Opt-in streaming mode for clients that want every matching task
+        if request.query_params.get('stream') == 'true':
+            # Rows are fetched after the view returns, so pick the database now
+            queryset = queryset.using(router.db_for_read(Task))
+            return StreamingHttpResponse(self.stream_tasks(queryset), content_type='application/json')
+
+        return cached_response(
+            request, 'list', lambda: self.paginated_response(queryset), employee_id=employee_scope(request)
+        )
+
+    def paginated_response(self, queryset):
+        request = self.request
+        try:
+            rows, next_cursor = paginate_tasks(
+                TaskReadSerializer.rows(queryset),
+                cursor=request.query_params.get('cursor'),
+                page_size=get_page_size(request.query_params.get('page_size')),
+                position=TaskReadSerializer.position,
+            )
+        except InvalidCursor as e:
+            return Response({
+                "detail": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        with timed('serialize'):
+            data = TaskReadSerializer.many(rows)
+        return Response({
+            "detail": "Tasks fetched successfully.",
+            "tasks": data,
+            "next_cursor": next_cursor
+        })
+
+    def stream_tasks(self, queryset):
         """
-        Returns tasks based on the user role:
-        - Employees see only their own tasks
-        - Managers see all tasks
+        Yield the task list as JSON in the same envelope as the paginated response,
+        one row at a time, so memory stays flat regardless of the number of tasks.
         """
-        user = self.request.user
+        encoder = JSONEncoder()
+        yield '{"detail": "Tasks fetched successfully.", "tasks": ['
+        separator = ''
+        rows = TaskReadSerializer.rows(queryset).iterator(chunk_size=settings.TASK_LIST_STREAM_CHUNK_SIZE)
+        for row in rows:
+            yield separator + encoder.encode(TaskReadSerializer.to_representation(row))
+            separator = ','
+        yield ']}'
+
+def accepts_encoding(request, coding):
+    """
+    Whether the request's Accept-Encoding allows the content coding: named,
+    or matched by *, with a non-zero quality value.
+    """
+    qualities = {}
+    for entry in request.headers.get('Accept-Encoding', '').split(','):
+        name, *params = entry.split(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+    return qualities.get(coding, qualities.get('*', 0)) > 0
+
+
+class EchoBuffer:
+    """File-like object handing back whatever csv.writer writes to it."""
+
+    def write(self, value):
+        return value
+
+
+class TaskExportView(APIView):
+    permission_classes = [IsAuthenticated]
+    # DRF reserves ?format= for renderer selection, so the export format is ?output=
+    content_types = {
+        'csv': 'text/csv; charset=utf-8',
+        'ndjson': 'application/x-ndjson',
+    }
+    extra_fields = ['employee__email']
+
+    @method_decorator(use_read_replica)
+    def get(self, request, *args, **kwargs):
+        """
+        Stream every task matching the task list filters as CSV or NDJSON.
 
-        if user.role == 'employee':
-            queryset = Task.objects.filter(employee=user)
-        elif user.role == 'manager':
-            queryset = Task.objects.all()
-        else:
-            queryset = Task.objects.none()  # Or you could raise PermissionDenied()
+        Rows are read through a server-side cursor and written out in
+        batches, so memory stays flat however many tasks match. The body is
+        gzipped on the fly when the client accepts it.
+        """
+        output = request.query_params.get('output', 'csv')
+        if output not in self.content_types:
+            return Response({
+                "detail": "Invalid output. Use csv or ndjson."
+            }, status=status.HTTP_400_BAD_REQUEST)
 
-        # Optional filters from query params
-        date_filter = self.request.query_params.get('date')
-        if date_filter:
-            queryset = queryset.filter(date=date_filter)
+        try:
+            queryset = visible_tasks(request.user, request.query_params).order_by('date', 'id')
+        except ValueError as e:
+            return Response({
+                "detail": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        # Rows are fetched after the view returns, so pick the database now
+        queryset = queryset.using(router.db_for_read(Task))
+        rows = TaskReadSerializer.rows(queryset, *self.extra_fields).iterator(
+            chunk_size=settings.TASK_LIST_STREAM_CHUNK_SIZE
+        )
+        content = self.csv_lines(rows) if output == 'csv' else self.ndjson_lines(rows)
+        content = self.batched(content, settings.TASK_EXPORT_BATCH_ROWS)
+
+        response = StreamingHttpResponse(content_type=self.content_types[output])
+        if accepts_encoding(request, 'gzip'):
+            content = compress_sequence(content)
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        response.streaming_content = content
+        response['Content-Disposition'] = (
+            f'attachment; filename="tasks-{timezone.localdate():%Y%m%d}.{output}"'
+        )
+        return response
+
+    def csv_lines(self, rows):
+        writer = csv.writer(EchoBuffer())
+        yield writer.writerow([*TaskReadSerializer.fields, 'employee_email'])
+        for row in rows:
+            data = TaskReadSerializer.to_representation(row)
+            yield writer.writerow([*data.values(), row[-1]])
+
+    def ndjson_lines(self, rows):
+        encoder = JSONEncoder()
+        for row in rows:
+            data = TaskReadSerializer.to_representation(row)
+            data['employee_email'] = row[-1]
+            yield encoder.encode(data) + '\n'
+
+    def batched(self, lines, size):
+        """Join lines into larger chunks; gzip compresses each chunk it is given separately."""
+        batch = []
+        for line in lines:
+            batch.append(line)
+            if len(batch) >= size:
+                yield ''.join(batch).encode()
+                batch = []
+        if batch:
+            yield ''.join(batch).encode()
+
+class TaskSearchView(APIView):
+    permission_classes = [IsAuthenticated]
 
-        employee_filter = self.request.query_params.get('employee')
-        if employee_filter:
-            queryset = queryset.filter(employee=employee_filter)
+    @method_decorator(use_read_replica)
+    def get(self, request, *args, **kwargs):
+        """
+        Return the visible tasks best matching the keywords in `q`, best
+        first, each with its rank. The task list filters narrow the search
+        down further. `fuzzy` is true when no task matched the keywords
+        exactly and the results are titles that resemble them instead.
+        """
+        text = request.query_params.get('q', '')
+        if not text.strip():
+            return Response({
+                "detail": "The q parameter is required."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get('limit', settings.TASK_SEARCH_MAX_RESULTS))
+        except ValueError:
+            limit = settings.TASK_SEARCH_MAX_RESULTS
+        limit = max(1, min(limit, settings.TASK_SEARCH_MAX_RESULTS))
 
-        tags_filter = self.request.query_params.get('tags')
-        if tags_filter:
-            queryset = queryset.filter(tags__icontains=tags_filter)
+        try:
+            queryset = visible_tasks(request.user, request.query_params)
+        except ValueError as e:
+            return Response({
+                "detail": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        rows, fuzzy = search_tasks(queryset, text, limit)
+        with timed('serialize'):
+            tasks = []
+            for *row, rank in rows:
+                data = TaskReadSerializer.to_representation(row)
+                data['rank'] = rank
+                tasks.append(data)
+        return Response({
+            "detail": "Tasks fetched successfully.",
+            "tasks": tasks,
+            "fuzzy": fuzzy,
+        })
 
-        status_filter = self.request.query_params.get('status')
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
+class TaskSyncView(APIView):
+    permission_classes = [IsAuthenticated]
 
-        return queryset
+    @method_decorator(use_read_replica)
+    def get(self, request, *args, **kwargs):
+        """
+        Return the tasks created or updated and the ids of tasks deleted since
+        `cursor` (a change sequence number; omit it for a full sync), with the
+        cursor to send next time. Follow up while has_more is true.
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
+        Only role visibility applies, not the list filters: a task leaving a
+        filter would otherwise silently disappear from the client's copy.
+        """
+        try:
+            cursor = int(request.query_params.get('cursor', 0))
+        except ValueError:
+            return Response({
+                "detail": "Invalid cursor."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        limit = get_page_size(request.query_params.get('page_size'))
+
+        # Fetch one extra change from each feed to know whether more remain
+        changed = list(TaskReadSerializer.rows(
+            tasks_for_user(request.user).filter(change_seq__gt=cursor).order_by('change_seq'), 'change_seq'
+        )[:limit + 1])
+        deleted = list(tasks_for_user(request.user, model=TaskTombstone).filter(
+            change_seq__gt=cursor
+        ).order_by('change_seq').values_list('task_id', 'change_seq')[:limit + 1])
+
+        # Merge both feeds by sequence number and keep the first `limit` changes
+        changes = sorted(
+            [(row[-1], row) for row in changed] + [(seq, task_id) for task_id, seq in deleted],
+            key=lambda change: change[0],
+        )
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        with timed('serialize'):
+            tasks = [TaskReadSerializer.to_representation(row) for _, row in changes if isinstance(row, tuple)]
         return Response({
-            "detail": "Tasks fetched successfully.",
-            "tasks": serializer.data
+            "detail": "Changes fetched successfully.",
+            "tasks": tasks,
+            "deleted": [task_id for _, task_id in changes if not isinstance(task_id, tuple)],
+            "cursor": changes[-1][0] if changes else cursor,
+            "has_more": has_more,
         })
 
 class TaskUpdateView(APIView):
@@ -128,7 +603,7 @@ class TaskUpdateView(APIView):
     def put(self, request, *args, **kwargs):
         pk = kwargs.get('pk')
         try:
-            task = Task.objects.get(pk=pk, employee=request.user)
+            task = Task.objects.get(pk=pk, employee_id=request.user.id)
         except Task.DoesNotExist:
             return Response({
                 "detail": "Task not found or you're not authorized to edit this task."
@@ -142,11 +617,16 @@ class TaskUpdateView(APIView):
 
         serializer = TaskSerializer(task, data=request.data, partial=True)
         if serializer.is_valid():
-            # If task was rejected, reset status to pending
-            if task.status == 'rejected':
-                serializer.save(status='pending')
-            else:
-                serializer.save()
+            try:
+                # If task was rejected, reset status to pending
+                if task.status == 'rejected':
+                    serializer.save(status='pending')
+                else:
+                    serializer.save()
+            except ValidationError as e:
+                return Response({
+                    "detail": str(e),
+                }, status=status.HTTP_400_BAD_REQUEST)
 
             return Response({
                 "detail": "Task updated successfully.",
@@ -167,7 +647,7 @@ class TaskDeleteView(APIView):
         pk = kwargs.get('pk')  # Task ID from the URL
 
         try:
-            task = Task.objects.get(pk=pk, employee=request.user)  # Ensure the task belongs to the logged-in user
+            task = Task.objects.get(pk=pk, employee_id=request.user.id)  # Ensure the task belongs to the logged-in user
         except Task.DoesNotExist:
             return Response({
                 "detail": "Task not found or you're not authorized to delete this task."
@@ -180,6 +660,70 @@ class TaskDeleteView(APIView):
         }, status=status.HTTP_204_NO_CONTENT)
     
 
+class TaskBulkActionView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def patch(self, request, *args, **kwargs):
+        """
+        Approve or reject many tasks at once.
+
+        Accepts {"actions": [{"id": 1, "action": "approve"},
+        {"id": 2, "action": "reject", "comment": "..."}]} or the shorthand
+        {"ids": [1, 2], "action": "approve", "comment": "..."}.
+        """
+        # Ensure the user is a manager
+        if request.user.role != 'manager':
+            return Response({
+                "detail": "You are not authorized to approve/reject tasks."
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        items = request.data.get('actions')
+        if items is None and isinstance(request.data.get('ids'), list):
+            items = [
+                {"id": pk, "action": request.data.get('action'), "comment": request.data.get('comment', '')}
+                for pk in request.data['ids']
+            ]
+        if not isinstance(items, list) or not items:
+            return Response({
+                "detail": "Expected a non-empty list of actions."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.TASK_BULK_ACTION_MAX_ITEMS:
+            return Response({
+                "detail": f"At most {settings.TASK_BULK_ACTION_MAX_ITEMS} tasks can be actioned at once."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        actions = {}
+        errors = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors.append({"index": index, "detail": "Expected an object with 'id' and 'action'."})
+                continue
+            try:
+                pk = int(item.get('id'))
+            except (TypeError, ValueError):
+                errors.append({"index": index, "detail": "Invalid task id."})
+                continue
+            if item.get('action') not in ['approve', 'reject']:
+                errors.append({"index": index, "detail": "Invalid action. Must be 'approve' or 'reject'."})
+            elif pk in actions:
+                errors.append({"index": index, "detail": "Duplicate task id."})
+            else:
+                actions[pk] = (item['action'], item.get('comment') or '')
+
+        if errors:
+            return Response({
+                "detail": "Invalid data. No tasks were changed.",
+                "errors": errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        updated, skipped = Task.objects.apply_actions(actions)
+        return Response({
+            "detail": f"{len(updated)} tasks updated successfully.",
+            "updated": updated,
+            "skipped": [{"id": pk, "reason": reason} for pk, reason in skipped.items()]
+        }, status=status.HTTP_200_OK)
+
+
 class TaskActionView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -234,17 +778,26 @@ class TaskActionView(APIView):
 class TaskDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @method_decorator(use_read_replica)
     def get(self, request, *args, **kwargs):
         pk = kwargs.get('pk')
-        try:
-            task = Task.objects.get(pk=pk)
-        except Task.DoesNotExist:
+        row = TaskReadSerializer.rows(Task.objects.filter(pk=pk), 'updated_at').first()
+        if row is None:
             return Response({
                 "detail": "Task not found."
             }, status=status.HTTP_404_NOT_FOUND)
 
+        # Answer conditional requests for an unchanged task without serializing it
+        *row, updated_at = row
+        etag = quote_etag(f"{pk}-{updated_at.timestamp()}")
+        last_modified = updated_at.timestamp()
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified:
+            return set_validators(not_modified, etag, last_modified)
+
         # Serialize the task
-        serializer = TaskSerializer(task)
-        return Response({
-            "task": serializer.data
-        }, status=status.HTTP_200_OK)
\ No newline at end of file
+        with timed('serialize'):
+            data = TaskReadSerializer.to_representation(row)
+        return set_validators(Response({
+            "task": data
+        }, status=status.HTTP_200_OK), etag, last_modified)